@@ -12,25 +12,24 @@
 #  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
 # ######################################################################################################################
 
-import subprocess
-import sys
+import logging
 
-# Ensure Pip is available
-try:
-    import pip
-except ImportError:
-    # Install pip with upgrade if not available
-    subprocess.call([sys.executable, '-m', 'ensurepip', '--upgrade'])
+from . import controllers
+from . import models
+from .models.utils import dependencies
 
-# Install the python-amazon-sp-api package
-subprocess.call([
-    sys.executable,
-    '-m',
-    'pip',
-    'install',
-    'python-amazon-sp-api',
-    '--break-system-packages',
-])
+_logger = logging.getLogger(__name__)
 
-from . import models
 
+def post_init_hook(env):
+    """
+    Report the python-amazon-sp-api version once the module is installed. Nothing is installed here, use
+    Settings -> Amazon Seller -> Install python-amazon-sp-api or pip.
+    """
+    version = dependencies.get_sp_api_version()
+    if version:
+        _logger.info('Amazon Seller uses %s %s', dependencies.SP_API_DISTRIBUTION, version)
+    else:
+        _logger.warning('%s is not installed, the Amazon Seller sync jobs will fail until it is. Install it from '
+                        'Settings -> Amazon Seller or with: pip install %s',
+                        dependencies.SP_API_DISTRIBUTION, dependencies.SP_API_DISTRIBUTION)
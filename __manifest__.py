@@ -14,7 +14,7 @@
 
 {
     'name': 'Amazon Seller',
-    'version': '1.1.1',
+    'version': '1.1.3',
     'summary': 'Manage Amazon seller accounts',
     'description': '''This module allows you to manage Amazon seller accounts.
 
@@ -22,16 +22,23 @@ Licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 Interna
 To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/''',
     'author': 'Charles L Beyor and Beyotek Inc.',
     'license': 'Other proprietary',
-    'depends': ['base', 'stock', 'sale'],
+    'depends': ['base', 'stock', 'sale', 'sale_stock'],
     'data': [
         'security/ir.model.access.csv',
         'views/amazon_overview_views.xml',
         'views/amazon_seller_account_views.xml',
         'views/amazon_address_map_views.xml',
+        'views/amazon_inbound_shipment_views.xml',
+        'views/amazon_sync_run_views.xml',
+        'views/amazon_sync_job_views.xml',
+        'views/amazon_notification_event_views.xml',
+        'views/amazon_archive_reprocess_views.xml',
         'views/product_template_views.xml',
+        'views/res_config_settings_views.xml',
         'views/sale_order_views.xml',
         'data/cron.xml',
     ],
+    'post_init_hook': 'post_init_hook',
     'installable': True,
     'application': True,
 }
@@ -0,0 +1,54 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import hmac
+import json
+import logging
+
+from odoo import http
+from odoo.http import request
+
+from ..models.utils import notification_utils
+
+_logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-Amazon-Seller-Token'
+
+
+class AmazonNotificationController(http.Controller):
+
+    @http.route('/amazon_seller/notifications', type='http', auth='public', methods=['POST'], csrf=False, save_session=False)
+    def receive_notifications(self, token=None, **kwargs):
+        """
+        Queue SP-API notifications posted by a relay, e.g. an SNS HTTPS subscription or a script draining the SQS
+        queue. Requests must carry the amazon_seller.notification_token system parameter in the
+        X-Amazon-Seller-Token header or the token query parameter. The endpoint is disabled while it is not set.
+        """
+        expected = request.env['ir.config_parameter'].sudo().get_param('amazon_seller.notification_token')
+        provided = request.httprequest.headers.get(TOKEN_HEADER) or token
+        if not expected or not provided or not hmac.compare_digest(expected, provided):
+            return request.make_json_response({'error': 'Forbidden'}, status=403)
+
+        try:
+            body = json.loads(request.httprequest.get_data())
+            if isinstance(body, dict) and body.get('Type') == 'SubscriptionConfirmation':
+                # Confirming would call out to AWS, leave it to the administrator
+                _logger.warning('SNS subscription confirmation received, confirm it by opening %s', body.get('SubscribeURL'))
+                return request.make_json_response({'queued': 0})
+            notifications = notification_utils.unwrap(body)
+        except ValueError:
+            return request.make_json_response({'error': 'Invalid JSON'}, status=400)
+
+        events = request.env['amazon.notification.event'].sudo().enqueue(notifications, source='http')
+        return request.make_json_response({'queued': len(events)}, status=202)
@@ -0,0 +1,56 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Merge the address mappings sharing the same normalized address, then add the unique address_key constraint, which
+Odoo could not create while such duplicates existed.
+"""
+import logging
+from collections import defaultdict
+
+from odoo import api, SUPERUSER_ID
+from odoo.tools import sql
+
+_logger = logging.getLogger(__name__)
+
+CONSTRAINT_NAME = 'amazon_address_map_unique_address_key'
+
+
+def migrate(cr, version):
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    AddressMap = env['amazon.address.map'].with_context(active_test=False)
+
+    # The key is computed while the module is updated, make sure no row was left without one
+    AddressMap.search([('address_key', '=', False)])._compute_address_key()
+    env.flush_all()
+
+    mappings_by_key = defaultdict(lambda: AddressMap.browse())
+    for mapping in AddressMap.search([], order='id'):
+        mappings_by_key[mapping.address_key] |= mapping
+
+    duplicates = AddressMap.browse()
+    for address_key, mappings in mappings_by_key.items():
+        if len(mappings) < 2:
+            continue
+        # Keep the oldest mapping to a location, else the oldest mapping
+        keeper = mappings.filtered('warehouse_loc')[:1] or mappings[:1]
+        duplicates |= mappings - keeper
+        _logger.info('Merging %s duplicate Amazon address mapping(s) into %s', len(mappings) - 1, keeper.display_name)
+
+    if duplicates:
+        duplicates.unlink()
+        env.flush_all()
+
+    if not sql.constraint_definition(cr, AddressMap._table, CONSTRAINT_NAME):
+        sql.add_constraint(cr, AddressMap._table, CONSTRAINT_NAME, 'unique(address_key)')
@@ -0,0 +1,54 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Mark the tax profiles created by earlier versions, which only matched taxes on their amount, so they are reused now
+that the imports only match the taxes of the module. A sale percent tax is taken as a tax profile when its name is
+the one the module gave it (e.g. "8.0%" or "8.25%") and Amazon order lines use it.
+"""
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+# account.tax stores its amount with 4 decimal places
+MAX_TAX_RATE_PRECISION = 4
+
+
+def migrate(cr, version):
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    tax_field = env['sale.order.line']._fields['tax_id']
+
+    cr.execute(f"""
+        SELECT DISTINCT rel.{tax_field.column2}
+        FROM {tax_field.relation} rel
+        JOIN sale_order_line sol ON sol.id = rel.{tax_field.column1}
+        JOIN sale_order so ON so.id = sol.order_id
+        WHERE so.amazon_seller_order_id IS NOT NULL
+    """)
+    used_tax_ids = [row[0] for row in cr.fetchall()]
+
+    taxes = env['account.tax'].with_context(active_test=False).search([
+        ('id', 'in', used_tax_ids),
+        ('amazon_tax_profile', '=', False),
+        ('type_tax_use', '=', 'sale'),
+        ('amount_type', '=', 'percent'),
+    ])
+    profiles = taxes.filtered(lambda tax: tax.name in {f'{tax.amount}%'} | {
+        f'{tax.amount:.{precision}f}%' for precision in range(MAX_TAX_RATE_PRECISION + 1)
+    })
+    if profiles:
+        profiles.write({'amazon_tax_profile': True})
+        _logger.info('Marked %s existing tax(es) as Amazon tax profiles: %s', len(profiles), ', '.join(profiles.mapped('name')))
@@ -0,0 +1,50 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Link the Amazon orders imported before sale orders had an account to the seller account they came from, so each
+account ships and invoices only its own FBA orders.
+"""
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    # The cached items of an order record the account that fetched it
+    cr.execute("""
+        UPDATE sale_order so
+        SET amazon_account_id = cache.account_id
+        FROM amazon_order_item_cache cache
+        WHERE so.amazon_account_id IS NULL
+          AND so.amazon_seller_order_id = cache.amazon_order_id
+    """)
+    _logger.info('Linked %s Amazon order(s) to their account from the cached order items', cr.rowcount)
+
+    # With a single account, every remaining Amazon order is one of its orders
+    cr.execute("SELECT id FROM amazon_seller_account")
+    account_ids = [row[0] for row in cr.fetchall()]
+    if len(account_ids) == 1:
+        cr.execute("""
+            UPDATE sale_order
+            SET amazon_account_id = %s
+            WHERE amazon_account_id IS NULL AND amazon_seller_order_id IS NOT NULL
+        """, [account_ids[0]])
+        _logger.info('Linked %s Amazon order(s) to the only seller account', cr.rowcount)
+
+    cr.execute("SELECT count(*) FROM sale_order WHERE amazon_account_id IS NULL AND amazon_seller_order_id IS NOT NULL")
+    unlinked_count = cr.fetchone()[0]
+    if unlinked_count:
+        _logger.warning('%s Amazon order(s) could not be linked to a seller account, set their account to ship and '
+                        'invoice them automatically', unlinked_count)
@@ -13,6 +13,12 @@
 # ######################################################################################################################
 
 from . import amazon_seller_account
+from . import amazon_sync_checkpoint
+from . import amazon_sync_run
+from . import amazon_sync_job
+from . import amazon_order_item_cache
+from . import amazon_notification_event
+from . import amazon_inbound_shipment
 from . import amazon_import_products
 from . import amazon_address_map
 from . import amazon_awd_inventory
@@ -23,5 +29,7 @@ from . import amazon_orders
 from . import amazon_overview
 from . import stock_quant
 from . import amazon_listing_fees
+from . import amazon_archive_reprocess
+from . import res_config_settings
 
 
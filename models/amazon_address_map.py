@@ -16,7 +16,7 @@ import logging
 import traceback
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from .utils import amazon_utils, cache_utils, telemetry
 
 _logger = logging.getLogger(__name__)
 
@@ -83,12 +83,32 @@ class AmazonAddressMap(models.Model):
     write_date = fields.Datetime(string='Last Updated', readonly=True)
     
     # Computed Fields
+    address_key = fields.Char(
+        string='Address Key',
+        compute='_compute_address_key',
+        store=True,
+        copy=False,
+        help='Hash of the normalized address, used to match Amazon addresses regardless of casing and whitespace'
+    )
+
     display_name = fields.Char(
         string='Display Name',
         compute='_compute_display_name',
         store=True
     )
     
+    _sql_constraints = [
+        ('unique_address_key', 'unique(address_key)', 'This address is already mapped!')
+    ]
+
+    @api.depends('name', 'address_line1', 'address_line2', 'city', 'state_or_region', 'postal_code', 'country_code')
+    def _compute_address_key(self):
+        for record in self:
+            record.address_key = cache_utils.address_hash(
+                record.name, record.address_line1, record.address_line2, record.city,
+                record.state_or_region, record.postal_code, record.country_code,
+            )
+
     @api.depends('name', 'city', 'state_or_region', 'warehouse_loc')
     def _compute_display_name(self):
         for record in self:
@@ -98,30 +118,36 @@ class AmazonAddressMap(models.Model):
                 record.display_name = f"{record.name} - {record.city}, {record.state_or_region} (No Location)"
     
     @api.model
-    def get_warehouse_location_else_create(self, name:str="", address_line1:str="", address_line2:str="", city:str="", state_or_region:str="", postal_code:str="", country_code:str=""):
+    @telemetry.in_phase(telemetry.PHASE_RESOLVE)
+    def get_warehouse_location_else_create(self, name:str="", address_line1:str="", address_line2:str="", city:str="", state_or_region:str="", postal_code:str="", country_code:str="", address_cache=None):
+        """
+        Return the warehouse location mapped to an Amazon address, or None when the address is not mapped yet.
+        Unknown addresses are added to the mapping table. Addresses are matched on their normalized ``address_key``.
+        ``address_cache`` is an optional dict shared by the calls of one run, holding key -> location id (or False).
+        """
+        address_key = cache_utils.address_hash(name, address_line1, address_line2, city, state_or_region, postal_code, country_code)
+
+        if address_cache is not None and address_key in address_cache:
+            location_id = address_cache[address_key]
+            return self.env['stock.location'].browse(location_id) if location_id else None
+
         # Find a address map 
-            awd_address_map = self.env['amazon.address.map'].search([
-                ('name', '=', name),
-                ('address_line1', '=', address_line1),
-                ('address_line2', '=', address_line2),
-                ('city', '=', city),
-                ('state_or_region', '=', state_or_region),
-                ('postal_code', '=', postal_code),
-                ('country_code', '=', country_code),
-            ], limit=1)
+        awd_address_map = self.env['amazon.address.map'].search([('address_key', '=', address_key)], limit=1)
 
-            if awd_address_map and awd_address_map.warehouse_loc:
-                _logger.debug('Found address map')
-                return awd_address_map.warehouse_loc
-            
-            elif awd_address_map:
-                _logger.warning('Address map found but no warehouse location is assigned.')
-                return None
-            
-            else:
-                # add the address map to the database
-                _logger.warning('No address map found.')
-                try:
+        location = None
+        if awd_address_map and awd_address_map.warehouse_loc:
+            _logger.debug('Found address map')
+            location = awd_address_map.warehouse_loc
+        
+        elif awd_address_map:
+            _logger.warning('Address map found but no warehouse location is assigned.')
+        
+        else:
+            # add the address map to the database
+            _logger.warning('No address map found.')
+            try:
+                # Savepoint, so a concurrent run creating the same address does not abort the transaction
+                with self.env.cr.savepoint():
                     self.env['amazon.address.map'].create({
                         'name': name,
                         'address_line1': address_line1,
@@ -131,6 +157,9 @@ class AmazonAddressMap(models.Model):
                         'postal_code': postal_code,
                         'country_code': country_code,
                     })
-                except Exception as e:
-                    _logger.error('Failed to create address map: %s', str(e))
-                    return None
+            except Exception as e:
+                _logger.error('Failed to create address map: %s', str(e))
+
+        if address_cache is not None:
+            address_cache[address_key] = location.id if location else False
+        return location
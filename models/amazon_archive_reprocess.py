@@ -0,0 +1,94 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import logging
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
+
+from .utils import payload_archive
+
+_logger = logging.getLogger(__name__)
+
+# Import method of each reprocessable import, called as env[model].method(account)
+IMPORTERS = {
+    'orders': ('amazon.orders', 'import_account_orders'),
+    'fba_inventory': ('amazon.fba.inventory', '_update_account_fba_inventory'),
+    'awd_inventory': ('amazon.awd.inventory', '_update_account_awd_inventory'),
+    'fba_inbound': ('amazon.fba.inbound', 'import_account_fba_inbound'),
+    'awd_inbound': ('amazon.awd.inbound', 'import_account_awd_inbound'),
+    'catalog': ('amazon.import.products', 'update_product_details'),
+}
+
+
+class AmazonArchiveReprocess(models.TransientModel):
+    """Run an import of an account again on its archived payloads instead of calling Amazon."""
+
+    _name = 'amazon.archive.reprocess'
+    _description = 'Reprocess Amazon Payload Archive'
+
+    account_id = fields.Many2one('amazon.seller.account', string='Account', required=True, ondelete='cascade')
+    importer = fields.Selection([
+        ('orders', 'Orders'),
+        ('fba_inventory', 'FBA Inventory'),
+        ('awd_inventory', 'AWD Inventory'),
+        ('fba_inbound', 'FBA Inbound Shipments'),
+        ('awd_inbound', 'AWD Inbound Shipments'),
+        ('catalog', 'Catalog Details'),
+    ], string='Import', required=True, default='orders')
+    date_from = fields.Date(string='From', help='First archived day to reprocess. Leave empty to start with the oldest one.')
+    date_to = fields.Date(string='To', help='Last archived day to reprocess. Leave empty to end with the latest one.')
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from and wizard.date_to and wizard.date_from > wizard.date_to:
+                raise ValidationError(_('The start date must be before the end date.'))
+
+    def action_reprocess(self):
+        """
+        Run the selected import of the account once per archived day, oldest first, with the API helpers reading
+        the payloads archived that day. Only one day of payloads is held in memory, and every day is committed on
+        its own. When a key was archived several times in a day, its latest payload is used.
+        """
+        self.ensure_one()
+        account = self.account_id
+        archive_root = account.get_archive_root()
+        days = payload_archive.archived_days(archive_root, self.date_from, self.date_to)
+        if not days:
+            raise UserError(_('No payloads are archived for %(account)s in the selected days.', account=account.name))
+
+        model_name, method_name = IMPORTERS[self.importer]
+        for day in days:
+            description = f'reprocess {self.importer} from archive ({day})'
+            _logger.info('Running %s for account: %s', description, account.name)
+            try:
+                with payload_archive.replaying(payload_archive.Replay(archive_root, day, day)), account._sync_transaction(), \
+                        self.env['amazon.sync.run'].track(account, model_name, method_name, description):
+                    getattr(self.env[model_name], method_name)(account)
+            except Exception as e:
+                _logger.exception('Error during %s for account %s', description, account.name)
+                raise UserError(_('Reprocessing the archive of %(day)s failed, the days before it were reprocessed:\n\n%(error)s', day=day, error=e))
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Success'),
+                'message': _('The archived payloads were reprocessed.'),
+                'type': 'success',
+                'sticky': False,
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
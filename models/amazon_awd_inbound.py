@@ -13,19 +13,22 @@
 # ######################################################################################################################
 
 import logging
-import traceback
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from .utils import amazon_utils, payload_archive, profiling, telemetry
 
 _logger = logging.getLogger(__name__)
 
+# Request rate and burst of the AWD getInboundShipment operation
+SHIPMENT_DETAILS_RATE = 2.0
+SHIPMENT_DETAILS_BURST = 2
+
 class AmazonAWDInbound(models.Model):
     _name = 'amazon.awd.inbound'
     _description = 'Amazon AWD Inbound'
     _auto = False  # Don't create a database table for this model, since it doesn't store data directly
 
     @api.model
+    @profiling.profiled()
     def cron_awd_inbound(self):
         """
         Import AWD inbound shipments from Amazon.
@@ -33,20 +36,16 @@ class AmazonAWDInbound(models.Model):
 
         accounts = self.env['amazon.seller.account'].search([('import_awd_inbound_shipments', '=', True)])
         _logger.info('Starting Amazon AWD inbound import cron job for %s account(s)', len(accounts))
-        for account in accounts:
-            try:
-                _logger.debug('Importing AWD inbound for account: %s', account.name)
-
-                # Import AWD inbound shipments for the account
-                self.import_account_awd_inbound(account)
+        # Make sure the shared locations exist before the accounts are synced
+        self.env['amazon.awd.inventory'].get_awd_warehouse()
+        self.get_awd_transit_loc()
 
-            except Exception as e:
-                _logger.error('Error importing AWD inbound for account %s: %s', account.name, str(e))
-                _logger.error(traceback.format_exc())
-                raise ValidationError(f'Failed to import AWD inbound for account {account.name}: {str(e)} \n{traceback.format_exc()}')
+        # Shipments and their transfers belong to a single account, new address mappings are unique
+        accounts.run_sync_job(self._name, 'import_account_awd_inbound', 'import AWD inbound', parallel=True)
 
 
     @api.model
+    @profiling.profiled()
     def import_account_awd_inbound(self, account):
 
         # Get AWD Inbound Shipments
@@ -54,16 +53,94 @@ class AmazonAWDInbound(models.Model):
 
         if not awd_inbound_shipments:
             _logger.debug('No AWD inbound shipments found for account: %s', account.name)
-            return
         
         awd_inventory_model = self.env['amazon.awd.inventory']
         awd_wh, awd_inbound_loc, awd_stock_loc = awd_inventory_model.get_awd_warehouse()
 
-        for shipment in awd_inbound_shipments:
-            self.import_awd_inbound_shipment(account, shipment, awd_inbound_loc)
+        shipment_records = self.env['amazon.inbound.shipment'].register_shipments(
+            account, awd_inbound_shipments, id_key='shipmentId', status_key='shipmentStatus', kind='awd',
+        )
+
+        if payload_archive.current():
+            # Only the archived shipments can be imported again, the pending ones wait for the next live run
+            archived_ids = {shipment.get('shipmentId') for shipment in awd_inbound_shipments}
+            shipment_records = shipment_records.filtered(lambda shipment_record: shipment_record.shipment_id in archived_ids)
+
+        Jobs = self.env['amazon.sync.job']
+        if Jobs.is_enabled():
+            Jobs.enqueue('awd_inbound', account, shipment_records.mapped('shipment_id'))
+            return
+
+        run_cache = {}
+
+        def import_shipments_batch(shipment_records_batch):
+            self.import_shipment_records(account, shipment_records_batch, run_cache=run_cache)
+
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'awd_inbound', account, shipment_records, import_shipments_batch,
+            key=lambda shipment_record: shipment_record.shipment_id,
+        )
+
+    @api.model
+    @profiling.profiled()
+    def import_shipments_by_id(self, account, shipment_ids):
+        """
+        Import the registered AWD inbound shipments with the given ids only.
+        """
+        shipment_records = self.env['amazon.inbound.shipment'].search([
+            ('account_id', '=', account.id),
+            ('kind', '=', 'awd'),
+            ('shipment_id', 'in', list(shipment_ids)),
+        ])
+        if shipment_records:
+            self.import_shipment_records(account, shipment_records)
+
+    @api.model
+    @profiling.profiled()
+    def import_shipment_records(self, account, shipment_records, run_cache=None):
+        """
+        Import the given amazon.inbound.shipment rows and update their state. The shipment details of the shipments
+        without a picking are fetched concurrently before the pickings are created.
+        """
+        if run_cache is None:
+            run_cache = {}
+
+        awd_wh, awd_inbound_loc, awd_stock_loc = self.env['amazon.awd.inventory'].get_awd_warehouse()
+        account_data = amazon_utils.account_snapshot(account)
+        fetch_workers = self.env['amazon.seller.account'].get_fetch_workers()
+
+        # Cancelled or deleted shipments without picking need nothing
+        importable_records = shipment_records.filter_importable()
+        (shipment_records - importable_records).mark_processed()
+
+        # Only shipments without a picking need their details, fetch them concurrently before creating pickings. The
+        # origin address is only known from the details, so unmapped origins cannot be left out here.
+        shipment_details_by_id = amazon_utils.fetch_concurrently(
+            lambda shipment_id: amazon_utils.awd_get_inbound_shipment_details(account_data, shipment_id),
+            importable_records.filtered(lambda shipment_record: not shipment_record.picking_id).mapped('shipment_id'),
+            max_workers=fetch_workers, rate=SHIPMENT_DETAILS_RATE, burst=SHIPMENT_DETAILS_BURST,
+        )
+
+        for shipment_record in importable_records:
+            self.import_awd_inbound_shipment(
+                account, shipment_record.shipment_data, awd_inbound_loc,
+                shipment_record=shipment_record, shipment_details=shipment_details_by_id.get(shipment_record.shipment_id), run_cache=run_cache,
+            )
+            shipment_record.mark_processed()
 
 
-    def import_awd_inbound_shipment(self, account, shipment, awd_inbound_loc):
+    @telemetry.in_phase(telemetry.PHASE_WRITE)
+    @profiling.profiled()
+    def import_awd_inbound_shipment(self, account, shipment, awd_inbound_loc, shipment_record=None, shipment_details=None, run_cache=None):
+        """
+        Import one AWD inbound shipment as a picking. Returns the picking of the shipment, or None when it could not
+        be imported yet. The picking is linked to ``shipment_record``, the amazon.inbound.shipment row of the shipment,
+        which is looked up when not given. ``shipment_details`` are fetched from Amazon when not prefetched.
+        ``run_cache`` is an optional dict shared by the shipments of one run.
+        """
+        if run_cache is None:
+            run_cache = {}
+
         shipment_id = shipment.get('shipmentId')
         transfer_name = f'{shipment_id}'
 
@@ -71,17 +148,19 @@ class AmazonAWDInbound(models.Model):
             _logger.warning('Skipping shipment without ShipmentId: %s', shipment)
             return
 
+        if not shipment_record:
+            shipment_record = self.env['amazon.inbound.shipment'].get_shipment_record(account, shipment_id, 'awd')
+
         # Check if the picking already exists for shipment
-        existing_pick = self.env['stock.picking'].search([
-            ('origin', '=', transfer_name),
-        ], limit=1)
+        existing_pick = shipment_record.picking_id
 
         if existing_pick:
             _logger.debug('AWD inbound shipment %s already exists as a stock picking', transfer_name)
-            return
+            return existing_pick
         
         # Get the inbound shipment details
-        shipment_details = amazon_utils.awd_get_inbound_shipment_details(account, shipment.get('shipmentId'))
+        if shipment_details is None:
+            shipment_details = amazon_utils.awd_get_inbound_shipment_details(account, shipment.get('shipmentId'))
         if not shipment_details:
             _logger.warning('No details found for AWD inbound shipment %s', shipment.get('shipmentId'))
             return
@@ -94,7 +173,8 @@ class AmazonAWDInbound(models.Model):
             city=shipment_details.get('originAddress', {}).get('city', ''),
             state_or_region=shipment_details.get('originAddress', {}).get('stateOrRegion', ''),
             postal_code=shipment_details.get('originAddress', {}).get('postalCode', ''),
-            country_code=shipment_details.get('originAddress', {}).get('countryCode', 'US')
+            country_code=shipment_details.get('originAddress', {}).get('countryCode', 'US'),
+            address_cache=run_cache.setdefault('address_locations', {}),
         )
 
         # If no warehouse location is found, skip this shipment
@@ -120,6 +200,11 @@ class AmazonAWDInbound(models.Model):
             ''',
         }
 
+        # Resolved once per run, the moves of every shipment use the same unit
+        if 'uom_unit_id' not in run_cache:
+            run_cache['uom_unit_id'] = self.env.ref('uom.product_uom_unit').id
+        uom_unit_id = run_cache['uom_unit_id']
+
         moves_queue = []
         for item in shipment_details.get('shipmentContainerQuantities', []):
                 carton_count = item.get('count')
@@ -156,7 +241,7 @@ class AmazonAWDInbound(models.Model):
                     'product_uom_qty': total_item_qty,
                     'quantity': total_item_qty,
                     'availability': total_item_qty,
-                    'product_uom': self.env.ref('uom.product_uom_unit').id,
+                    'product_uom': uom_unit_id,
                     'location_id': from_warehouse_location.id,
                     'location_dest_id': awd_transit_loc.id,
                 }
@@ -167,7 +252,7 @@ class AmazonAWDInbound(models.Model):
                     'product_uom_qty': total_item_qty,
                     'quantity': total_item_qty,
                     'availability': total_item_qty,
-                    'product_uom': self.env.ref('uom.product_uom_unit').id,
+                    'product_uom': uom_unit_id,
                     'location_id': awd_transit_loc.id,
                     'location_dest_id': awd_inbound_loc.id,
                 }
@@ -180,26 +265,31 @@ class AmazonAWDInbound(models.Model):
 
         # Create the stock picking
         pick = self.env['stock.picking'].create(pick_vals)
+        telemetry.count('created')
+        shipment_record.picking_id = pick
 
-        # Create the stock moves for delivery and receipt
+        # Create the stock moves for delivery and receipt in one batch
+        move_vals_list = []
         for delivery_move_vals, reciept_move_vals in moves_queue:
-            delivery_move_vals['picking_id'] = pick.id
-            reciept_move_vals['picking_id'] = pick.id
+            move_vals_list.append(dict(delivery_move_vals, picking_id=pick.id))
+            move_vals_list.append(dict(reciept_move_vals, picking_id=pick.id))
+
+        self.env['stock.move'].create(move_vals_list)
 
-            self.env['stock.move'].create(delivery_move_vals)
-            self.env['stock.move'].create(reciept_move_vals)
+        with telemetry.phase(telemetry.PHASE_VALIDATE):
+            # Confirm the picking to create the stock moves
+            pick.action_confirm()
+            _logger.info('Confirmed internal transfer for AWD inbound shipment %s', transfer_name)
 
-        # Confirm the picking to create the stock moves
-        pick.action_confirm()
-        _logger.info('Confirmed internal transfer for AWD inbound shipment %s', transfer_name)
+            # Assign the stock moves
+            pick.action_assign()
+            _logger.info('Assigned stock moves for AWD inbound shipment %s', transfer_name)
 
-        # Assign the stock moves
-        pick.action_assign()
-        _logger.info('Assigned stock moves for AWD inbound shipment %s', transfer_name)
+            # Validate the picking to complete the transfer
+            pick.button_validate()
+            _logger.info('Validated internal transfer for AWD inbound shipment %s', transfer_name)
 
-        # Validate the picking to complete the transfer
-        pick.button_validate()
-        _logger.info('Validated internal transfer for AWD inbound shipment %s', transfer_name)
+        return pick
 
 
     def get_awd_transit_loc(self):
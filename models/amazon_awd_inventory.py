@@ -13,10 +13,8 @@
 # ######################################################################################################################
 
 import logging
-import traceback
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from .utils import amazon_utils, profiling, telemetry
 from datetime import datetime
 from datetime import date
 import random
@@ -29,22 +27,17 @@ class AmazonAWDInventory(models.Model):
     _auto = False  # Don't create a database table for this model, since it doesn't store data directly
 
     @api.model
+    @profiling.profiled()
     def cron_awd_inventory_sync(self):
         amz_seller_accounts = self.env['amazon.seller.account'].search([('import_awd_inventory', '=', True)])
         _logger.info('Starting Amazon AWD inventory sync cron job for %s account(s) with AWD import enabled', len(amz_seller_accounts))
         self.get_awd_warehouse()  # Initialize AWD warehouse and stock locations
-        for amz_account in amz_seller_accounts:
-            try:
-                _logger.info('Importing AWD inventory for account: %s', amz_account.name)
-                self._update_account_awd_inventory(amz_account)
-
-            except Exception as e:
-                _logger.error('Error importing AWD inventory for account %s: %s', amz_account.name, str(e))
-                _logger.error(traceback.format_exc())
-                raise ValidationError(f'Failed to import AWD inventory for account {amz_account.name}: {str(e)} \n{traceback.format_exc()}')
+        # Not run in parallel: the accounts update the quants of the same AWD warehouse
+        amz_seller_accounts.run_sync_job(self._name, '_update_account_awd_inventory', 'import AWD inventory')
 
 
     @api.model
+    @profiling.profiled()
     def _update_account_awd_inventory(self, amz_account):
         awd_inventory_list = amazon_utils.list_all_awd_inventory(amz_account)
 
@@ -58,55 +51,63 @@ class AmazonAWDInventory(models.Model):
 
         finished_skus = []
 
-        for awd_inventory in awd_inventory_list:
-            sku = awd_inventory.get('sku')
-            if not sku:
-                _logger.warning('AWD inventory item missing SKU: %s', awd_inventory)
-                continue
+        def update_inventory_batch(awd_inventory_list_batch):
+            for awd_inventory in awd_inventory_list_batch:
+                sku = awd_inventory.get('sku')
+                if not sku:
+                    _logger.warning('AWD inventory item missing SKU: %s', awd_inventory)
+                    continue
             
-            if sku in finished_skus:
-                _logger.debug('Skipping already processed SKU: %s', sku)
-                continue
+                if sku in finished_skus:
+                    _logger.debug('Skipping already processed SKU: %s', sku)
+                    continue
+
+                # Find product by SKU
+                product = self.env['product.template'].find_by_msku(sku)
 
-            # Find product by SKU
-            product = self.env['product.template'].find_by_msku(sku)
+                if not product:
+                    _logger.debug('No product found for SKU: %s', sku)
+                    continue
 
-            if not product:
-                _logger.debug('No product found for SKU: %s', sku)
-                continue
+                # See if we should skip inventory without cost
+                if amz_account.skip_inventory_when_no_product_cost and not product.standard_price:
+                    _logger.warning('Skipping inventory update for product %s because it has no cost', product.name)
+                    continue
 
-            # See if we should skip inventory without cost
-            if amz_account.skip_inventory_when_no_product_cost and not product.standard_price:
-                _logger.warning('Skipping inventory update for product %s because it has no cost', product.name)
-                continue
+                # if we should skip inventory not using AVCO
+                if amz_account.skip_inventory_not_avco and product.cost_method != 'average':
+                    _logger.warning('Skipping inventory update for product %s because it is not using AVCO', product.name)
+                    continue
 
-            # if we should skip inventory not using AVCO
-            if amz_account.skip_inventory_not_avco and product.cost_method != 'average':
-                _logger.warning('Skipping inventory update for product %s because it is not using AVCO', product.name)
-                continue
+                # Get all Amazon mskus for the product to account for the sum of quantities
+                amazon_msku_list = product.amazon_msku_ids
 
-            # Get all Amazon mskus for the product to account for the sum of quantities
-            amazon_msku_list = product.amazon_msku_ids
+                total_product_inbound_quantity = 0
+                total_product_on_hand_quantity = 0
 
-            total_product_inbound_quantity = 0
-            total_product_on_hand_quantity = 0
+                for amazon_msku in amazon_msku_list:    
+                    # Find the matching AWD inventory item for this msku
+                    matching_awd_inventory = next((item for item in awd_inventory_list if item.get('sku') == amazon_msku.name), None)
+                    if matching_awd_inventory:
+                        total_product_inbound_quantity += matching_awd_inventory.get('totalInboundQuantity', 0)
+                        total_product_on_hand_quantity += matching_awd_inventory.get('totalOnhandQuantity', 0)
 
-            for amazon_msku in amazon_msku_list:    
-                # Find the matching AWD inventory item for this msku
-                matching_awd_inventory = next((item for item in awd_inventory_list if item.get('sku') == amazon_msku.name), None)
-                if matching_awd_inventory:
-                    total_product_inbound_quantity += matching_awd_inventory.get('totalInboundQuantity', 0)
-                    total_product_on_hand_quantity += matching_awd_inventory.get('totalOnhandQuantity', 0)
+                    # Update the finished SKUs list
+                    finished_skus.append(amazon_msku.name)
 
-                # Update the finished SKUs list
-                finished_skus.append(amazon_msku.name)
+                # Adjust the inventory in Odoo
+                date_string = datetime.now().strftime('%Y-%m-%d')
+                self.awd_inventory_adjustment(product, awd_inbound_loc, total_product_inbound_quantity, awd_wh, f"AWD Inventory Sync (Inbound): {amazon_msku.name}, {date_string}")
+                self.awd_inventory_adjustment(product, awd_stock_loc, total_product_on_hand_quantity, awd_wh, f"AWD Inventory Sync (Stock): {amazon_msku.name}, {date_string}")
 
-            # Adjust the inventory in Odoo
-            date_string = datetime.now().strftime('%Y-%m-%d')
-            self.awd_inventory_adjustment(product, awd_inbound_loc, total_product_inbound_quantity, awd_wh, f"AWD Inventory Sync (Inbound): {amazon_msku.name}, {date_string}")
-            self.awd_inventory_adjustment(product, awd_stock_loc, total_product_on_hand_quantity, awd_wh, f"AWD Inventory Sync (Stock): {amazon_msku.name}, {date_string}")
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'awd_inventory', amz_account, awd_inventory_list, update_inventory_batch,
+            key=lambda awd_inventory: awd_inventory.get('sku') or '',
+        )
 
 
+    @telemetry.in_phase(telemetry.PHASE_WRITE)
+    @profiling.profiled()
     def awd_inventory_adjustment(self, product, location, final_quantity, awd_wh, name):
         # Get current quantity in the location
         current_qty = self.env['stock.quant']._get_available_quantity(product, location)
@@ -155,11 +156,14 @@ class AmazonAWDInventory(models.Model):
             'picking_id': picking.id,
         })
 
+        telemetry.count('created')
+
         # Validate the picking to create the stock quant
-        picking.action_confirm()
-        picking.action_assign() 
-        picking._action_done()
-        picking.button_validate()
+        with telemetry.phase(telemetry.PHASE_VALIDATE):
+            picking.action_confirm()
+            picking.action_assign()
+            picking._action_done()
+            picking.button_validate()
 
         _logger.info('Inventory adjustment for product %s at location %s: %s units adjusted', product.name, location.name, delta_qty)
 
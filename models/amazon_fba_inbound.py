@@ -13,20 +13,26 @@
 # ######################################################################################################################
 
 import logging
-import traceback
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from .utils import amazon_utils, payload_archive, profiling, telemetry
 from datetime import datetime, timedelta
 
 _logger = logging.getLogger(__name__)
 
+# Shipments updated shortly before the previous run are fetched again, the shipment registry skips them
+INBOUND_WATERMARK_OVERLAP = timedelta(hours=1)
+
+# Request rate and burst of the getShipmentItemsByShipmentId operation
+SHIPMENT_ITEMS_RATE = 2.0
+SHIPMENT_ITEMS_BURST = 30
+
 class AmazonFBAInbound(models.Model):
     _name = 'amazon.fba.inbound'
     _description = 'Amazon FBA Inbound'
     _auto = False  # Don't create a database table for this model, since it doesn't store data directly
 
     @api.model
+    @profiling.profiled()
     def cron_fba_inbound(self):
         """
         Import FBA inbound shipments from Amazon.
@@ -34,21 +40,16 @@ class AmazonFBAInbound(models.Model):
 
         accounts = self.env['amazon.seller.account'].search([('import_fba_inbound_shipments', '=', True)])
         _logger.info('Starting Amazon FBA inbound import cron job for %s account(s)', len(accounts))
-        for account in accounts:
-            try:
-                _logger.info('Importing FBA inbound for account: %s', account.name)
-
-                # Add new inbound shipments to the FBA Inbound location
-                self.import_account_fba_inbound(account)
+        # Make sure the shared locations exist before the accounts are synced
+        self.env['amazon.fba.inventory'].get_fba_warehouse()
+        self.get_fba_transit_loc()
 
-
-            except Exception as e:
-                _logger.error('Error importing FBA inbound for account %s: %s', account.name, str(e))
-                _logger.error(traceback.format_exc())
-                raise ValidationError(f'Failed to import FBA inbound for account {account.name}: {str(e)} \n{traceback.format_exc()}')
+        # Shipments and their transfers belong to a single account, new address mappings are unique
+        accounts.run_sync_job(self._name, 'import_account_fba_inbound', 'import FBA inbound', parallel=True)
 
     
     @api.model
+    @profiling.profiled()
     def import_account_fba_inbound(self, account):
         """
         Import FBA inbound shipments for a specific account.
@@ -58,17 +59,103 @@ class AmazonFBAInbound(models.Model):
         fba_inventory_model = self.env['amazon.fba.inventory']
         fba_wh, fba_inbound_loc, fba_stock_loc, fba_reserved_loc, fba_researching_loc, fba_unfulfillable_loc = fba_inventory_model.get_fba_warehouse()
 
-        inbound_shipment_list = amazon_utils.fba_inbound_shipments_previous_days(account, days=365)
+        # Only ask Amazon for shipments updated since the previous run, with some overlap for clock skew
+        sync_started = fields.Datetime.now()
+        last_updated_after = account.fba_inbound_last_updated - INBOUND_WATERMARK_OVERLAP if account.fba_inbound_last_updated else None
+        inbound_shipment_list = amazon_utils.fba_inbound_shipments_previous_days(account, days=365, last_updated_after=last_updated_after)
 
-        if not inbound_shipment_list:
-            _logger.info('No FBA inbound shipments found for account: %s', account.name)
-            return
+        shipment_records = self.env['amazon.inbound.shipment'].register_shipments(
+            account, inbound_shipment_list, id_key='ShipmentId', status_key='ShipmentStatus', kind='fba',
+        )
+
+        replay = payload_archive.current()
+        if replay:
+            # Only the archived shipments can be imported again, the pending ones wait for the next live run
+            archived_ids = {shipment.get('ShipmentId') for shipment in inbound_shipment_list}
+            shipment_records = shipment_records.filtered(lambda shipment_record: shipment_record.shipment_id in archived_ids)
+
+        if not shipment_records:
+            _logger.info('No FBA inbound shipments to import for account: %s', account.name)
         
-        for shipment in inbound_shipment_list:
-            self.import_fba_inbound_shipment(account, shipment, fba_inbound_loc, fba_wh)
+        Jobs = self.env['amazon.sync.job']
+        if Jobs.is_enabled():
+            # Shipments left pending by a failed job are returned by the registry and queued again by the next run
+            Jobs.enqueue('fba_inbound', account, shipment_records.mapped('shipment_id'))
+        else:
+            run_cache = {}
+
+            def import_shipments_batch(shipment_records_batch):
+                self.import_shipment_records(account, shipment_records_batch, run_cache=run_cache)
 
+            self.env['amazon.sync.checkpoint'].run_in_batches(
+                'fba_inbound', account, shipment_records, import_shipments_batch,
+                key=lambda shipment_record: shipment_record.shipment_id,
+            )
 
-    def import_fba_inbound_shipment(self, account, shipment, fba_inbound_loc, fba_wh):
+        if not replay:
+            account.fba_inbound_last_updated = sync_started
+
+    @api.model
+    @profiling.profiled()
+    def import_shipments_by_id(self, account, shipment_ids):
+        """
+        Import the registered FBA inbound shipments with the given ids only.
+        """
+        shipment_records = self.env['amazon.inbound.shipment'].search([
+            ('account_id', '=', account.id),
+            ('kind', '=', 'fba'),
+            ('shipment_id', 'in', list(shipment_ids)),
+        ])
+        if shipment_records:
+            self.import_shipment_records(account, shipment_records)
+
+    @api.model
+    @profiling.profiled()
+    def import_shipment_records(self, account, shipment_records, run_cache=None):
+        """
+        Import the given amazon.inbound.shipment rows and update their state. The shipment items of the shipments
+        without a picking are fetched concurrently before the pickings are created.
+        """
+        if run_cache is None:
+            run_cache = {}
+
+        fba_wh, fba_inbound_loc, fba_stock_loc, fba_reserved_loc, fba_researching_loc, fba_unfulfillable_loc = self.env['amazon.fba.inventory'].get_fba_warehouse()
+        account_data = amazon_utils.account_snapshot(account)
+        fetch_workers = self.env['amazon.seller.account'].get_fetch_workers()
+
+        # Cancelled or deleted shipments without picking need nothing
+        importable_records = shipment_records.filter_importable()
+        (shipment_records - importable_records).mark_processed()
+
+        # Only shipments without a picking and with a mapped origin need their items, fetch them concurrently
+        # before creating pickings
+        shipment_items_by_id = amazon_utils.fetch_concurrently(
+            lambda shipment_id: amazon_utils.fba_get_shipment_items_by_shipment_id(account_data, shipment_id),
+            importable_records.filtered(
+                lambda shipment_record: not shipment_record.picking_id and self._get_ship_from_location(shipment_record.shipment_data, run_cache)
+            ).mapped('shipment_id'),
+            max_workers=fetch_workers, rate=SHIPMENT_ITEMS_RATE, burst=SHIPMENT_ITEMS_BURST,
+        )
+
+        for shipment_record in importable_records:
+            self.import_fba_inbound_shipment(
+                account, shipment_record.shipment_data, fba_inbound_loc, fba_wh,
+                shipment_record=shipment_record, shipment_items=shipment_items_by_id.get(shipment_record.shipment_id), run_cache=run_cache,
+            )
+            shipment_record.mark_processed()
+
+
+    @telemetry.in_phase(telemetry.PHASE_WRITE)
+    @profiling.profiled()
+    def import_fba_inbound_shipment(self, account, shipment, fba_inbound_loc, fba_wh, shipment_record=None, shipment_items=None, run_cache=None):
+        """
+        Import one FBA inbound shipment as a picking. Returns the picking of the shipment, or None when it could not
+        be imported yet. The picking is linked to ``shipment_record``, the amazon.inbound.shipment row of the shipment,
+        which is looked up when not given. ``shipment_items`` are fetched from Amazon when not prefetched.
+        ``run_cache`` is an optional dict shared by the shipments of one run.
+        """
+        if run_cache is None:
+            run_cache = {}
 
         shipment_id = shipment.get('ShipmentId')
         transfer_name = f'{shipment_id}'
@@ -77,26 +164,19 @@ class AmazonFBAInbound(models.Model):
             _logger.warning('Skipping shipment without ShipmentId: %s', shipment)
             return
 
+        if not shipment_record:
+            shipment_record = self.env['amazon.inbound.shipment'].get_shipment_record(account, shipment_id, 'fba')
+
         # Check if the picking already exists for shipment
-        existing_pick = self.env['stock.picking'].search([
-            ('origin', '=', transfer_name),
-        ], limit=1)
+        existing_pick = shipment_record.picking_id
 
         if existing_pick:
-            self.check_for_cancelled_fba_inbound_shipment(existing_pick, shipment, transfer_name, fba_wh)
+            self.check_for_cancelled_fba_inbound_shipment(existing_pick, shipment, transfer_name, fba_wh, shipment_record)
             _logger.debug('FBA inbound shipment %s already exists as a stock picking', transfer_name)
-            return
+            return existing_pick
 
         # Determine main warehouse stock location from address map
-        from_warehouse_location = self.env['amazon.address.map'].get_warehouse_location_else_create(
-            name=shipment.get('ShipFromAddress', {}).get('Name', ''),
-            address_line1=shipment.get('ShipFromAddress', {}).get('AddressLine1', ''),
-            address_line2=shipment.get('ShipFromAddress', {}).get('AddressLine2', ''),
-            city=shipment.get('ShipFromAddress', {}).get('City', ''),
-            state_or_region=shipment.get('ShipFromAddress', {}).get('StateOrProvinceCode', ''),
-            postal_code=shipment.get('ShipFromAddress', {}).get('PostalCode', ''),
-            country_code=shipment.get('ShipFromAddress', {}).get('CountryCode', '')
-        ) 
+        from_warehouse_location = self._get_ship_from_location(shipment, run_cache)
 
         # If no warehouse location is found, skip this shipment
         if not from_warehouse_location:
@@ -122,12 +202,18 @@ class AmazonFBAInbound(models.Model):
         }
 
         # Get shipment items
-        shipment_items = amazon_utils.fba_get_shipment_items_by_shipment_id(account, shipment_id)
+        if shipment_items is None:
+            shipment_items = amazon_utils.fba_get_shipment_items_by_shipment_id(account, shipment_id)
 
         if not shipment_items:
             _logger.warning('No shipment items found for FBA inbound shipment %s. Skipping this shipment.', transfer_name)
             return
 
+        # Resolved once per run, the moves of every shipment use the same unit
+        if 'uom_unit_id' not in run_cache:
+            run_cache['uom_unit_id'] = self.env.ref('uom.product_uom_unit').id
+        uom_unit_id = run_cache['uom_unit_id']
+
         # Create the stock picking for the transfer
         moves_queue = []
         for item in shipment_items:
@@ -161,7 +247,7 @@ class AmazonFBAInbound(models.Model):
                 'product_uom_qty': item_qty,
                 'quantity': item_qty,
                 'availability': item_qty,
-                'product_uom': self.env.ref('uom.product_uom_unit').id,
+                'product_uom': uom_unit_id,
                 'location_id': from_warehouse_location.id,
                 'location_dest_id': fba_transit_loc.id,
             }
@@ -172,7 +258,7 @@ class AmazonFBAInbound(models.Model):
                 'product_uom_qty': item_qty,
                 'quantity': item_qty,
                 'availability': item_qty,
-                'product_uom': self.env.ref('uom.product_uom_unit').id,
+                'product_uom': uom_unit_id,
                 'location_id': fba_transit_loc.id,
                 'location_dest_id': fba_inbound_loc.id,
             }
@@ -186,28 +272,49 @@ class AmazonFBAInbound(models.Model):
 
         # Create the stock picking
         pick = self.env['stock.picking'].create(pick_vals)
+        telemetry.count('created')
+        shipment_record.picking_id = pick
         _logger.info('Created internal transfer for FBA inbound shipment %s', transfer_name)
 
-        # Create the stock moves for delivery and receipt
+        # Create the stock moves for delivery and receipt in one batch
+        move_vals_list = []
         for delivery_move_vals, reciept_move_vals in moves_queue:
-            delivery_move_vals['picking_id'] = pick.id
-            reciept_move_vals['picking_id'] = pick.id
+            move_vals_list.append(dict(delivery_move_vals, picking_id=pick.id))
+            move_vals_list.append(dict(reciept_move_vals, picking_id=pick.id))
+
+        self.env['stock.move'].create(move_vals_list)
+
+        with telemetry.phase(telemetry.PHASE_VALIDATE):
+            # Confirm the picking to create the stock moves
+            pick.action_confirm()
+            _logger.info('Confirmed internal transfer for FBA inbound shipment %s', transfer_name)
 
-            self.env['stock.move'].create(delivery_move_vals)
-            self.env['stock.move'].create(reciept_move_vals)
+            # Assign the stock moves
+            pick.action_assign()
+            _logger.info('Assigned stock moves for FBA inbound shipment %s', transfer_name)
 
-        # Confirm the picking to create the stock moves
-        pick.action_confirm()
-        _logger.info('Confirmed internal transfer for FBA inbound shipment %s', transfer_name)
+            # Validate the picking to complete the transfer
+            pick.button_validate()
+            _logger.info('Validated internal transfer for FBA inbound shipment %s', transfer_name)
 
-        # Assign the stock moves
-        pick.action_assign()
-        _logger.info('Assigned stock moves for FBA inbound shipment %s', transfer_name)
+        return pick
 
-        # Validate the picking to complete the transfer
-        pick.button_validate()
-        _logger.info('Validated internal transfer for FBA inbound shipment %s', transfer_name)
 
+    @api.model
+    def _get_ship_from_location(self, shipment, run_cache):
+        """
+        Warehouse location mapped to the ship from address of the shipment, or None when it is not mapped yet.
+        """
+        return self.env['amazon.address.map'].get_warehouse_location_else_create(
+            name=shipment.get('ShipFromAddress', {}).get('Name', ''),
+            address_line1=shipment.get('ShipFromAddress', {}).get('AddressLine1', ''),
+            address_line2=shipment.get('ShipFromAddress', {}).get('AddressLine2', ''),
+            city=shipment.get('ShipFromAddress', {}).get('City', ''),
+            state_or_region=shipment.get('ShipFromAddress', {}).get('StateOrProvinceCode', ''),
+            postal_code=shipment.get('ShipFromAddress', {}).get('PostalCode', ''),
+            country_code=shipment.get('ShipFromAddress', {}).get('CountryCode', ''),
+            address_cache=run_cache.setdefault('address_locations', {}),
+        )
 
     def get_fba_transit_loc(self):
         """
@@ -224,15 +331,14 @@ class AmazonFBAInbound(models.Model):
         return fba_partner_loc
 
 
-    def check_for_cancelled_fba_inbound_shipment(self, existing_pick, shipment, transfer_name, fba_wh):
+    @profiling.profiled()
+    def check_for_cancelled_fba_inbound_shipment(self, existing_pick, shipment, transfer_name, fba_wh, shipment_record):
         if shipment.get('ShipmentStatus') == 'CANCELLED':
 
             return_name = f'Cancelled Shipment {transfer_name}'
 
             # See if we already have a return picking for this shipment
-            existing_return_pick = self.env['stock.picking'].search([
-                ('origin', '=', return_name),
-            ], limit=1)
+            existing_return_pick = shipment_record.return_picking_id
 
             if existing_return_pick:
                 _logger.info('Return picking for cancelled shipment %s already exists. Skipping creation.', transfer_name)
@@ -252,10 +358,13 @@ class AmazonFBAInbound(models.Model):
 
             # Create the return picking
             return_picking = self.env['stock.picking'].create(return_picking_vals)
+            telemetry.count('created')
+            shipment_record.return_picking_id = return_picking
 
             # Create return moves for each original move line
+            return_move_vals_list = []
             for move_line in existing_pick.move_ids:
-                return_move_vals = {
+                return_move_vals_list.append({
                     'product_id': move_line.product_id.id,
                     'product_uom_qty': move_line.product_uom_qty,
                     'product_uom': move_line.product_uom.id,
@@ -263,8 +372,9 @@ class AmazonFBAInbound(models.Model):
                     'location_dest_id': move_line.location_id.id,  # Source of original move becomes destination for return move
                     'picking_id': return_picking.id,
                     'name': 'Return: ' + move_line.product_id.name,
-                }
-                self.env['stock.move'].create(return_move_vals)
+                })
+            self.env['stock.move'].create(return_move_vals_list)
 
             # Validate the return picking (optional, depending on your workflow)
-            return_picking.button_validate()
+            with telemetry.phase(telemetry.PHASE_VALIDATE):
+                return_picking.button_validate()
@@ -16,10 +16,8 @@ from asyncio.log import logger
 from datetime import datetime
 from datetime import date
 import logging
-import traceback
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from .utils import amazon_utils, payload_archive, profiling, telemetry
 import random
 
 _logger = logging.getLogger(__name__)
@@ -31,23 +29,18 @@ class AmazonFBAInventory(models.Model):
     _auto = False  # Don't create a database table for this model, since it doesn't store data directly
 
     @api.model
+    @profiling.profiled()
     def cron_fba_inventory_sync(self):
         amz_seller_accounts = self.env['amazon.seller.account'].search([('import_fba_inventory', '=', True)])
         _logger.info('Starting Amazon FBA inventory sync cron job for %s account(s) with FBA import enabled', len(amz_seller_accounts))
         self.get_fba_warehouse() # Initialize FBA warehouse and stock locations
         
-        for amz_account in amz_seller_accounts:
-            try:
-                _logger.info('Importing FBA inventory for account: %s', amz_account.name)
-                self._update_account_fba_inventory(amz_account)
-
-            except Exception as e:
-                _logger.error('Error importing FBA inventory for account %s: %s', amz_account.name, str(e))
-                _logger.error(traceback.format_exc())
-                raise ValidationError(f'Failed to import FBA inventory for account {amz_account.name}: {str(e)} \n{traceback.format_exc()}')
+        # Not run in parallel: the accounts update the quants of the same FBA warehouse
+        amz_seller_accounts.run_sync_job(self._name, '_update_account_fba_inventory', 'import FBA inventory')
 
 
     @api.model
+    @profiling.profiled()
     def _update_account_fba_inventory(self, amz_account):
         # Get all products
         product_list = self.env['product.template'].search([('amazon_asin', '!=', False)])
@@ -58,9 +51,36 @@ class AmazonFBAInventory(models.Model):
         
         _logger.info('Found %s products for account %s', len(product_list), amz_account.name)
 
+        Jobs = self.env['amazon.sync.job']
+        if Jobs.is_enabled():
+            Jobs.enqueue('fba_inventory', amz_account, product_list.amazon_msku_ids.mapped('name'))
+            return
+
+        def update_products_batch(product_list_batch):
+            self.update_products_fba_inventory(amz_account, product_list_batch)
+
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'fba_inventory', amz_account, product_list, update_products_batch,
+        )
+
+
+    @api.model
+    def sync_skus_fba_inventory(self, amz_account, skus):
+        """
+        Update the FBA inventory of the products with the given MSKUs only, e.g. after an inventory notification.
+        """
+        products = self.env['amazon.msku'].search([('name', 'in', list(skus))]).product_tmpl_id
+        if products:
+            self.update_products_fba_inventory(amz_account, products)
+
+    @api.model
+    def update_products_fba_inventory(self, amz_account, products):
+        """
+        Set the FBA stock locations of the given products to the quantities reported by Amazon for their MSKUs.
+        """
         fba_wh, fba_inbound_loc, fba_stock_loc, fba_reserved_loc, fba_researching_loc, fba_unfulfillable_loc = self.get_fba_warehouse()
 
-        for product in product_list:
+        for product in products:
             # Get FBA inventory for each product by summing each msku's quantities
             amazon_msku_list = product.amazon_msku_ids
 
@@ -85,21 +105,31 @@ class AmazonFBAInventory(models.Model):
             total_unfulfillable_quantity = 0
             total_future_supply_quantity = 0
 
-            for amazon_msku in amazon_msku_list:
-                fba_inventory = amazon_utils.get_fba_inventory_summary_by_sku(amazon_msku.name, amz_account)
+            try:
+                fba_inventories_by_msku = {
+                    amazon_msku: amazon_utils.get_fba_inventory_summaries_by_sku(amazon_msku.name, amz_account)
+                    for amazon_msku in amazon_msku_list
+                }
+            except payload_archive.NotArchivedError as e:
+                _logger.warning('Skipping inventory update for product %s: %s', product.name, e)
+                continue
+
+            for amazon_msku, fba_inventories in fba_inventories_by_msku.items():
 
-                if not fba_inventory:
+                if not fba_inventories:
                     _logger.debug('No FBA inventory found for MSKU: %s', amazon_msku.name)
                     continue
 
-                total_inbound_quantity += fba_inventory.get('inventoryDetails',{}).get('inboundWorkingQuantity', 0)
-                total_inbound_quantity += fba_inventory.get('inventoryDetails',{}).get('inboundShippedQuantity', 0)
-                total_inbound_quantity += fba_inventory.get('inventoryDetails',{}).get('inboundReceivingQuantity', 0)
+                # One summary per marketplace of the account, their quantities add up
+                for fba_inventory in fba_inventories:
+                    total_inbound_quantity += fba_inventory.get('inventoryDetails',{}).get('inboundWorkingQuantity', 0)
+                    total_inbound_quantity += fba_inventory.get('inventoryDetails',{}).get('inboundShippedQuantity', 0)
+                    total_inbound_quantity += fba_inventory.get('inventoryDetails',{}).get('inboundReceivingQuantity', 0)
 
-                total_fulfillable_quantity += fba_inventory.get('inventoryDetails',{}).get('fulfillableQuantity', 0)
-                total_reserved_quantity += fba_inventory.get('inventoryDetails',{}).get('reservedQuantity', {}).get('totalReservedQuantity', 0)
-                total_researching_quantity += fba_inventory.get('inventoryDetails',{}).get('researchingQuantity', {}).get('totalResearchingQuantity', 0)
-                total_unfulfillable_quantity += fba_inventory.get('inventoryDetails',{}).get('unfulfillableQuantity', {}).get('totalUnfulfillableQuantity', 0)
+                    total_fulfillable_quantity += fba_inventory.get('inventoryDetails',{}).get('fulfillableQuantity', 0)
+                    total_reserved_quantity += fba_inventory.get('inventoryDetails',{}).get('reservedQuantity', {}).get('totalReservedQuantity', 0)
+                    total_researching_quantity += fba_inventory.get('inventoryDetails',{}).get('researchingQuantity', {}).get('totalResearchingQuantity', 0)
+                    total_unfulfillable_quantity += fba_inventory.get('inventoryDetails',{}).get('unfulfillableQuantity', {}).get('totalUnfulfillableQuantity', 0)
                 # total_future_supply_quantity += fba_inventory.get('inventoryDetails',{}).get('futureSupplyQuantity', 0)
 
             date_string = datetime.now().strftime('%Y-%m-%d')
@@ -110,7 +140,8 @@ class AmazonFBAInventory(models.Model):
             self.fba_inventory_adjustment(product, fba_unfulfillable_loc, total_unfulfillable_quantity, fba_wh, f"FBA Inventory Sync (Unfulfillable): {amazon_msku.name}, {date_string}")
             #TODO: Not sure if we should set future supply quantity, or if its already considered in the other quantities
 
-
+    @telemetry.in_phase(telemetry.PHASE_WRITE)
+    @profiling.profiled()
     def fba_inventory_adjustment(self, product, location, final_quantity, fba_wh, name):
         # Get current quantity in the location
         current_qty = self.env['stock.quant']._get_available_quantity(product, location)
@@ -159,11 +190,14 @@ class AmazonFBAInventory(models.Model):
             'picking_id': picking.id,
         })
 
+        telemetry.count('created')
+
         # Validate the picking to create the stock quant
-        picking.action_confirm()
-        picking.action_assign() 
-        picking._action_done()
-        picking.button_validate()
+        with telemetry.phase(telemetry.PHASE_VALIDATE):
+            picking.action_confirm()
+            picking.action_assign()
+            picking._action_done()
+            picking.button_validate()
 
         _logger.info('Inventory adjustment for product %s at location %s: %s units adjusted', product.name, location.name, delta_qty)
 
@@ -13,10 +13,8 @@
 # ######################################################################################################################
 
 import logging
-import traceback
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from .utils import amazon_utils, payload_archive, profiling, telemetry
 
 _logger = logging.getLogger(__name__)
 
@@ -100,6 +98,7 @@ class ProductTemplate(models.Model):
         return bool(self.amazon_fnsku_ids.filtered(lambda x: x.name == fnsku))
     
     @api.model
+    @telemetry.in_phase(telemetry.PHASE_RESOLVE)
     def find_by_msku(self, msku):
         """Find product by any MSKU - simple and direct"""
         msku_record = self.env['amazon.msku'].search([('name', '=', msku)], limit=1)
@@ -151,27 +150,31 @@ class AmazonImportProducts(models.Model):
     _auto = False  # Don't create a database table for this model, since it doesn't store data directly
 
     @api.model
+    @profiling.profiled()
     def cron_import_products(self):
         """
         Import products from Amazon using the provided marketplace and credentials.
         """
         accounts = self.env['amazon.seller.account'].search([('import_products', '=', True)])
         _logger.info('Starting Amazon product import cron job for %s account(s)', len(accounts))
-        for account in accounts:
-            try:
-                _logger.debug('Importing products for account: %s', account.name)
-                self.import_account_products(account)
+        # Not run in parallel: the accounts update the same products
+        accounts.run_sync_job(self._name, 'sync_account_products', 'import products')
 
-                _logger.debug('Updating product details for account: %s', account.name)
-                self.update_product_details(account)
+    @api.model
+    @profiling.profiled()
+    def sync_account_products(self, account):
+        """
+        Import the listings of one account and refresh the product details.
+        """
+        _logger.debug('Importing products for account: %s', account.name)
+        self.import_account_products(account)
 
-            except Exception as e:
-                _logger.error('Error importing products for account %s: %s', account.name, str(e))
-                _logger.error(traceback.format_exc())
-                raise ValidationError(f'Failed to import products for account {account.name}: {str(e)} \n{traceback.format_exc()}')
+        _logger.debug('Updating product details for account: %s', account.name)
+        self.update_product_details(account)
 
 
     @api.model
+    @profiling.profiled()
     def import_account_products(self, account):
         """
         Import products for a specific Amazon seller account.
@@ -185,50 +188,92 @@ class AmazonImportProducts(models.Model):
         ProductTemplate = self.env['product.template']
         
         # Process the products as needed, e.g., create or update records
-        for amz_listing in amz_listings:
-            asin = amz_listing.get('asin')
-            msku = amz_listing.get('sku')
-            if not asin or not msku:
-                continue
-
-            vals = {
-                'name': "Unknown",  # Use ASIN as the product name until further details are fetched
-                'type': 'consu',  # 'consu' for Goods (tangible products)
-                'amazon_asin': asin,
-                'is_storable': True,  # Ensure new products track inventory only by quantity.
-                'taxes_id': None, # No sales tax by default
-                'supplier_taxes_id': None, # No purchase tax by default
-            }
+        def import_listings_batch(amz_listings_batch):
+            for amz_listing in amz_listings_batch:
+                asin = amz_listing.get('asin')
+                msku = amz_listing.get('sku')
+                if not asin or not msku:
+                    continue
+
+                vals = {
+                    'name': "Unknown",  # Use ASIN as the product name until further details are fetched
+                    'type': 'consu',  # 'consu' for Goods (tangible products)
+                    'amazon_asin': asin,
+                    'is_storable': True,  # Ensure new products track inventory only by quantity.
+                    'taxes_id': None, # No sales tax by default
+                    'supplier_taxes_id': None, # No purchase tax by default
+                }
+
+                # If account is set to update pricing 
+                if account.import_product_price and amz_listing.get('price'):
+                    vals['list_price'] = amz_listing.get('price')
+                    # TODO Get Business Pricing since it is available in the report
+
+                with telemetry.phase(telemetry.PHASE_RESOLVE):
+                    existing_product = ProductTemplate.search([('amazon_asin', '=', asin)], limit=1)
+
+                with telemetry.phase(telemetry.PHASE_WRITE):
+                    if existing_product:
+                        # Update existing product
+                        existing_product.write(vals)
+                        # Add MSKU if not already present
+                        existing_product.add_msku(msku)
+                        telemetry.count('updated')
+                        _logger.debug('Updated existing product: %s', asin)
+                    else:
+                        # Create new product
+                        new_product = ProductTemplate.create(vals)
+                        # Add MSKU to new product
+                        new_product.add_msku(msku)
+                        telemetry.count('created')
+                        _logger.info('Created new product: %s', asin)
+
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'import_products', account, amz_listings, import_listings_batch,
+            key=lambda amz_listing: amz_listing.get('sku') or '',
+        )
 
-            # If account is set to update pricing 
-            if account.import_product_price and amz_listing.get('price'):
-                vals['list_price'] = amz_listing.get('price')
-                # TODO Get Business Pricing since it is available in the report
-
-            existing_product = ProductTemplate.search([('amazon_asin', '=', asin)], limit=1)
-
-            if existing_product:
-                # Update existing product
-                existing_product.write(vals)
-                # Add MSKU if not already present
-                existing_product.add_msku(msku)
-                _logger.debug('Updated existing product: %s', asin)
-            else:
-                # Create new product
-                new_product = ProductTemplate.create(vals)
-                # Add MSKU to new product
-                new_product.add_msku(msku)
-                _logger.info('Created new product: %s', asin)
 
     @api.model
+    @profiling.profiled()
     def update_product_details(self, account):
         # Get products where the title has not been fetched yet
         products = self.env['product.template'].search([('amazon_asin', '!=', False),])
         #products = self.env['product.template'].search([('name', '=', 'Unknown')])
 
+        Jobs = self.env['amazon.sync.job']
+        if Jobs.is_enabled():
+            Jobs.enqueue('catalog', account, products.mapped('amazon_asin'))
+            return
+
+        def update_products_batch(products_batch):
+            self.update_products_details(account, products_batch)
+
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'update_product_details', account, products, update_products_batch,
+        )
+
+    @api.model
+    def refresh_catalog_items(self, account, asins):
+        """
+        Refresh the catalog details of the products with the given ASINs only.
+        """
+        products = self.env['product.template'].search([('amazon_asin', 'in', list(asins))])
+        if products:
+            self.update_products_details(account, products)
+
+    @api.model
+    def update_products_details(self, account, products):
+        """
+        Set the name, weight and volume of the given products from their Amazon catalog item.
+        """
         for product in products:
-            catalog_data = amazon_utils.get_catalog_item(account, product.amazon_asin)
-            
+            try:
+                catalog_data = amazon_utils.get_catalog_item(account, product.amazon_asin)
+            except payload_archive.NotArchivedError as e:
+                _logger.warning('Skipping catalog update for product %s: %s', product.name, e)
+                continue
+        
             vals = {
                 'name': catalog_data.get('summaries', [])[0].get('itemName') if catalog_data.get('summaries') and len(catalog_data.get('summaries')) > 0 else 'Unknown',
             }
@@ -272,13 +317,7 @@ class AmazonImportProducts(models.Model):
                 if vals.get('volume', 0) < 0.01 and vals.get('volume', 0) > 0:
                     vals['volume'] = 0.01
 
-            product.write(vals)
+            with telemetry.phase(telemetry.PHASE_WRITE):
+                product.write(vals)
+            telemetry.count('updated')
             _logger.debug('Updated product details for ASIN: %s', product.amazon_asin)
-
-
-
-
-
-
-
-
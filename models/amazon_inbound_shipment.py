@@ -0,0 +1,151 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import logging
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Statuses after which Amazon never changes a shipment again
+TERMINAL_SHIPMENT_STATUSES = ('CLOSED', 'CANCELLED', 'DELETED')
+
+# Shipments with these statuses are never imported when they have no picking yet
+DISCARDED_SHIPMENT_STATUSES = ('CANCELLED', 'DELETED')
+
+
+class AmazonInboundShipment(models.Model):
+    """Registry of the Amazon inbound shipments of an account and the pickings created for them."""
+
+    _name = 'amazon.inbound.shipment'
+    _description = 'Amazon Inbound Shipment'
+    _rec_name = 'shipment_id'
+    _order = 'last_seen desc, id desc'
+
+    account_id = fields.Many2one('amazon.seller.account', string='Account', required=True, index=True, ondelete='cascade')
+    shipment_id = fields.Char(string='Shipment ID', required=True, index=True)
+    kind = fields.Selection([
+        ('fba', 'FBA'),
+        ('awd', 'AWD'),
+    ], string='Type', required=True, default='fba')
+    status = fields.Char(string='Amazon Status')
+    last_seen = fields.Datetime(string='Last Seen', help='Last time the shipment was returned by Amazon')
+    shipment_data = fields.Json(string='Shipment Data', help='Shipment as last returned by Amazon')
+    picking_id = fields.Many2one('stock.picking', string='Transfer', ondelete='set null')
+    return_picking_id = fields.Many2one('stock.picking', string='Return Transfer', ondelete='set null',
+                                        help='Transfer reverting the shipment after Amazon cancelled it')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('imported', 'Imported'),
+        ('done', 'Done'),
+    ], string='State', required=True, default='pending', index=True,
+        help='Pending shipments are retried on every run, e.g. until their origin address is mapped. Imported shipments '
+             'are only processed again when Amazon updates them, and done shipments are never processed again.')
+
+    _sql_constraints = [
+        ('unique_account_shipment_kind', 'unique(account_id, shipment_id, kind)', 'This shipment is already registered for this account!')
+    ]
+
+    @api.model
+    def register_shipments(self, account, shipments, id_key, status_key, kind='fba'):
+        """
+        Create or update the registry rows of the shipments returned by Amazon, prefetching the existing rows in one
+        query.
+
+        Returns the rows still needing work: the registered shipments that are not done, plus every shipment of the
+        account left pending by a previous run.
+        """
+        now = fields.Datetime.now()
+        shipments_by_id = {shipment.get(id_key): shipment for shipment in shipments if shipment.get(id_key)}
+
+        existing = self.search([
+            ('account_id', '=', account.id),
+            ('kind', '=', kind),
+            ('shipment_id', 'in', list(shipments_by_id)),
+        ])
+        existing_by_id = {record.shipment_id: record for record in existing}
+
+        vals_list = []
+        for shipment_id, shipment in shipments_by_id.items():
+            vals = {'status': shipment.get(status_key), 'last_seen': now, 'shipment_data': shipment}
+            record = existing_by_id.get(shipment_id)
+            if record:
+                record.write(vals)
+            else:
+                vals_list.append(dict(vals, account_id=account.id, shipment_id=shipment_id, kind=kind))
+        registered = existing | self.create(vals_list)
+
+        records = registered.filtered(lambda record: record.state != 'done') | self.search([
+            ('account_id', '=', account.id),
+            ('kind', '=', kind),
+            ('state', '=', 'pending'),
+        ])
+        records._link_legacy_pickings()
+        return records
+
+    @api.model
+    def get_shipment_record(self, account, shipment_id, kind='fba'):
+        """
+        Return the registry row of a single shipment, creating it when the shipment was never seen before.
+        """
+        record = self.search([
+            ('account_id', '=', account.id),
+            ('kind', '=', kind),
+            ('shipment_id', '=', shipment_id),
+        ], limit=1)
+        if not record:
+            record = self.create({'account_id': account.id, 'shipment_id': shipment_id, 'kind': kind})
+            record._link_legacy_pickings()
+        return record
+
+    def _link_legacy_pickings(self):
+        """
+        Link the pickings created before the registry existed, which are only known by their origin. Done in one
+        query for the whole recordset.
+        """
+        unlinked = self.filtered(lambda record: not record.picking_id)
+        if not unlinked:
+            return
+
+        return_names = {f'Cancelled Shipment {record.shipment_id}': record for record in unlinked}
+        pickings = self.env['stock.picking'].search([
+            ('origin', 'in', unlinked.mapped('shipment_id') + list(return_names)),
+        ], order='id')
+
+        records_by_id = {record.shipment_id: record for record in unlinked}
+        for picking in pickings:
+            if picking.origin in return_names:
+                return_names[picking.origin].return_picking_id = picking
+            elif not records_by_id[picking.origin].picking_id:
+                records_by_id[picking.origin].picking_id = picking
+
+    def filter_importable(self):
+        """
+        The shipments still needing an import: the ones with a picking, whose changes are applied to it, and the
+        ones without a picking that were not cancelled or deleted.
+        """
+        return self.filtered(lambda record: record.picking_id or record.status not in DISCARDED_SHIPMENT_STATUSES)
+
+    def mark_processed(self):
+        """
+        Update the state after an import attempt, from the pickings linked to the shipment.
+        """
+        for record in self:
+            if record.kind == 'fba' and record.status == 'CANCELLED' and record.picking_id and not record.return_picking_id:
+                # The return of the cancelled shipment still has to be created
+                record.state = 'pending'
+            elif record.status in DISCARDED_SHIPMENT_STATUSES or (record.picking_id and record.status in TERMINAL_SHIPMENT_STATUSES):
+                # A deleted or cancelled shipment without picking needs nothing, a closed one never changes again
+                record.state = 'done'
+            else:
+                record.state = 'imported' if record.picking_id else 'pending'
@@ -13,10 +13,9 @@
 # ######################################################################################################################
 
 import logging
-import traceback
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from .utils import amazon_utils, profiling, telemetry
 from datetime import datetime, timedelta
 
 _logger = logging.getLogger(__name__)
@@ -27,6 +26,7 @@ class AmazonListingFees(models.Model):
     _auto = False  # Don't create a database table for this model, since it doesn't store data directly
 
     @api.model
+    @profiling.profiled()
     def cron_get_listing_fees(self):
         """
         Import listing fees from Amazon.
@@ -34,24 +34,24 @@ class AmazonListingFees(models.Model):
 
         accounts = self.env['amazon.seller.account'].search([])
         _logger.info('Starting Amazon Listing Fees import cron job for %s account(s)', len(accounts))
-        for account in accounts:
-            try:
-                _logger.info('Importing Listing Fees for account: %s', account.name)
-
-                if account.get_fba_estimated_fees:
-                    _logger.info('Fetching FBA estimated fees for account: %s', account.name)
-                    self.import_fba_estimated_fees(account)
-
-                if account.get_fbm_estimated_fees:
-                    _logger.info('Fetching FBM estimated fees for account: %s', account.name)
-                    self.import_fbm_estimated_fees(account)
+        # Not run in parallel: the accounts update the same products
+        accounts.run_sync_job(self._name, 'sync_account_listing_fees', 'import Listing Fees')
 
+    @api.model
+    @profiling.profiled()
+    def sync_account_listing_fees(self, account):
+        """
+        Import the enabled FBA and FBM fee estimates of one account.
+        """
+        if account.get_fba_estimated_fees:
+            _logger.info('Fetching FBA estimated fees for account: %s', account.name)
+            self.import_fba_estimated_fees(account)
 
-            except Exception as e:
-                _logger.error('Error importing Listing Fees for account %s: %s', account.name, str(e))
-                _logger.error(traceback.format_exc())
-                raise ValidationError(f'Failed to import Listing Fees for account {account.name}: {str(e)} \n{traceback.format_exc()}')
+        if account.get_fbm_estimated_fees:
+            _logger.info('Fetching FBM estimated fees for account: %s', account.name)
+            self.import_fbm_estimated_fees(account)
 
+    @profiling.profiled()
     def import_fba_estimated_fees(self, account):
         """
         Import FBA estimated fees for products in the account.
@@ -59,30 +59,39 @@ class AmazonListingFees(models.Model):
         _logger.info('Importing FBA estimated fees for account: %s', account.name)
         products = self.env['product.template'].search([('amazon_asin', '!=', False)])
 
-        for product in products:
-            try:
-                # Fetch FBA fees
-                fees = amazon_utils.get_asin_listing_fees(
-                    account, 
-                    asin=product.amazon_asin,
-                    price=product.list_price, 
-                    currency=product.currency_id.name, 
-                    is_fba=True
-                )
+        def import_fees_batch(products_batch):
+            for product in products_batch:
+                try:
+                    # Fetch FBA fees
+                    fees = amazon_utils.get_asin_listing_fees(
+                        account, 
+                        asin=product.amazon_asin,
+                        price=product.list_price, 
+                        currency=product.currency_id.name, 
+                        is_fba=True
+                    )
                 
-                if fees:
-                    total_fee_amount = fees.get('FeesEstimateResult', {}).get('FeesEstimate', {}).get('TotalFeesEstimate', {}).get('Amount', 0.0)
-                    if not total_fee_amount:
-                        _logger.warning(f'No FBA fees found for product {product.name} (ASIN: {product.amazon_asin}).')
-                        continue
-                    product.amazon_est_fba_fees = total_fee_amount
-                    _logger.info(f'FBA estimated fees for {product.name}: {product.amazon_est_fba_fees}')
+                    if fees:
+                        total_fee_amount = fees.get('FeesEstimateResult', {}).get('FeesEstimate', {}).get('TotalFeesEstimate', {}).get('Amount', 0.0)
+                        if not total_fee_amount:
+                            _logger.warning(f'No FBA fees found for product {product.name} (ASIN: {product.amazon_asin}).')
+                            continue
+                        with telemetry.phase(telemetry.PHASE_WRITE):
+                            product.amazon_est_fba_fees = total_fee_amount
+                        telemetry.count('updated')
+                        _logger.info(f'FBA estimated fees for {product.name}: {product.amazon_est_fba_fees}')
                     
-            except Exception as e:
-                _logger.error(f'Error fetching FBA estimated fees for product {product.name}: {str(e)}')
-                raise ValidationError(f'Failed to fetch FBA estimated fees for product {product.name}: {str(e)}')
+                except Exception as e:
+                    _logger.error(f'Error fetching FBA estimated fees for product {product.name}: {str(e)}')
+                    raise ValidationError(f'Failed to fetch FBA estimated fees for product {product.name}: {str(e)}')
             
 
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'fba_estimated_fees', account, products, import_fees_batch,
+        )
+
+
+    @profiling.profiled()
     def import_fbm_estimated_fees(self, account):
         """
         Import FBM estimated fees for products in the account.
@@ -90,28 +99,35 @@ class AmazonListingFees(models.Model):
         _logger.info('Importing FBM estimated fees for account: %s', account.name)
         products = self.env['product.template'].search([('amazon_asin', '!=', False)])
 
-        for product in products:
-            try:
-                # Fetch FBM fees
-                fees = amazon_utils.get_asin_listing_fees(
-                    account, 
-                    asin=product.amazon_asin,
-                    price=product.list_price, 
-                    currency=product.currency_id.name, 
-                    is_fba=False
-                )
+        def import_fees_batch(products_batch):
+            for product in products_batch:
+                try:
+                    # Fetch FBM fees
+                    fees = amazon_utils.get_asin_listing_fees(
+                        account, 
+                        asin=product.amazon_asin,
+                        price=product.list_price, 
+                        currency=product.currency_id.name, 
+                        is_fba=False
+                    )
                 
-                if not fees:
-                    _logger.warning(f'No FBM fees found for product {product.name} (ASIN: {product.amazon_asin}).')
-                    continue
+                    if not fees:
+                        _logger.warning(f'No FBM fees found for product {product.name} (ASIN: {product.amazon_asin}).')
+                        continue
 
-                total_fee_amount = fees.get('FeesEstimateResult', {}).get('FeesEstimate', {}).get('TotalFeesEstimate', {}).get('Amount', 0.0)
-                if not total_fee_amount:
-                    _logger.warning(f'No FBM fees found for product {product.name} (ASIN: {product.amazon_asin}).')
-                    continue
-                product.amazon_est_fbm_fees = total_fee_amount
-                _logger.info(f'FBM estimated fees for {product.name}: {product.amazon_est_fbm_fees}')
+                    total_fee_amount = fees.get('FeesEstimateResult', {}).get('FeesEstimate', {}).get('TotalFeesEstimate', {}).get('Amount', 0.0)
+                    if not total_fee_amount:
+                        _logger.warning(f'No FBM fees found for product {product.name} (ASIN: {product.amazon_asin}).')
+                        continue
+                    with telemetry.phase(telemetry.PHASE_WRITE):
+                        product.amazon_est_fbm_fees = total_fee_amount
+                    telemetry.count('updated')
+                    _logger.info(f'FBM estimated fees for {product.name}: {product.amazon_est_fbm_fees}')
                     
-            except Exception as e:
-                _logger.error(f'Error fetching FBM estimated fees for product {product.name}: {str(e)}')
-                raise ValidationError(f'Failed to fetch FBM estimated fees for product {product.name}: {str(e)}')
\ No newline at end of file
+                except Exception as e:
+                    _logger.error(f'Error fetching FBM estimated fees for product {product.name}: {str(e)}')
+                    raise ValidationError(f'Failed to fetch FBM estimated fees for product {product.name}: {str(e)}')
+
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'fbm_estimated_fees', account, products, import_fees_batch,
+        )
@@ -0,0 +1,252 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import logging
+import os
+import traceback
+from collections import defaultdict
+from datetime import timedelta
+
+import psycopg2
+
+from odoo import models, fields, api
+from .utils import amazon_utils, notification_utils, profiling
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_NOTIFICATION_BATCH_SIZE = 200
+
+# Failed events are retried by the next runs until they failed this many times
+MAX_ATTEMPTS = 3
+
+# Processed events are deleted after this many days
+EVENT_RETENTION_DAYS = 30
+
+
+class AmazonNotificationEvent(models.Model):
+    """Queue of SP-API notifications, processed in micro-batches so only the notified orders and SKUs are synced."""
+
+    _name = 'amazon.notification.event'
+    _description = 'Amazon Notification Event'
+    _rec_name = 'reference'
+    _order = 'id desc'
+
+    notification_id = fields.Char(string='Notification ID', required=True, index=True)
+    notification_type = fields.Selection([
+        (notification_utils.ORDER_CHANGE, 'Order Change'),
+        (notification_utils.FBA_INVENTORY_AVAILABILITY_CHANGES, 'FBA Inventory Change'),
+    ], string='Type', required=True)
+    account_id = fields.Many2one('amazon.seller.account', string='Account', index=True, ondelete='cascade')
+    seller_id = fields.Char(string='Seller ID')
+    reference = fields.Char(string='Reference', index=True, help='Amazon order id or SKU the notification is about')
+    payload = fields.Json(string='Payload')
+    source = fields.Selection([
+        ('http', 'HTTP'),
+        ('spool', 'Spool File'),
+        ('manual', 'Manual'),
+    ], string='Source', default='manual')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('ignored', 'Ignored'),
+    ], string='State', required=True, default='pending', index=True)
+    attempts = fields.Integer(string='Attempts', default=0)
+    error = fields.Text(string='Error')
+    processed_at = fields.Datetime(string='Processed At')
+
+    _sql_constraints = [
+        ('unique_notification_id', 'unique(notification_id)', 'This notification is already queued!')
+    ]
+
+    @api.model
+    def enqueue(self, notifications, source='manual'):
+        """
+        Queue the supported notifications, skipping the ones already queued. Notifications of sellers without an
+        account are stored as ignored. Returns the created events.
+        """
+        parsed_by_id = {}
+        for notification in notifications:
+            parsed = notification_utils.parse(notification)
+            if parsed:
+                parsed_by_id.setdefault(parsed['notification_id'], (parsed, notification))
+        if not parsed_by_id:
+            return self.browse()
+
+        existing_ids = set(self.search([('notification_id', 'in', list(parsed_by_id))]).mapped('notification_id'))
+
+        accounts = self.env['amazon.seller.account'].search([
+            ('seller_id', 'in', list({parsed['seller_id'] for parsed, _ in parsed_by_id.values()})),
+        ])
+
+        vals_list = []
+        for notification_id, (parsed, notification) in parsed_by_id.items():
+            if notification_id in existing_ids:
+                continue
+            account = self._resolve_account(accounts, parsed['seller_id'], parsed['marketplace_id'])
+            vals_list.append({
+                'notification_id': notification_id,
+                'notification_type': parsed['notification_type'],
+                'seller_id': parsed['seller_id'],
+                'reference': parsed['reference'],
+                'payload': notification,
+                'source': source,
+                'account_id': account.id,
+                'state': 'pending' if account else 'ignored',
+                'error': False if account else f'No Amazon seller account with seller ID {parsed["seller_id"]}',
+            })
+
+        try:
+            with self.env.cr.savepoint():
+                return self.create(vals_list)
+        except psycopg2.IntegrityError:
+            # Another delivery of the same notifications was queued concurrently, keep the ones that are new
+            events = self.browse()
+            for vals in vals_list:
+                try:
+                    with self.env.cr.savepoint():
+                        events |= self.create(vals)
+                except psycopg2.IntegrityError:
+                    _logger.debug('Notification %s is already queued', vals['notification_id'])
+            return events
+
+    @api.model
+    def _resolve_account(self, accounts, seller_id, marketplace_id):
+        """
+        Account of the notification among ``accounts``: the one of the seller syncing the notified marketplace, else
+        any account of the seller.
+        """
+        seller_accounts = accounts.filtered(lambda account: account.seller_id == seller_id)
+        for account in seller_accounts:
+            if marketplace_id and marketplace_id in amazon_utils.get_marketplace_ids(account):
+                return account
+        return seller_accounts[:1]
+
+    @api.model
+    @profiling.profiled()
+    def cron_process_notifications(self):
+        """
+        Queue the notifications of the spool directory, then process the pending events in micro-batches,
+        committing after each one.
+        """
+        self.consume_spool()
+
+        Checkpoint = self.env['amazon.sync.checkpoint']
+        batch_size = self._get_batch_size()
+        last_id = 0
+        while True:
+            # Walk forward, so events failing again are only retried by the next run
+            events = self.search([('state', '=', 'pending'), ('id', '>', last_id)], order='id', limit=batch_size)
+            if not events:
+                break
+            last_id = events[-1].id
+            events._process()
+            Checkpoint._commit_progress()
+
+    def _process(self):
+        """
+        Process the events of each account and type together: every notified order is imported once, and every
+        notified SKU has its FBA inventory updated once. A failing group is rolled back and retried later.
+        """
+        groups = defaultdict(lambda: self.browse())
+        for event in self:
+            groups[(event.account_id, event.notification_type)] |= event
+
+        for (account, notification_type), events in groups.items():
+            if account.is_sync_suspended():
+                # Left pending until the circuit breaker of the account closes again
+                continue
+
+            references = list(dict.fromkeys(events.mapped('reference')))
+            method_name = self._get_processing_method(account, notification_type)
+            if not method_name:
+                events.write({'state': 'ignored', 'processed_at': fields.Datetime.now(), 'error': 'Import disabled on the account'})
+                continue
+
+            try:
+                with self.env.cr.savepoint(), \
+                        self.env['amazon.sync.run'].track(account, self._name, method_name, 'process notifications'):
+                    getattr(self, method_name)(account, references)
+            except Exception as e:
+                _logger.error('Error processing %s %s notification(s) for account %s: %s', len(events), notification_type, account.name, e)
+                for event in events:
+                    attempts = event.attempts + 1
+                    event.write({
+                        'attempts': attempts,
+                        'state': 'pending' if attempts < MAX_ATTEMPTS else 'failed',
+                        'error': traceback.format_exc(),
+                    })
+                continue
+
+            events.write({'state': 'done', 'processed_at': fields.Datetime.now(), 'error': False})
+
+    @api.model
+    def _get_processing_method(self, account, notification_type):
+        if notification_type == notification_utils.ORDER_CHANGE and (account.import_fba_orders or account.import_fbm_orders):
+            return '_process_order_changes'
+        if notification_type == notification_utils.FBA_INVENTORY_AVAILABILITY_CHANGES and account.import_fba_inventory:
+            return '_process_fba_inventory_changes'
+        return None
+
+    @api.model
+    def _process_order_changes(self, account, order_ids):
+        self.env['amazon.orders'].import_orders_by_id(account, order_ids)
+
+    @api.model
+    def _process_fba_inventory_changes(self, account, skus):
+        self.env['amazon.fba.inventory'].sync_skus_fba_inventory(account, skus)
+
+    @api.model
+    def consume_spool(self):
+        """
+        Queue the notifications of the files in the directory of the amazon_seller.notification_spool_dir system
+        parameter, then delete the files. Files that cannot be read are moved to its "failed" subdirectory.
+        """
+        directory = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.notification_spool_dir')
+        if not directory:
+            return
+
+        Checkpoint = self.env['amazon.sync.checkpoint']
+        for path, notifications in notification_utils.read_spool(directory):
+            if notifications is None:
+                failed_directory = os.path.join(directory, 'failed')
+                os.makedirs(failed_directory, exist_ok=True)
+                os.replace(path, os.path.join(failed_directory, os.path.basename(path)))
+                continue
+
+            events = self.enqueue(notifications, source='spool')
+            # Duplicates are skipped by enqueue, so a file queued again after a crash does no harm
+            Checkpoint._commit_progress()
+            os.remove(path)
+            _logger.info('Queued %s notification(s) from %s', len(events), path)
+
+    def action_retry(self):
+        self.filtered(lambda event: event.state in ('failed', 'ignored') and event.account_id).write({
+            'state': 'pending',
+            'attempts': 0,
+            'error': False,
+        })
+
+    @api.model
+    def _get_batch_size(self):
+        value = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.notification_batch_size')
+        try:
+            return max(1, int(value)) if value else DEFAULT_NOTIFICATION_BATCH_SIZE
+        except ValueError:
+            return DEFAULT_NOTIFICATION_BATCH_SIZE
+
+    @api.autovacuum
+    def _gc_processed_events(self):
+        limit = fields.Datetime.now() - timedelta(days=EVENT_RETENTION_DAYS)
+        self.search([('state', 'in', ('done', 'ignored')), ('create_date', '<', limit)]).unlink()
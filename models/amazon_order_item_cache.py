@@ -0,0 +1,88 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import logging
+from datetime import timedelta
+
+import psycopg2
+
+from odoo import models, fields, api
+from .utils import amazon_utils, cache_utils
+
+_logger = logging.getLogger(__name__)
+
+# Items of these orders are not final yet, e.g. pending orders have no prices, so they are never cached
+UNCACHED_ORDER_STATUSES = ('Pending', 'PendingAvailability')
+
+# Cached items are deleted this many days after they were fetched, orders are not updated for that long
+ORDER_ITEM_CACHE_RETENTION_DAYS = 90
+
+
+class AmazonOrderItemCache(models.Model):
+    """Line items of Amazon orders as returned by getOrderItems, which never change once the order is placed."""
+
+    _name = 'amazon.order.item.cache'
+    _description = 'Amazon Order Item Cache'
+    _rec_name = 'amazon_order_id'
+
+    amazon_order_id = fields.Char(string='Amazon Order ID', required=True, index=True)
+    account_id = fields.Many2one('amazon.seller.account', string='Account', index=True, ondelete='cascade')
+    payload = fields.Binary(string='Items', attachment=False, help='getOrderItems items, zlib compressed JSON')
+    item_count = fields.Integer(string='Items Count')
+
+    _sql_constraints = [
+        ('unique_amazon_order_id', 'unique(amazon_order_id)', 'The items of this order are already cached!')
+    ]
+
+    @api.model
+    def get_order_items(self, account, amz_order):
+        """
+        Items of ``amz_order`` from the cache. They are fetched from Amazon on a miss and cached once the order is
+        placed.
+        """
+        amazon_order_id = amz_order.get('AmazonOrderId')
+        cached = self.search([('amazon_order_id', '=', amazon_order_id)], limit=1)
+        if cached.payload:
+            try:
+                return cache_utils.decompress_payload(cached.payload)
+            except (ValueError, TypeError) as e:
+                _logger.warning('Ignoring unreadable cached items of Amazon order %s: %s', amazon_order_id, e)
+
+        items = amazon_utils.get_order_items(account, amazon_order_id)
+        if items and amz_order.get('OrderStatus') not in UNCACHED_ORDER_STATUSES:
+            self._store(account, amazon_order_id, items, cached)
+        return items
+
+    @api.model
+    def _store(self, account, amazon_order_id, items, cached=None):
+        vals = {
+            'amazon_order_id': amazon_order_id,
+            'account_id': account.id,
+            'payload': cache_utils.compress_payload(items),
+            'item_count': len(items),
+        }
+        if cached:
+            cached.write(vals)
+            return
+        try:
+            with self.env.cr.savepoint():
+                self.create(vals)
+        except psycopg2.IntegrityError:
+            # Cached concurrently by another worker, its items are the same
+            _logger.debug('Items of Amazon order %s are already cached', amazon_order_id)
+
+    @api.autovacuum
+    def _gc_cached_items(self):
+        limit = fields.Datetime.now() - timedelta(days=ORDER_ITEM_CACHE_RETENTION_DAYS)
+        self.search([('create_date', '<', limit)]).unlink()
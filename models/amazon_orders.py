@@ -16,11 +16,19 @@ import logging
 import traceback
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from .utils import amazon_utils
+from odoo.tools import float_round
+from .utils import amazon_utils, profiling, telemetry
+from .utils.cache_utils import LRUCache, address_hash
 from datetime import datetime, timedelta
 
 _logger = logging.getLogger(__name__)
 
+# account.tax stores its amount with 4 decimal places
+MAX_TAX_RATE_PRECISION = 4
+
+# Number of shipping partners remembered during a single order import run
+SHIPPING_PARTNER_CACHE_SIZE = 2048
+
 class SaleOrder(models.Model):
     _inherit = 'sale.order'
 
@@ -29,6 +37,54 @@ class SaleOrder(models.Model):
         help='Amazon order identifier from the seller central',
         index=True
     )
+    amazon_account_id = fields.Many2one(
+        'amazon.seller.account',
+        string='Amazon Seller Account',
+        help='Seller account the order was imported from',
+        index=True,
+        ondelete='set null'
+    )
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    amazon_address_hash = fields.Char(
+        string='Amazon Address Hash',
+        compute='_compute_amazon_address_hash',
+        store=True,
+        index=True,
+        help='Normalized hash of the address and parent partner, used to find existing Amazon shipping addresses'
+    )
+
+    @api.depends('type', 'name', 'street', 'street2', 'city', 'state_id.code', 'zip', 'country_id.code', 'parent_id')
+    def _compute_amazon_address_hash(self):
+        for partner in self:
+            # Only child addresses are matched against Amazon orders
+            if not partner.parent_id:
+                partner.amazon_address_hash = False
+                continue
+
+            partner.amazon_address_hash = self.get_amazon_address_hash(
+                partner.parent_id.id, partner.type, partner.name, partner.street, partner.street2,
+                partner.city, partner.state_id.code, partner.zip, partner.country_id.code,
+            )
+
+    @api.model
+    def get_amazon_address_hash(self, parent_id, type, name, street, street2, city, state_code, zip_code, country_code):
+        """
+        Hash of a child address scoped to its parent partner.
+        """
+        return address_hash(parent_id, type, name, street, street2, city, state_code, zip_code, country_code)
+
+class AccountTax(models.Model):
+    _inherit = 'account.tax'
+
+    amazon_tax_profile = fields.Boolean(
+        string='Amazon Tax Profile',
+        help='Tax created for the estimated tax rate of imported Amazon order lines, reused by later imports',
+        index=True,
+        copy=False
+    )
 
 class AmazonOrders(models.Model):
     _name = 'amazon.orders'
@@ -54,23 +110,31 @@ class AmazonOrders(models.Model):
 
         return fba_partner
 
-    def get_or_create_shipping_partner(self, partner, type, name=None, address1=None, address2=None, city=None, state=None, zip_code=None, country_code=None):
+    @telemetry.in_phase(telemetry.PHASE_RESOLVE)
+    def get_or_create_shipping_partner(self, partner, type, name=None, address1=None, address2=None, city=None, state=None, zip_code=None, country_code=None, partner_cache=None, run_cache=None):
         """
         Get or create a shipping partner for the given address. A shipping partner is how Odoo handles shipping addresses.
         This is used to create a delivery address for the order.
+
+        Addresses are matched on the indexed ``amazon_address_hash`` of the parent partner. ``partner_cache`` is an
+        optional LRUCache owned by the current import run, mapping address hashes to partner ids. ``run_cache`` is
+        the optional dict of the run keeping the country and state maps.
         """
         Partner = self.env['res.partner']
-        
+
+        # Resolve the state and country first, the hash is built from what will actually be stored on the partner
+        country_id = self._get_country_id_map(run_cache).get(country_code or '', False)
+        state_id = self._get_state_id_map(run_cache).get((country_code or '', state or ''), False) if state else False
+        partner_hash = Partner.get_amazon_address_hash(
+            partner.id, type, name, address1, address2, city,
+            state if state_id else '', zip_code, country_code if country_id else '',
+        )
+
+        if partner_cache is not None and partner_hash in partner_cache:
+            return Partner.browse(partner_cache[partner_hash])
+
         shipping_partner = Partner.search([
-            ('type', '=', type),
-            ('name', '=', name),
-            ('street', '=', address1),
-            ('street2', '=', address2 or ''),
-            ('city', '=', city or ''),
-            ('state_id.code', '=', state or ''),
-            ('zip', '=', zip_code or ''),
-            ('country_id.code', '=', country_code),
-            ('parent_id', '=', partner.id)
+            ('amazon_address_hash', '=', partner_hash),
         ], limit=1)
 
         if not shipping_partner:
@@ -81,16 +145,50 @@ class AmazonOrders(models.Model):
                 'street': address1,
                 'street2': address2 or '',
                 'city': city or '',
-                'state_id': self.env['res.country.state'].search([('code', '=', state)], limit=1).id if state else False,
+                'state_id': state_id,
                 'zip': zip_code or '',
-                'country_id': self.env['res.country'].search([('code', '=', country_code)], limit=1).id,
+                'country_id': country_id,
                 'parent_id': partner.id,
             })
         else:
             _logger.debug('Using existing shipping partner %s', shipping_partner.display_name)
 
+        if partner_cache is not None:
+            partner_cache[partner_hash] = shipping_partner.id
+
         return shipping_partner
 
+    @api.model
+    def _get_country_id_map(self, run_cache=None):
+        """
+        Map of country code to res.country id, loaded once per import run when ``run_cache`` is given.
+        """
+        if run_cache is not None and 'country_ids' in run_cache:
+            return run_cache['country_ids']
+        countries = self.env['res.country'].sudo().search_read([], ['code'])
+        country_ids = {country['code']: country['id'] for country in countries if country['code']}
+        if run_cache is not None:
+            run_cache['country_ids'] = country_ids
+        return country_ids
+
+    @api.model
+    def _get_state_id_map(self, run_cache=None):
+        """
+        Map of (country code, state code) to res.country.state id, loaded once per import run when ``run_cache``
+        is given.
+        """
+        if run_cache is not None and 'state_ids' in run_cache:
+            return run_cache['state_ids']
+        states = self.env['res.country.state'].sudo().search_read([], ['code', 'country_id'])
+        country_codes = {country_id: code for code, country_id in self._get_country_id_map(run_cache).items()}
+        state_ids = {
+            (country_codes.get(state['country_id'][0], ''), state['code']): state['id']
+            for state in states if state['code'] and state['country_id']
+        }
+        if run_cache is not None:
+            run_cache['state_ids'] = state_ids
+        return state_ids
+
     def get_fba_medium(self):
         """
         Get the FBA medium for the current environment.
@@ -170,6 +268,7 @@ class AmazonOrders(models.Model):
         return fbm_tag
 
     @api.model
+    @profiling.profiled()
     def cron_import_orders(self):
         """
         Import orders from Amazon.
@@ -182,49 +281,74 @@ class AmazonOrders(models.Model):
             ('import_fbm_orders', '=', True)
         ])
         _logger.info('Starting Amazon orders import cron job for %s account(s)', len(accounts))
-        for account in accounts:
-            try:
-                _logger.info('Importing Amazon orders for account: %s', account.name)
+        # Make sure the shared records exist before the accounts are synced
+        self.env['amazon.fba.inventory'].get_fba_warehouse()
+        self.get_fba_partner()
+        self.get_fba_medium()
+        self.get_fba_source()
+        self.get_fba_tag()
 
-                # Import orders for the account
-                self.import_account_orders(account)
+        # Not run in parallel: the accounts share the tax profiles and shipping addresses created for their orders
+        accounts.run_sync_job(self._name, 'sync_account_orders', 'import Amazon orders')
 
-                # Ensure all FBA orders are marked as shipped
-                self.ensure_fba_orders_shipped(account)
+    @api.model
+    @profiling.profiled()
+    def sync_account_orders(self, account):
+        """
+        Import the recent orders of one account, then ship and invoice its FBA orders.
+        """
+        # Import orders for the account
+        self.import_account_orders(account)
 
-                # if invoice_fba_orders is enabled, ensure all FBA orders are invoiced
-                if account.invoice_fba_orders:
-                    self.ensure_fba_orders_invoiced(account)
+        # Ensure all FBA orders are marked as shipped
+        self.ensure_fba_orders_shipped(account)
 
+        # if invoice_fba_orders is enabled, ensure all FBA orders are invoiced
+        if account.invoice_fba_orders:
+            self.ensure_fba_orders_invoiced(account)
 
-            except Exception as e:
-                _logger.error('Error importing Amazon orders for account %s: %s', account.name, str(e))
-                _logger.error(traceback.format_exc())
-                raise ValidationError(f'Failed to import Amazon orders for account {account.name}: {str(e)} \n{traceback.format_exc()}')
-            
     @api.model
+    @profiling.profiled()
     def ensure_fba_orders_shipped(self, account):
         """
         Ensure that all orders are marked as shipped if they are FBA orders.
         This is to ensure that the FBA orders are processed correctly.
+
+        Only outgoing pickings that are not done or cancelled are loaded, so the cost follows the backlog of
+        undelivered orders instead of the full order history.
         """
         _logger.info('Ensuring all FBA orders are marked as shipped for account: %s', account.name)
 
-        fba_tag = self.get_fbm_tag()
-
-        fba_orders = self.env['sale.order'].search([
-            ('tag_ids', 'in', fba_tag.id),
-        ])
+        fba_tag = self.get_fba_tag()
 
         fba_inventory_model = self.env['amazon.fba.inventory']
         warehouse, inbound_loc, stock_loc, reserved_loc, researching_loc, unfulfillable_loc = fba_inventory_model.get_fba_warehouse()
 
-        for order in fba_orders:
-            if order.state in ['sale', 'done']:
-                self.ship_order(order, warehouse)
+        pickings = self.get_fba_pickings_to_ship(fba_tag, warehouse, account)
+
+        if not pickings:
+            _logger.debug('No undelivered FBA orders found for account: %s', account.name)
+            return
 
+        _logger.info('Shipping %s undelivered FBA picking(s) for account: %s', len(pickings), account.name)
+        self.ship_pickings(pickings)
 
     @api.model
+    def get_fba_pickings_to_ship(self, tag, warehouse, account):
+        """
+        Get the outgoing pickings of the confirmed orders of the account with the given tag that are not done or
+        cancelled yet.
+        """
+        return self.env['stock.picking'].search([
+            ('sale_id.amazon_account_id', '=', account.id),
+            ('sale_id.tag_ids', 'in', tag.id),
+            ('sale_id.state', 'in', ['sale', 'done']),
+            ('picking_type_id', '=', warehouse.out_type_id.id),
+            ('state', 'not in', ['done', 'cancel']),
+        ])
+
+    @api.model
+    @profiling.profiled()
     def ensure_fba_orders_invoiced(self, account):
         """
         Ensure that all FBA orders are invoiced if the invoice_fba_orders setting is enabled.
@@ -235,16 +359,21 @@ class AmazonOrders(models.Model):
         fba_tag = self.get_fba_tag()
 
         fba_orders = self.env['sale.order'].search([
+            ('amazon_account_id', '=', account.id),
             ('tag_ids', 'in', fba_tag.id),
             ('state', '=', 'sale'),
             ('invoice_status', '!=', 'invoiced')
         ])
 
-        for order in fba_orders:
-            if order.invoice_status != 'invoiced':
-                self.invoice_order(order, account)
+        if not fba_orders:
+            _logger.debug('No uninvoiced FBA orders found for account: %s', account.name)
+            return
+
+        _logger.info('Invoicing %s FBA order(s) for account: %s', len(fba_orders), account.name)
+        self.invoice_orders(fba_orders, account)
 
     @api.model
+    @profiling.profiled()
     def import_account_orders(self, account):
         """
         Import Amazon orders for a specific account.
@@ -257,37 +386,90 @@ class AmazonOrders(models.Model):
 
         _logger.info('Found %s recently updated Amazon orders for account: %s', len(amz_orders), account.name)
 
+        Jobs = self.env['amazon.sync.job']
+        if Jobs.is_enabled():
+            # The jobs fetch their orders again by id, so a retried job imports the latest state
+            Jobs.enqueue('orders', account, [amz_order.get('AmazonOrderId') for amz_order in amz_orders])
+            return
+
+        updated_count = 0
+        created_count = 0
+
+        # Lookups shared by every order of this run (tax profiles, ...)
+        run_cache = {}
+
+        def import_orders_batch(amz_orders_batch):
+            nonlocal updated_count, created_count
+            created, updated = self.import_amazon_orders(account, amz_orders_batch, run_cache=run_cache)
+            created_count += created
+            updated_count += updated
+
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'import_orders', account, amz_orders, import_orders_batch,
+            key=lambda amz_order: amz_order.get('AmazonOrderId') or '',
+        )
+
+        _logger.info('Imported Amazon orders for account %s: %s created, %s updated', account.name, created_count, updated_count)
+
+    @api.model
+    @profiling.profiled()
+    def import_orders_by_id(self, account, order_ids):
+        """
+        Import only the given Amazon orders, e.g. after order change notifications. Returns the number of created
+        and updated orders.
+        """
+        amz_orders = amazon_utils.get_orders_by_ids(account, order_ids)
+        created_count, updated_count = self.import_amazon_orders(account, amz_orders)
+        _logger.info('Imported %s notified Amazon order(s) for account %s: %s created, %s updated', len(amz_orders), account.name, created_count, updated_count)
+        return created_count, updated_count
+
+    @api.model
+    @profiling.profiled()
+    def import_amazon_orders(self, account, amz_orders, run_cache=None):
+        """
+        Create or update the sale orders of the given Amazon orders. Returns the number of created and updated
+        orders.
+        """
         updated_count = 0
         created_count = 0
 
+        if run_cache is None:
+            run_cache = {}
+
+        # Check for existing orders, with one query for the whole batch
+        with telemetry.phase(telemetry.PHASE_RESOLVE):
+            existing_order_ids = set(self.env['sale.order'].search([
+                ('amazon_seller_order_id', 'in', [amz_order.get('AmazonOrderId') for amz_order in amz_orders])
+            ]).mapped('amazon_seller_order_id'))
+
+        # New FBA orders are created together once the batch has been read, keyed by Amazon order id so an order
+        # listed twice is only created once
+        fba_orders_to_create = {}
+
         for amz_order in amz_orders:
             try:
-                # Check for existing order
-                existing_order = self.env['sale.order'].search([
-                    ('amazon_seller_order_id', '=', amz_order.get('AmazonOrderId'))
-                    ], limit=1)
-
-                if existing_order: 
-                    _logger.debug('Updating existing Amazon order: %s', existing_order.name)
+                if amz_order.get('AmazonOrderId') in existing_order_ids:
+                    _logger.debug('Updating existing Amazon order: %s', amz_order.get('AmazonOrderId'))
                     if amz_order.get('FulfillmentChannel') == 'AFN' and account.import_fba_orders:
                         self.update_order(amz_order, account, "FBA")
                         updated_count += 1
-                    
+                        telemetry.count('updated')
+
                     elif amz_order.get('FulfillmentChannel') == 'MFN' and account.import_fbm_orders:
                         self.update_order(amz_order, account, "FBM")
                         updated_count += 1
+                        telemetry.count('updated')
 
                 else:
                     _logger.debug('Creating new Amazon order for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
                     if amz_order.get('FulfillmentChannel') == 'AFN' and account.import_fba_orders:
                         if amz_order.get('OrderStatus') in ['Shipped']:
-                            self.create_order(amz_order, account, "FBA")
-                            created_count += 1
+                            fba_orders_to_create[amz_order.get('AmazonOrderId')] = amz_order
 
                     elif amz_order.get('FulfillmentChannel') == 'MFN' and account.import_fbm_orders:
                         # TODO: Handle FBM orders
                         _logger.error('FBM fulfillment type is not yet implemented for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
-                        #self.create_order(amz_order, account, "FBM")
+                        #self.create_orders([amz_order], account, "FBM")
                         # created_count += 1
 
             except Exception as e:
@@ -295,77 +477,145 @@ class AmazonOrders(models.Model):
                 _logger.error(traceback.format_exc())
                 raise ValidationError(f'Failed to process Amazon order {amz_order.get("AmazonOrderId")}: {str(e)} \n{traceback.format_exc()}')
 
+        if fba_orders_to_create:
+            orders = self.create_orders(list(fba_orders_to_create.values()), account, "FBA", run_cache=run_cache)
+            created_count += len(orders)
+            telemetry.count('created', len(orders))
+
+        return created_count, updated_count
+
 
     @api.model
-    def create_order(self, amz_order, account, fulfillment_type):
+    def create_order(self, amz_order, account, fulfillment_type, run_cache=None):
         """
-        Create a new Amazon order.
+        Create a new Amazon order. Returns the sale order, or None when it could not be created.
         """
-        _logger.debug('Creating order for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
+        return self.create_orders([amz_order], account, fulfillment_type, run_cache=run_cache)[:1] or None
 
-        amz_order_items = amazon_utils.get_order_items(account, amz_order.get('AmazonOrderId'))
-        if not amz_order_items:
-            _logger.warning('No order items found for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
-            return
-        
-        
-        if fulfillment_type == "FBA":
-            fba_inventory_model = self.env['amazon.fba.inventory']
-            warehouse, inbound_loc, stock_loc, reserved_loc, researching_loc, unfulfillable_loc = fba_inventory_model.get_fba_warehouse()
-            medium = self.get_fba_medium()
-            source = self.get_fba_source()
-            tag = self.get_fba_tag()
-            if account.consolidated_fba_order_customer:
-                partner = self.get_fba_partner()
-                shipping_partner = self.get_or_create_shipping_partner(
-                    partner=partner, 
-                    type="delivery", 
-                    name="Amazon FBA", 
-                    city=amz_order.get('ShippingAddress', {}).get('City', ''),
-                    state=amz_order.get('ShippingAddress', {}).get('StateOrRegion', ''),
-                    zip_code=amz_order.get('ShippingAddress', {}).get('PostalCode', ''), 
-                    country_code=amz_order.get('ShippingAddress', {}).get('CountryCode', ''),
-                    )
-                _logger.debug(f"Created or found shipping partner for FBA order: {shipping_partner.id} {shipping_partner.city}")
-            else:
-                # TODO: Handle non-consolidated FBA orders
-                _logger.error('Non-consolidated FBA orders are not yet implemented.')
-                return
-        else:
+    @api.model
+    @telemetry.in_phase(telemetry.PHASE_WRITE)
+    @profiling.profiled()
+    def create_orders(self, amz_orders, account, fulfillment_type, run_cache=None):
+        """
+        Create the sale orders of new Amazon orders with a single sale.order create, their lines included, then
+        confirm, ship and invoice them together. Returns the created sale orders.
+        """
+        if run_cache is None:
+            run_cache = {}
+
+        if fulfillment_type != "FBA":
             # TODO : Handle FBM warehouse logic
             _logger.error('FBM fulfillment type is not yet implemented.')
-            medium = self.get_fbm_medium()
-            source = self.get_fbm_source()
-            tag = self.get_fbm_tag()
-            return
-        
+            return self.env['sale.order']
 
-        # Create the sale order
-        order_vals = {
-            'partner_id': partner.id,
-            'amazon_seller_order_id': amz_order.get('AmazonOrderId'),
-            'origin': amz_order.get('AmazonOrderId'),
-            'warehouse_id': warehouse.id,
-            'source_id': source.id,
-            'medium_id': medium.id,
-            'tag_ids': [(6, 0, [tag.id])],
-            'partner_shipping_id': shipping_partner.id,
-        }
+        fba_inventory_model = self.env['amazon.fba.inventory']
+        warehouse, inbound_loc, stock_loc, reserved_loc, researching_loc, unfulfillable_loc = fba_inventory_model.get_fba_warehouse()
+
+        order_vals_list = []
+        amz_orders_created = []
+        for amz_order in amz_orders:
+            try:
+                order_vals = self._prepare_order_vals(amz_order, account, warehouse, run_cache)
+            except Exception as e:
+                _logger.error('Error processing Amazon order %s: %s', amz_order.get('AmazonOrderId'), str(e))
+                _logger.error(traceback.format_exc())
+                raise ValidationError(f'Failed to process Amazon order {amz_order.get("AmazonOrderId")}: {str(e)} \n{traceback.format_exc()}')
+            if order_vals:
+                order_vals_list.append(order_vals)
+                amz_orders_created.append(amz_order)
+
+        if not order_vals_list:
+            return self.env['sale.order']
+
+        orders = self.env['sale.order'].create(order_vals_list)
+        _logger.debug('Created %s order(s) with %s lines', len(orders), len(orders.order_line))
+
+        # Confirm the orders
+        with telemetry.phase(telemetry.PHASE_VALIDATE):
+            orders.action_confirm()
+        _logger.debug('Confirmed %s order(s)', len(orders))
+
+        # Create the delivery pickings of the FBA orders
+        self.ship_orders(orders, warehouse)
+
+        # Reset order dates
+        for order, amz_order in zip(orders, amz_orders_created):
+            order_date = datetime.strptime(amz_order.get('PurchaseDate'), '%Y-%m-%dT%H:%M:%SZ')
+            shipped_date = order_date + timedelta(days=1)  # Assuming shipped date is next day for simplicity
+            commitment_date = datetime.strptime(amz_order.get('LatestShipDate'), '%Y-%m-%dT%H:%M:%SZ')
+            order.write({
+                'date_order': order_date,
+                'write_date': order_date,
+                'effective_date': shipped_date,
+                'commitment_date': commitment_date,
+            })
+
+        # If account is set to invoice FBA orders, create the invoices
+        if account.invoice_fba_orders:
+            orders_to_invoice = orders.filtered(lambda o: o.invoice_status != 'invoiced')
+            if orders_to_invoice:
+                self.create_invoices(orders_to_invoice, account)
+
+        return orders
+
+    @api.model
+    def _prepare_order_vals(self, amz_order, account, warehouse, run_cache):
+        """
+        Values of the sale order of a new FBA Amazon order, its lines included as (0, 0, vals) commands. Returns
+        None when the order cannot be imported yet.
+        """
+        _logger.debug('Preparing order for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
+
+        tax_cache = run_cache.setdefault('tax_profiles', {})
+        partner_cache = run_cache.setdefault('shipping_partners', LRUCache(SHIPPING_PARTNER_CACHE_SIZE))
+
+        # Orders of other marketplaces are priced in their own currency, e.g. CAD or MXN
+        currency_code = amz_order.get('OrderTotal', {}).get('CurrencyCode')
+        pricelist = self._get_currency_pricelist(currency_code, run_cache)
+        if pricelist is None:
+            _logger.warning('Skipping Amazon order %s: its currency %s is not active in Odoo', amz_order.get('AmazonOrderId'), currency_code)
+            return None
+
+        amz_order_items = self.env['amazon.order.item.cache'].get_order_items(account, amz_order)
+        if not amz_order_items:
+            _logger.warning('No order items found for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
+            return None
 
-        order = self.env['sale.order'].create(order_vals)
+        medium = self.get_fba_medium()
+        source = self.get_fba_source()
+        tag = self.get_fba_tag()
+        if account.consolidated_fba_order_customer:
+            partner = self.get_fba_partner()
+            shipping_partner = self.get_or_create_shipping_partner(
+                partner=partner, 
+                type="delivery", 
+                name="Amazon FBA", 
+                city=amz_order.get('ShippingAddress', {}).get('City', ''),
+                state=amz_order.get('ShippingAddress', {}).get('StateOrRegion', ''),
+                zip_code=amz_order.get('ShippingAddress', {}).get('PostalCode', ''), 
+                country_code=amz_order.get('ShippingAddress', {}).get('CountryCode', ''),
+                partner_cache=partner_cache,
+                run_cache=run_cache,
+                )
+            _logger.debug(f"Created or found shipping partner for FBA order: {shipping_partner.id} {shipping_partner.city}")
+        else:
+            # TODO: Handle non-consolidated FBA orders
+            _logger.error('Non-consolidated FBA orders are not yet implemented.')
+            return None
 
-        # Create order lines
+        # Prepare order lines
+        order_line_commands = []
         for item in amz_order_items:
 
             product = self.env['product.product'].search([('amazon_asin', '=', item.get('ASIN'))], limit=1)
             if not product:
                 _logger.warning('Product not found for SKU: %s', item.get('SellerSKU'))
-                return
+                return None
             
             # See if we should skip inventory without cost
             if account.skip_inventory_when_no_product_cost and not product.standard_price:
                 _logger.warning('Skipping inventory update for product %s because it has no cost', product.name)
-                return
+                return None
             
             # if we should skip inventory not using AVCO
             if account.skip_inventory_not_avco and product.cost_method != 'average':
@@ -384,7 +634,6 @@ class AmazonOrders(models.Model):
                 unit_price = line_price / line_qty
 
             order_line_vals = {
-                'order_id': order.id,
                 'product_id': product.id,
                 'product_uom_qty': item.get('QuantityOrdered'),
                 'price_unit': unit_price,
@@ -396,11 +645,11 @@ class AmazonOrders(models.Model):
             if account.import_fba_order_tax:
                 line_tax = float(item.get('ItemTax', {}).get('Amount', 0.0)) + float(item.get('PromotionalDiscountTax', {}).get('Amount', 0.0))
                 line_price = float(item.get('ItemPrice', {}).get('Amount', 0.0)) + float(item.get('PromotionalDiscount', {}).get('Amount', 0.0))
-                tax_profile = self.get_or_create_tax_profile_by_price_calculation(line_price, line_tax)
+                tax_profile = self.get_or_create_tax_profile_by_price_calculation(line_price, line_tax, account.tax_rate_precision, tax_cache)
                 if tax_profile:
                     order_line_vals['tax_id'] = [(6, 0, [tax_profile.id])]
             
-            self.env['sale.order.line'].create(order_line_vals)
+            order_line_commands.append((0, 0, order_line_vals))
 
             # Handle shipping cost if available
             if account.import_fba_order_shipping and "ShippingPrice" in item:
@@ -408,10 +657,9 @@ class AmazonOrders(models.Model):
                 # Determine shipping tax
                 shipping_tax = float(item.get('ShippingTax', {}).get('Amount', 0.0)) + float(item.get('ShippingDiscountTax', {}).get('Amount', 0.0))
                 shipping_price = float(item.get('ShippingPrice', {}).get('Amount', 0.0)) - float(item.get('ShippingDiscount', {}).get('Amount', 0.0))
-                shipping_tax_profile = self.get_or_create_tax_profile_by_price_calculation(shipping_price, shipping_tax)
+                shipping_tax_profile = self.get_or_create_tax_profile_by_price_calculation(shipping_price, shipping_tax, account.tax_rate_precision, tax_cache)
 
                 shipping_line_vals = {
-                    'order_id': order.id,
                     'product_id': shipping_cost_product.id,
                     'product_uom_qty': 1,  # Assuming shipping cost is per order
                     'price_unit': shipping_price,
@@ -422,33 +670,57 @@ class AmazonOrders(models.Model):
                 if shipping_tax_profile:
                     shipping_line_vals['tax_id'] = [(6, 0, [shipping_tax_profile.id])]
 
-                self.env['sale.order.line'].create(shipping_line_vals)
-
+                order_line_commands.append((0, 0, shipping_line_vals))
 
-        _logger.debug('Created order for Amazon Order ID: %s with %s lines', amz_order.get('AmazonOrderId'), len(order.order_line))
-
-        # Confirm the order
-        order.action_confirm()
-        _logger.debug('Confirmed order for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
-
-        # If fulfillment type is FBA, create the delivery picking
-        if fulfillment_type == "FBA":
-            self.ship_order(order, warehouse)
+        order_vals = {
+            'partner_id': partner.id,
+            'amazon_seller_order_id': amz_order.get('AmazonOrderId'),
+            'amazon_account_id': account.id,
+            'origin': amz_order.get('AmazonOrderId'),
+            'warehouse_id': warehouse.id,
+            'source_id': source.id,
+            'medium_id': medium.id,
+            'tag_ids': [(6, 0, [tag.id])],
+            'partner_shipping_id': shipping_partner.id,
+            'order_line': order_line_commands,
+        }
+        if pricelist:
+            order_vals['pricelist_id'] = pricelist.id
+        return order_vals
 
-        # Reset order dates
-        order_date = datetime.strptime(amz_order.get('PurchaseDate'), '%Y-%m-%dT%H:%M:%SZ')
-        shipped_date = order_date + timedelta(days=1)  # Assuming shipped date is next day for simplicity
-        commitment_date = datetime.strptime(amz_order.get('LatestShipDate'), '%Y-%m-%dT%H:%M:%SZ')
-        order.write({
-            'date_order': order_date,
-            'write_date': order_date,
-            'effective_date': shipped_date,
-            'commitment_date': commitment_date,
-        })        
-
-        # If account is set to invoice FBA orders, create an invoice
-        if account.invoice_fba_orders:
-            self.invoice_order(order, account)
+    @api.model
+    def _get_currency_pricelist(self, currency_code, run_cache):
+        """
+        Pricelist to book an Amazon order priced in ``currency_code`` with. Returns an empty recordset for the
+        company currency, so the default pricelist of the customer applies, and None when the currency is not
+        active. A pricelist is created for a currency that has none.
+        """
+        Pricelist = self.env['product.pricelist']
+        company = self.env.company
+        if not currency_code or currency_code == company.currency_id.name:
+            return Pricelist
+
+        pricelist_ids = run_cache.setdefault('currency_pricelists', {})
+        if currency_code in pricelist_ids:
+            return Pricelist.browse(pricelist_ids[currency_code]) if pricelist_ids[currency_code] else None
+
+        currency = self.env['res.currency'].search([('name', '=', currency_code)], limit=1)
+        pricelist = None
+        if currency:
+            pricelist = Pricelist.search([
+                ('currency_id', '=', currency.id),
+                ('company_id', 'in', [company.id, False]),
+            ], order='company_id, id', limit=1)
+            if not pricelist:
+                pricelist = Pricelist.create({
+                    'name': f'Amazon {currency_code}',
+                    'currency_id': currency.id,
+                    'company_id': company.id,
+                })
+                _logger.info('Created pricelist %s for Amazon orders in %s', pricelist.name, currency_code)
+
+        pricelist_ids[currency_code] = pricelist.id if pricelist else False
+        return pricelist
 
     @api.model
     def invoice_order(self, order, account):
@@ -462,10 +734,45 @@ class AmazonOrders(models.Model):
             _logger.info('Order %s is already fully invoiced', order.name)
             return
 
-        # Create the invoice
-        invoice = self.env['account.move'].create({
+        self.create_invoices(order, account)
+
+    @api.model
+    def invoice_orders(self, orders, account):
+        """
+        Invoice the given orders in chunks, committing after every chunk so a large backlog is invoiced with
+        bounded transaction size.
+        """
+        orders = orders.filtered(lambda o: o.invoice_status != 'invoiced')
+        self.env['amazon.sync.checkpoint'].run_in_batches(
+            'invoice_fba_orders', account, orders,
+            lambda order_batch: self.create_invoices(order_batch, account),
+        )
+
+    @api.model
+    @telemetry.in_phase(telemetry.PHASE_VALIDATE)
+    def create_invoices(self, orders, account):
+        """
+        Create the invoices of the given orders with a single account.move create and post them together.
+        """
+        invoices = self.env['account.move'].create([
+            self._prepare_invoice_vals(order) for order in orders
+        ])
+
+        # Post the invoices
+        invoices.action_post()
+        _logger.info('Created %s invoice(s) for account %s', len(invoices), account.name)
+        return invoices
+
+    @api.model
+    def _prepare_invoice_vals(self, order):
+        """
+        Values of the customer invoice for the given order. Invoice lines are linked to their order lines so
+        the order invoice status is updated.
+        """
+        return {
             'move_type': 'out_invoice',
             'partner_id': order.partner_id.id,
+            'currency_id': order.currency_id.id,
             'date': order.effective_date or order.date_order,
             'invoice_date': order.effective_date or order.date_order,
             'invoice_origin': order.name,
@@ -476,12 +783,9 @@ class AmazonOrders(models.Model):
                 'price_unit': line.price_unit,
                 'tax_ids': [(6, 0, line.tax_id.ids)],
                 'product_id': line.product_id.id,
+                'sale_line_ids': [(6, 0, [line.id])],
             }) for line in order.order_line],
-        })
-
-        # Post the invoice
-        invoice.action_post()
-        _logger.info('Created invoice %s for order %s', invoice.name, order.name)        
+        }
 
     @api.model
     def ship_order(self, order, warehouse):
@@ -489,35 +793,51 @@ class AmazonOrders(models.Model):
         Ship the order by creating a delivery picking.
         """
         _logger.debug('Shipping order for Amazon Order ID: %s', order.amazon_seller_order_id)
+        self.ship_orders(order, warehouse)
 
-        # Get the delivery (picking) for this order based on the order name
-        delivery_picking = self.env['stock.picking'].search([
-            ('origin', '=', order.name),
-            ('picking_type_id', '=', warehouse.out_type_id.id)
-        ], limit=1)
+    @api.model
+    def ship_orders(self, orders, warehouse):
+        """
+        Ship the given orders together by validating all their open delivery pickings in one batch.
+        """
+        delivery_pickings = orders.picking_ids.filtered(
+            lambda p: p.picking_type_id == warehouse.out_type_id and p.state not in ['done', 'cancel']
+        )
 
-        if not delivery_picking:
-            _logger.warning('No delivery picking found for order: %s', order.name)
-            return
-        
-        for picking in delivery_picking:
+        orders_without_picking = orders - delivery_pickings.sale_id
+        if orders_without_picking:
+            _logger.warning('No delivery picking found for order(s): %s', ', '.join(orders_without_picking.mapped('name')))
+
+        if delivery_pickings:
+            self.ship_pickings(delivery_pickings)
 
-            # Reserve stock for the order
-            for line in order.order_line:
-                for move in picking.move_ids:
-                    if move.product_id.id == line.product_id.id:
-                        move.quantity = line.product_uom_qty
-                        move.availability = line.product_uom_qty
+    @api.model
+    @telemetry.in_phase(telemetry.PHASE_VALIDATE)
+    def ship_pickings(self, pickings):
+        """
+        Deliver the full ordered quantity of the given outgoing pickings and validate them in one batch.
+        """
+        # Reserve stock for the orders
+        for move in pickings.move_ids:
+            move.quantity = move.product_uom_qty
+            move.availability = move.product_uom_qty
 
-            # Confirm and assign if necessary
-            if picking.state == 'draft':
-                picking.action_confirm()
+        # Confirm and assign if necessary
+        draft_pickings = pickings.filtered(lambda p: p.state == 'draft')
+        if draft_pickings:
+            draft_pickings.action_confirm()
 
-            if picking.state != 'assigned':
-                picking.action_assign()
+        unassigned_pickings = pickings.filtered(lambda p: p.state != 'assigned')
+        if unassigned_pickings:
+            unassigned_pickings.action_assign()
 
-            # Validate shipment (mark as shipped)
-            picking.button_validate()
+        # Validate shipments (mark as shipped). Amazon shipped the full quantity, so no backorder is created and no
+        # confirmation wizard is opened.
+        result = pickings.with_context(skip_backorder=True, skip_sms=True, skip_expired=True).button_validate()
+        not_done = pickings.filtered(lambda p: p.state != 'done')
+        if isinstance(result, dict) or not_done:
+            # A wizard asked for a confirmation that the cron cannot give
+            raise ValidationError(f'Failed to validate the delivery picking(s) {", ".join((not_done or pickings).mapped("name"))} without confirmation')
 
 
     @api.model
@@ -526,11 +846,12 @@ class AmazonOrders(models.Model):
         Update an existing Amazon order.
         """
         _logger.debug('Updating order for Amazon Order ID: %s', amz_order.get('AmazonOrderId'))
-        # TODO: Implement the update logic here
+        # TODO: Implement the update logic here, reading the items with amazon.order.item.cache get_order_items so
+        #  status changes do not fetch them again
 
 
     @api.model
-    def get_or_create_tax_profile_by_price_calculation(self, price: float, tax: float):
+    def get_or_create_tax_profile_by_price_calculation(self, price: float, tax: float, precision: int = 2, tax_cache=None):
         """
         Get or create a tax profile based on the price and tax amount.
         """
@@ -539,32 +860,64 @@ class AmazonOrders(models.Model):
             return None
 
         tax_percent = (tax / price) * 100
-        return self.get_or_create_tax_profile_by_percent(tax_percent)
+        return self.get_or_create_tax_profile_by_percent(tax_percent, precision, tax_cache)
+
+    @api.model
+    def quantize_tax_percent(self, tax_percent: float, precision: int = 2):
+        """
+        Round a tax percent to the given number of decimal places so near-identical rates share one tax profile.
+        Returns the rounded percent and the precision actually used (clamped to what account.tax can store).
+        """
+        precision = max(0, min(int(precision or 0), MAX_TAX_RATE_PRECISION))
+        return float_round(tax_percent, precision_digits=precision), precision
 
-    
     @api.model
-    def get_or_create_tax_profile_by_percent(self, tax_percent:float):
+    def get_or_create_tax_profile_by_percent(self, tax_percent: float, precision: int = 2, tax_cache=None):
         """
         Get or create a tax profile for the given tax percent.
+
+        The percent is quantized first. Resolved taxes are kept in ``tax_cache`` (a dict owned by the
+        current import run), so repeated rates cost no query. Misses are never cached, so a tax created
+        meanwhile by another worker is found instead of being duplicated.
         """
-        # Search or create a tax record for this percentage
-        tax_profile_name = f'{tax_percent}%'
+        tax_percent, precision = self.quantize_tax_percent(tax_percent, precision)
 
-        tax = self.env['account.tax'].search([
-            ('name', '=', tax_profile_name),
-            ('amount', '=', tax_percent),
-            ('type_tax_use', '=', 'sale'),
-            ('amount_type', '=', 'percent')
-        ], limit=1)
+        if tax_cache is not None and tax_percent in tax_cache:
+            return self.env['account.tax'].browse(tax_cache[tax_percent])
+
+        tax = self._find_tax_profile(tax_percent)
 
         if not tax:
             tax = self.env['account.tax'].create({
-                'name': tax_profile_name,
+                'name': self._get_tax_profile_name(tax_percent, precision),
                 'amount': tax_percent,
                 'amount_type': 'percent',
                 'type_tax_use': 'sale',
+                'amazon_tax_profile': True,
             })
 
             _logger.debug('Created new tax profile: %s with percent: %s', tax.name, tax_percent)
 
-        return tax
\ No newline at end of file
+        if tax_cache is not None:
+            tax_cache[tax_percent] = tax.id
+
+        return tax
+
+    @api.model
+    def _get_tax_profile_name(self, tax_percent: float, precision: int):
+        return f'{tax_percent:.{precision}f}%'
+
+    @api.model
+    def _find_tax_profile(self, tax_percent: float):
+        """
+        Return the sale tax profile of the company for an already quantized percent. Only the taxes created by this
+        module are matched, so a tax set up by the user with the same rate but other accounts or settings is never
+        attached to Amazon order lines.
+        """
+        return self.env['account.tax'].search([
+            ('amazon_tax_profile', '=', True),
+            ('amount', '=', tax_percent),
+            ('type_tax_use', '=', 'sale'),
+            ('amount_type', '=', 'percent'),
+            ('company_id', '=', self.env.company.id),
+        ], order='id', limit=1)
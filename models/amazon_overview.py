@@ -12,6 +12,8 @@
 #  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
 # ######################################################################################################################
 
+from datetime import timedelta
+
 from odoo import models, fields, api
 
 class AmazonOverview(models.TransientModel):
@@ -25,6 +27,13 @@ class AmazonOverview(models.TransientModel):
     total_address_mappings = fields.Integer(string='Address Mappings', readonly=True)
     unmapped_addresses = fields.Integer(string='Unmapped Addresses', readonly=True)
     has_unmapped_addresses = fields.Boolean(string='Has Unmapped Addresses', readonly=True)
+
+    # Sync run telemetry of the last 24 hours
+    sync_runs = fields.Integer(string='Sync Runs (24h)', readonly=True)
+    failed_sync_runs = fields.Integer(string='Failed Sync Runs (24h)', readonly=True)
+    sync_duration = fields.Float(string='Sync Time (s, 24h)', digits=(16, 2), readonly=True)
+    sync_api_calls = fields.Integer(string='API Calls (24h)', readonly=True)
+    sync_api_throttled = fields.Integer(string='429 Retries (24h)', readonly=True)
     
     @api.model
     def default_get(self, fields_list):
@@ -45,5 +54,18 @@ class AmazonOverview(models.TransientModel):
         ])
         result['unmapped_addresses'] = unmapped_addresses
         result['has_unmapped_addresses'] = unmapped_addresses > 0
+
+        # Summarize the sync runs of the last 24 hours
+        SyncRun = self.env['amazon.sync.run']
+        since = fields.Datetime.now() - timedelta(days=1)
+        [(runs, duration, api_calls, api_throttled)] = SyncRun._read_group(
+            [('date_start', '>=', since)],
+            aggregates=['__count', 'duration:sum', 'api_calls:sum', 'api_throttled:sum'],
+        )
+        result['sync_runs'] = runs
+        result['failed_sync_runs'] = SyncRun.search_count([('date_start', '>=', since), ('state', '=', 'failed')])
+        result['sync_duration'] = duration or 0.0
+        result['sync_api_calls'] = api_calls or 0
+        result['sync_api_throttled'] = api_throttled or 0
         
         return result
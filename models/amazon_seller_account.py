@@ -12,31 +12,30 @@
 #  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
 # ######################################################################################################################
 
-import subprocess
+import os
 import sys
 import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
 
-from .utils import amazon_utils
-
-# Token caches are imported so they can be cleared before verifying
-# connection details. This prevents a cached token from succeeding
-# when a user has updated the credentials with invalid values.
+from .utils import amazon_utils, telemetry, token_cache
 
 logger = logging.getLogger(__name__)
 
-try:
-    from sp_api.api import Sellers
-    from sp_api.base import Marketplaces, SellingApiException
-    from sp_api.auth.access_token_client import cache as sp_api_token_cache, grantless_cache as sp_api_grantless_cache
-except Exception:
-    Sellers = None
-    Marketplaces = None
-    SellingApiException = Exception
-    sp_api_token_cache = None
-    sp_api_grantless_cache = None
+# The syncs of an account are suspended after this many consecutive runs failed because Amazon rejected its credentials
+CIRCUIT_BREAKER_THRESHOLD = 3
+
+# Time the syncs of such an account stay suspended before they are tried again
+CIRCUIT_BREAKER_COOLDOWN = timedelta(hours=1)
+
+# Default number of threads fetching item details from Amazon, overridable with the amazon_seller.fetch_workers parameter
+DEFAULT_FETCH_WORKERS = 4
 
 
 class AmazonSellerAccount(models.Model):
@@ -51,11 +50,48 @@ class AmazonSellerAccount(models.Model):
     refresh_token = fields.Char(string='Refresh Token', required=True)
     seller_id = fields.Char(string='Seller ID', required=True)
 
+    sp_api_endpoint = fields.Char(
+        string='SP-API Endpoint',
+        groups='base.group_system',
+        help='Technical: send all SP-API requests of this account to this base URL instead of Amazon, e.g. http://localhost:8765 for the mock server in tests/sp_api_mock. Only used in test runs or when the amazon_seller_allow_endpoint_override server option is set. The credentials of the account are only sent to Amazon hosts. Leave empty to use Amazon.'
+    )
+    profile_sync_runs = fields.Boolean(
+        string='Profile Sync Runs',
+        default=False,
+        help='Technical: profile the sync runs of this account and attach the profile to each sync run. Slows the runs down. The system parameter amazon_seller.profile_sync_runs enables it for all accounts.'
+    )
+    archive_payloads = fields.Boolean(
+        string='Archive API Payloads',
+        default=False,
+        help='Technical: keep a compressed copy of the raw payloads fetched from Amazon in the filestore, one file per day and payload type. The imports can then be run again from the archive without calling Amazon, e.g. after fixing a mapping bug.'
+    )
+    sync_failure_count = fields.Integer(
+        string='Credential Failures',
+        readonly=True,
+        copy=False,
+        help='Consecutive sync runs that failed because Amazon rejected the credentials (LWA error, 401 or 403).'
+    )
+    sync_suspended_until = fields.Datetime(
+        string='Sync Suspended Until',
+        readonly=True,
+        copy=False,
+        help='The scheduled syncs of this account are skipped until this time after repeated credential failures. Fix the credentials and use "Test and Save" or "Resume Sync" to resume them now.'
+    )
+
     marketplace = fields.Selection([
         ('US', 'United States'),
         ('CA', 'Canada'),
         ('MX', 'Mexico'),
     ], string='Marketplace', required=True, default='US')
+    additional_marketplace_ids = fields.Many2many(
+        'res.country',
+        'amazon_seller_account_marketplace_rel',
+        'account_id',
+        'country_id',
+        string='Additional Marketplaces',
+        domain=[('code', 'in', ['US', 'CA', 'MX'])],
+        help='Other marketplaces of the same seller synced with these credentials, e.g. Canada and Mexico for a seller based in the United States. Orders, listings and FBA inventory of every marketplace are fetched under one token.'
+    )
 
     # Product Listing Settings
     import_products = fields.Boolean(
@@ -102,6 +138,11 @@ class AmazonSellerAccount(models.Model):
         help='Enable automatic import of FBA inbound shipments from Amazon. The origin location of the shipments will be added to the address mapping table. Once mapped the shipments will deduct inventory from the warehouse locations you specified in the address mapping.'
     )
 
+    fba_inbound_last_updated = fields.Datetime(
+        string='FBA Inbound Synced Until',
+        help='Only FBA inbound shipments updated after this time are requested from Amazon on the next import. Clear it to rescan the shipments of the last 365 days.'
+    )
+
     import_fba_orders = fields.Boolean(
         string='Import FBA Orders',
         default=False,
@@ -120,6 +161,12 @@ class AmazonSellerAccount(models.Model):
         help='Enable automatic import of order tax from Amazon. This will estimate the tax percentage based on the order total and the tax amount. Then a custom tax profile will be created in Odoo with the estimated tax percentage. This allows you to track taxes that are not set up in Odoo, but are applied to Amazon orders.'
     )
 
+    tax_rate_precision = fields.Integer(
+        string='Tax Rate Precision',
+        default=2,
+        help='Number of decimal places the estimated tax percentage is rounded to before looking up or creating a tax profile (0-4). Lower precision means fewer, shared tax profiles (e.g. 8.25% instead of 8.2500001%).'
+    )
+
     import_fba_order_shipping = fields.Boolean(
         string='Import FBA Order Shipping',
         default=False,
@@ -159,49 +206,76 @@ class AmazonSellerAccount(models.Model):
         help='Enable automatic import of AWD inbound shipments from Amazon. The origin location of the shipments will be added to the address mapping table. Once mapped the shipments will deduct inventory from the warehouse locations you specified in the address mapping.'
     )
 
+    def get_marketplace_codes(self):
+        """
+        Codes of the marketplaces synced for the account, its primary marketplace first.
+        """
+        self.ensure_one()
+        codes = [self.marketplace] + self.additional_marketplace_ids.mapped('code')
+        return [code for code in dict.fromkeys(codes) if amazon_utils.marketplace_id_mapper(code)]
+
+    def get_archive_root(self):
+        """
+        Directory of the payload archive of the account in the filestore, whether it still archives payloads or not.
+        """
+        self.ensure_one()
+        return os.path.join(tools.config.filestore(self.env.cr.dbname), 'amazon_seller_archive', str(self.id))
+
+    def get_archive_dir(self):
+        """
+        Directory the fetched payloads of the account are archived to, or None when it does not archive them.
+        """
+        self.ensure_one()
+        return self.get_archive_root() if self.archive_payloads else None
+
+    def action_reprocess_archive(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Reprocess From Archive'),
+            'res_model': 'amazon.archive.reprocess',
+            'view_mode': 'form',
+            'target': 'new',
+            'context': {'default_account_id': self.id},
+        }
+
     def verify_connection(self):
         """Verify the account credentials using python-amazon-sp-api."""
-        if Sellers is None:
-            raise ValidationError('python-amazon-sp-api is not installed.')
-
-        # Clear any cached tokens so that new credentials are always used
+        try:
+            Sellers = amazon_utils.get_api_class('Sellers')
+        except ImportError:
+            raise ValidationError('python-amazon-sp-api is not installed. Install it from Settings -> Amazon Seller, then restart Odoo.')
+
+        # Token caches are cleared before verifying connection details. This prevents a cached token from
+        # succeeding when a user has updated the credentials with invalid values.
+        try:
+            from sp_api.auth.access_token_client import cache as sp_api_token_cache, grantless_cache as sp_api_grantless_cache
+        except ImportError:
+            sp_api_token_cache = sp_api_grantless_cache = None
         if sp_api_token_cache is not None:
             sp_api_token_cache.clear()
         if sp_api_grantless_cache is not None:
             sp_api_grantless_cache.clear()
+        token_cache.clear()
         for rec in self:
 
             if rec.marketplace and isinstance(rec.marketplace, str):
-                marketplace = amazon_utils.sp_marketplace_mapper(rec.marketplace)
-
-                amz_credentials = dict(
-                    refresh_token=rec.refresh_token,
-                    lwa_app_id=rec.app_id,
-                    lwa_client_secret=rec.client_secret
-                )
-
                 try:
-                    found_match = False
-
-                    participation = Sellers(
-                        credentials=amz_credentials,
-                        marketplace=marketplace,
-                    ).get_marketplace_participation()
+                    participation = amazon_utils.get_api_client(Sellers, rec).get_marketplace_participation()
 
-                    if participation.payload:
-                        for part in participation.payload:
+                    participating = {
+                        part.get('marketplace').get('countryCode')
+                        for part in participation.payload or []
+                        if part.get('participation').get('isParticipating')
+                    }
+                    missing = [code for code in rec.get_marketplace_codes() if code not in participating]
 
-                            if part.get('marketplace').get('countryCode') == rec.marketplace:
-                                if part.get('participation').get('isParticipating'):
-                                    logger.info(f'Connection successful for {rec.name} in {rec.marketplace} marketplace.')
-                                    found_match = True
-                                    break
-
-                    if not found_match:
-                        logger.error(f'No participation found for {rec.name} in {rec.marketplace} marketplace.')
+                    if missing:
+                        logger.error(f'No participation found for {rec.name} in {", ".join(missing)} marketplace.')
                         raise ValidationError(
-                            f'No participation found for {rec.name} in {rec.marketplace} marketplace. \n\n\n\n Data:{participation}'
+                            f'No participation found for {rec.name} in {", ".join(missing)} marketplace. \n\n\n\n Data:{participation}'
                         )
+                    logger.info(f'Connection successful for {rec.name} in {", ".join(rec.get_marketplace_codes())} marketplace.')
 
                 except Exception as e:
                     logger.error(f'Error verifying connection for {rec.name} in {rec.marketplace} marketplace: {e}')
@@ -229,5 +303,166 @@ class AmazonSellerAccount(models.Model):
             self._origin.write(vals)
         else:
             self._origin = self.create(vals)
+        # The credentials work again, resume the suspended syncs
+        self._origin.action_resume_sync()
         result['params']['message'] = _('Connection verified and saved.')
         return result
+
+    def run_sync_job(self, model_name, method_name, description, parallel=False):
+        """
+        Run ``env[model_name].method_name(account)`` for every account of the recordset.
+
+        Jobs that only write records of their own account pass ``parallel=True``: with the
+        ``amazon_seller.parallel_accounts`` system parameter above 1, their accounts are synced concurrently by that
+        many threads, each with its own database cursor and transaction. Other jobs, e.g. those updating products
+        shared by the accounts, and every job without the parameter, run one account after the other in the current
+        cursor. ``description`` is used in log and error messages, e.g. "import orders". Every account run is
+        recorded as an amazon.sync.run.
+
+        Accounts are isolated from each other: the work of a failing account is rolled back, its error is recorded
+        in its sync run, and the remaining accounts are still synced. Accounts suspended by the circuit breaker are
+        skipped. Returns the errors by account name.
+        """
+        accounts = self._filter_sync_allowed(model_name, method_name, description)
+        workers = min(self._get_parallel_account_workers(), len(accounts)) if parallel else 1
+        Checkpoint = self.env['amazon.sync.checkpoint']
+
+        # Shared records created by the cron before the accounts are synced must survive a failing account, and
+        # worker cursors only see committed data
+        Checkpoint._commit_progress()
+
+        errors = {}
+        if workers <= 1 or not Checkpoint._can_commit():
+            for account in accounts:
+                error = account._run_account_sync_job(model_name, method_name, description)
+                if error:
+                    errors[account.name] = error
+        else:
+            logger.info('Running %s for %s account(s) with %s parallel workers', description, len(accounts), workers)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='amazon_sync') as executor:
+                futures = {
+                    account.name: executor.submit(self._run_sync_job_in_worker, account.id, model_name, method_name, description)
+                    for account in accounts
+                }
+            for name, future in futures.items():
+                error = future.exception() or future.result()
+                if error:
+                    errors[name] = error
+
+        if errors:
+            # Not raised: the errors are recorded in the sync runs, and a failing cron would end up deactivated
+            logger.error('%s failed for %s of %s account(s): %s', description, len(errors), len(accounts), ', '.join(errors))
+        return errors
+
+    def _run_sync_job_in_worker(self, account_id, model_name, method_name, description):
+        """
+        Thread target of run_sync_job, syncing the account with its own cursor. Returns the error of the account.
+        """
+        current_thread = threading.current_thread()
+        current_thread.dbname = self.env.cr.dbname
+        current_thread.uid = self.env.uid
+
+        with self.env.registry.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            account = env['amazon.seller.account'].browse(account_id)
+            return account._run_account_sync_job(model_name, method_name, description)
+
+    def _run_account_sync_job(self, model_name, method_name, description):
+        """
+        Sync one account in its own transaction and update its circuit breaker. Returns the error, if any.
+        """
+        self.ensure_one()
+        try:
+            logger.info('Running %s for account: %s', description, self.name)
+            with self._sync_transaction(), \
+                    self.env['amazon.sync.run'].track(self, model_name, method_name, description):
+                getattr(self.env[model_name], method_name)(self)
+        except Exception as e:
+            logger.error('Error during %s for account %s: %s', description, self.name, str(e))
+            logger.error(traceback.format_exc())
+            self._register_sync_failure(e)
+            return e
+        self._register_sync_success()
+        return None
+
+    @contextmanager
+    def _sync_transaction(self):
+        """
+        Commit the work of the block when it succeeds and roll it back when it fails. The syncs commit their
+        progress batch by batch, which a savepoint would not survive, so savepoints are only used while testing,
+        when commits are not allowed.
+        """
+        if not self.env['amazon.sync.checkpoint']._can_commit():
+            with self.env.cr.savepoint():
+                yield
+            return
+
+        try:
+            yield
+        except Exception:
+            self.env.cr.rollback()
+            raise
+        self.env.cr.commit()
+
+    def _filter_sync_allowed(self, model_name, method_name, description):
+        """
+        Accounts of the recordset whose sync is not suspended. A skipped run is recorded for the others.
+        """
+        now = fields.Datetime.now()
+        suspended = self.filtered(lambda account: account.sync_suspended_until and account.sync_suspended_until > now)
+        for account in suspended:
+            reason = f'Sync suspended until {account.sync_suspended_until} (UTC) after {account.sync_failure_count} consecutive credential failures'
+            logger.warning('Skipping %s for account %s: %s', description, account.name, reason)
+            self.env['amazon.sync.run'].record_skipped(account, model_name, method_name, description, reason)
+        return self - suspended
+
+    def _register_sync_failure(self, error):
+        """
+        Count the failures caused by rejected credentials and suspend the syncs of the account for a cool-down
+        period once there are CIRCUIT_BREAKER_THRESHOLD in a row. Other errors leave the breaker untouched.
+        """
+        self.ensure_one()
+        if telemetry.error_category(error) != telemetry.ERROR_CREDENTIALS:
+            return
+
+        failure_count = self.sync_failure_count + 1
+        vals = {'sync_failure_count': failure_count}
+        if failure_count >= CIRCUIT_BREAKER_THRESHOLD:
+            vals['sync_suspended_until'] = fields.Datetime.now() + CIRCUIT_BREAKER_COOLDOWN
+            logger.warning('Suspending the syncs of account %s until %s after %s consecutive credential failures',
+                           self.name, vals['sync_suspended_until'], failure_count)
+        self.write(vals)
+        self.env['amazon.sync.checkpoint']._commit_progress()
+
+    def _register_sync_success(self):
+        if self.sync_failure_count or self.sync_suspended_until:
+            self.action_resume_sync()
+
+    def is_sync_suspended(self):
+        self.ensure_one()
+        return bool(self.sync_suspended_until and self.sync_suspended_until > fields.Datetime.now())
+
+    def action_resume_sync(self):
+        """
+        Close the circuit breaker, e.g. after fixing the credentials.
+        """
+        self.write({'sync_failure_count': 0, 'sync_suspended_until': False})
+
+    @api.model
+    def _get_parallel_account_workers(self):
+        value = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.parallel_accounts')
+        try:
+            return max(1, int(value)) if value else 1
+        except ValueError:
+            return 1
+
+    @api.model
+    def get_fetch_workers(self):
+        """
+        Number of threads amazon_utils.fetch_concurrently uses to fetch item details from Amazon.
+        """
+        value = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.fetch_workers')
+        try:
+            return max(1, int(value)) if value else DEFAULT_FETCH_WORKERS
+        except ValueError:
+            return DEFAULT_FETCH_WORKERS
@@ -0,0 +1,111 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import logging
+from odoo import models, fields, api, modules, tools
+
+_logger = logging.getLogger(__name__)
+
+# Default number of items processed per transaction, overridable with the amazon_seller.sync_batch_size parameter
+DEFAULT_SYNC_BATCH_SIZE = 100
+
+
+class AmazonSyncCheckpoint(models.Model):
+    """Resume point of a chunked sync job for one seller account."""
+
+    _name = 'amazon.sync.checkpoint'
+    _description = 'Amazon Sync Checkpoint'
+    _rec_name = 'job'
+
+    job = fields.Char(string='Job', required=True, index=True)
+    account_id = fields.Many2one('amazon.seller.account', string='Account', required=True, index=True, ondelete='cascade')
+    done_keys = fields.Json(string='Done Keys', help='Keys of the items committed by an unfinished run')
+
+    _sql_constraints = [
+        ('unique_job_account', 'unique(job, account_id)', 'A checkpoint already exists for this job and account!')
+    ]
+
+    @api.model
+    def run_in_batches(self, job, account, items, process_batch, key=None, batch_size=None):
+        """
+        Process ``items`` in chunks with ``process_batch(chunk)``, committing after every chunk.
+
+        Items (a list or a recordset) are processed in ``key`` order; ``key`` returns a str or int and defaults to
+        the record id for recordsets. The keys of the committed items are saved as the checkpoint of
+        (job, account), and an interrupted run skips them on the next call, whatever the keys of the items fetched
+        since then. The checkpoint is cleared once every item is done.
+        """
+        if key is None:
+            key = lambda item: item.id
+
+        batch_size = batch_size or self.get_batch_size()
+        items = items.sorted(key) if isinstance(items, models.BaseModel) else sorted(items, key=key)
+
+        checkpoint = self.search([('job', '=', job), ('account_id', '=', account.id)], limit=1)
+        done_keys = set()
+        if checkpoint.done_keys:
+            if isinstance(checkpoint.done_keys, list):
+                done_keys = set(checkpoint.done_keys)
+            else:
+                _logger.warning('Ignoring unusable %s checkpoint for account %s', job, account.name)
+
+        if done_keys:
+            total = len(items)
+            if isinstance(items, models.BaseModel):
+                items = items.filtered(lambda item: key(item) not in done_keys)
+            else:
+                items = [item for item in items if key(item) not in done_keys]
+            _logger.info('Resuming %s for account %s (%s of %s items already done)', job, account.name, total - len(items), total)
+
+        for batch_start in range(0, len(items), batch_size):
+            batch = items[batch_start:batch_start + batch_size]
+            process_batch(batch)
+
+            done_keys.update(key(item) for item in batch)
+            checkpoint = self._save_done_keys(checkpoint, job, account, done_keys)
+            self._commit_progress()
+            _logger.debug('%s for account %s: %s of %s items done', job, account.name, batch_start + len(batch), len(items))
+
+        # Finished, the next run starts from the beginning again
+        if checkpoint and checkpoint.done_keys:
+            checkpoint.done_keys = False
+            self._commit_progress()
+
+    @api.model
+    def _save_done_keys(self, checkpoint, job, account, done_keys):
+        vals = {'done_keys': sorted(done_keys)}
+        if checkpoint:
+            checkpoint.write(vals)
+            return checkpoint
+        return self.create({'job': job, 'account_id': account.id, **vals})
+
+    @api.model
+    def get_batch_size(self):
+        value = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.sync_batch_size')
+        try:
+            return max(1, int(value)) if value else DEFAULT_SYNC_BATCH_SIZE
+        except ValueError:
+            return DEFAULT_SYNC_BATCH_SIZE
+
+    @api.model
+    def _commit_progress(self):
+        if self._can_commit():
+            self.env.cr.commit()
+
+    @api.model
+    def _can_commit(self):
+        """
+        Intermediate commits are never allowed while running tests.
+        """
+        return not tools.config['test_enable'] and not modules.module.current_test
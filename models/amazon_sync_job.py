@@ -0,0 +1,269 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from odoo import models, fields, api, tools
+
+from .utils import payload_archive, profiling
+
+_logger = logging.getLogger(__name__)
+
+# Handler and default priority of each job type. Handlers are called as env[model].method(account, references).
+JOB_TYPES = {
+    'orders': ('amazon.orders', 'import_orders_by_id', 5),
+    'fba_inbound': ('amazon.fba.inbound', 'import_shipments_by_id', 10),
+    'awd_inbound': ('amazon.awd.inbound', 'import_shipments_by_id', 10),
+    'fba_inventory': ('amazon.fba.inventory', 'sync_skus_fba_inventory', 10),
+    'catalog': ('amazon.import.products', 'refresh_catalog_items', 20),
+}
+
+# Default number of threads draining the queue, overridable with the amazon_seller.job_workers parameter
+DEFAULT_JOB_WORKERS = 2
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Failed jobs are retried after 1, 2, 4, ... minutes, at most 6 hours later
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 6 * 3600
+
+# Seconds a dispatcher run keeps starting jobs, well below the cron time limit. It is triggered again when jobs remain.
+DISPATCH_TIME_LIMIT = 240
+
+# Done jobs are deleted after this many days
+JOB_RETENTION_DAYS = 7
+
+# Claim the most urgent due job. Jobs locked by other dispatchers are skipped, so any number of them can drain the
+# queue together, and a job is released again when its dispatcher crashes.
+CLAIM_JOB_QUERY = """
+    SELECT id FROM amazon_sync_job
+    WHERE state = 'pending' AND next_run <= (now() AT TIME ZONE 'UTC')
+    ORDER BY priority, next_run, id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+"""
+
+
+class AmazonSyncJob(models.Model):
+    """Unit of sync work for a few orders, shipments, SKUs or catalog items, run by the dispatcher cron."""
+
+    _name = 'amazon.sync.job'
+    _description = 'Amazon Sync Job'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', required=True)
+    job_type = fields.Selection([
+        ('orders', 'Import Orders'),
+        ('fba_inbound', 'Import FBA Inbound Shipments'),
+        ('awd_inbound', 'Import AWD Inbound Shipments'),
+        ('fba_inventory', 'Update FBA Inventory'),
+        ('catalog', 'Refresh Catalog Items'),
+    ], string='Type', required=True, index=True)
+    account_id = fields.Many2one('amazon.seller.account', string='Account', required=True, index=True, ondelete='cascade')
+    payload = fields.Json(string='Payload', help='Order ids, shipment ids, SKUs or ASINs processed by the job')
+    payload_key = fields.Char(string='Payload Key', index=True, help='Hash of the type, account and payload, to skip queuing the same job twice')
+    priority = fields.Integer(string='Priority', default=10, help='Jobs with a lower priority run first')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', required=True, default='pending', index=True)
+    attempts = fields.Integer(string='Attempts', default=0)
+    max_attempts = fields.Integer(string='Max Attempts', default=DEFAULT_MAX_ATTEMPTS)
+    next_run = fields.Datetime(string='Next Run', required=True, default=fields.Datetime.now)
+    date_done = fields.Datetime(string='Done At')
+    duration = fields.Float(string='Duration (s)', digits=(16, 2))
+    error = fields.Text(string='Error')
+
+    def init(self):
+        tools.create_index(self._cr, 'amazon_sync_job_dispatch_index', self._table,
+                           ['priority', 'next_run', 'id'], where="state = 'pending'")
+
+    @api.model
+    def is_enabled(self):
+        """
+        The scheduled imports queue their work as jobs when the amazon_seller.job_queue system parameter is set.
+        Imports reprocessing archived payloads always run inline.
+        """
+        if payload_archive.current():
+            return False
+        value = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.job_queue')
+        return str(value).strip().lower() in ('1', 'true', 'yes')
+
+    @api.model
+    def enqueue(self, job_type, account, references, priority=None, batch_size=None):
+        """
+        Queue jobs of ``job_type`` for ``references``, split in chunks of the sync batch size. Chunks already waiting
+        in an identical pending job are skipped. Returns the created jobs.
+        """
+        model_name, method_name, default_priority = JOB_TYPES[job_type]
+        references = sorted({reference for reference in references if reference})
+        if not references:
+            return self.browse()
+
+        batch_size = batch_size or self.env['amazon.sync.checkpoint'].get_batch_size()
+        chunks = [references[start:start + batch_size] for start in range(0, len(references), batch_size)]
+        keys = [self._get_payload_key(job_type, account, chunk) for chunk in chunks]
+        existing_keys = set(self.search([('state', '=', 'pending'), ('payload_key', 'in', keys)]).mapped('payload_key'))
+
+        description = dict(self._fields['job_type'].selection)[job_type]
+        jobs = self.create([{
+            'name': f'{description} ({len(chunk)})',
+            'job_type': job_type,
+            'account_id': account.id,
+            'payload': chunk,
+            'payload_key': key,
+            'priority': default_priority if priority is None else priority,
+        } for chunk, key in zip(chunks, keys) if key not in existing_keys])
+
+        _logger.info('Queued %s %s job(s) for account %s', len(jobs), job_type, account.name)
+        if jobs:
+            self._trigger_dispatcher()
+        return jobs
+
+    @api.model
+    def _get_payload_key(self, job_type, account, references):
+        return hashlib.sha1(json.dumps([job_type, account.id, references]).encode()).hexdigest()
+
+    @api.model
+    def _trigger_dispatcher(self):
+        cron = self.env.ref('amazon_seller.ir_cron_amazon_dispatch_sync_jobs', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+
+    @api.model
+    @profiling.profiled()
+    def cron_dispatch_jobs(self):
+        """
+        Run the due jobs by priority, with amazon_seller.job_workers threads, each committing after every job.
+        """
+        deadline = time.monotonic() + DISPATCH_TIME_LIMIT
+        workers = self._get_job_workers()
+
+        if workers <= 1 or not self.env['amazon.sync.checkpoint']._can_commit():
+            self._drain(deadline)
+        else:
+            # Worker cursors only see committed data
+            self.env.cr.commit()
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='amazon_job') as executor:
+                futures = [executor.submit(self._drain_in_worker, deadline) for _ in range(workers)]
+            for future in futures:
+                if future.exception():
+                    _logger.error('Amazon sync job worker failed: %s', future.exception())
+
+        if self.search_count([('state', '=', 'pending'), ('next_run', '<=', fields.Datetime.now())], limit=1):
+            self._trigger_dispatcher()
+
+    def _drain_in_worker(self, deadline):
+        """
+        Thread target of cron_dispatch_jobs, draining the queue with its own cursor.
+        """
+        current_thread = threading.current_thread()
+        current_thread.dbname = self.env.cr.dbname
+        current_thread.uid = self.env.uid
+
+        with self.env.registry.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            env[self._name]._drain(deadline)
+
+    @api.model
+    def _drain(self, deadline):
+        """
+        Claim and run due jobs one at a time until none is left or ``deadline`` (time.monotonic) has passed.
+        Returns the number of jobs run.
+        """
+        Checkpoint = self.env['amazon.sync.checkpoint']
+        count = 0
+        while time.monotonic() < deadline:
+            self.env.cr.execute(CLAIM_JOB_QUERY)
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            self.browse(row[0])._run()
+            # Commits the work of the job with its state, and releases its lock
+            Checkpoint._commit_progress()
+            count += 1
+        return count
+
+    def _run(self):
+        """
+        Run the claimed job. A failing job is rolled back and retried with an exponential backoff, until it failed
+        max_attempts times.
+        """
+        self.ensure_one()
+        model_name, method_name, default_priority = JOB_TYPES[self.job_type]
+        account = self.account_id
+        attempts = self.attempts + 1
+        started = time.perf_counter()
+
+        if account.is_sync_suspended():
+            # Postponed without using an attempt, the credentials of the account are being rejected
+            self.next_run = account.sync_suspended_until
+            return
+
+        try:
+            with self.env.cr.savepoint(), \
+                    self.env['amazon.sync.run'].track(account, model_name, method_name, self.name.lower()):
+                getattr(self.env[model_name], method_name)(account, self.payload or [])
+        except Exception as e:
+            _logger.error('Amazon sync job %s (%s) failed for account %s: %s', self.id, self.name, account.name, e)
+            vals = {
+                'attempts': attempts,
+                'duration': time.perf_counter() - started,
+                'error': traceback.format_exc(),
+            }
+            if attempts >= self.max_attempts:
+                vals['state'] = 'failed'
+            else:
+                delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+                vals['next_run'] = fields.Datetime.now() + timedelta(seconds=delay)
+            self.write(vals)
+            return
+
+        self.write({
+            'state': 'done',
+            'attempts': attempts,
+            'date_done': fields.Datetime.now(),
+            'duration': time.perf_counter() - started,
+            'error': False,
+        })
+
+    def action_retry(self):
+        self.filtered(lambda job: job.state == 'failed').write({
+            'state': 'pending',
+            'attempts': 0,
+            'next_run': fields.Datetime.now(),
+            'error': False,
+        })
+        self._trigger_dispatcher()
+
+    @api.model
+    def _get_job_workers(self):
+        value = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.job_workers')
+        try:
+            return max(1, int(value)) if value else DEFAULT_JOB_WORKERS
+        except ValueError:
+            return DEFAULT_JOB_WORKERS
+
+    @api.autovacuum
+    def _gc_done_jobs(self):
+        limit = fields.Datetime.now() - timedelta(days=JOB_RETENTION_DAYS)
+        self.search([('state', '=', 'done'), ('date_done', '<', limit)]).unlink()
@@ -0,0 +1,204 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import base64
+import logging
+import time
+import traceback
+from contextlib import contextmanager
+
+from odoo import models, fields, api
+
+from .utils import profiling, telemetry
+
+_logger = logging.getLogger(__name__)
+
+
+class AmazonSyncRun(models.Model):
+    """Telemetry of one sync job run for one account: phase timings, API and SQL counters, records and errors."""
+
+    _name = 'amazon.sync.run'
+    _description = 'Amazon Sync Run'
+    _order = 'date_start desc, id desc'
+
+    name = fields.Char(string='Job', required=True, help='Description of the job, e.g. "import orders"')
+    job = fields.Char(string='Method', help='Model and method run for the account')
+    account_id = fields.Many2one('amazon.seller.account', string='Account', index=True, ondelete='cascade')
+    date_start = fields.Datetime(string='Started', required=True, index=True)
+    date_end = fields.Datetime(string='Ended')
+    state = fields.Selection([
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped'),
+    ], string='State', required=True, default='done', index=True)
+    duration = fields.Float(string='Duration (s)', digits=(16, 2), aggregator='sum')
+    fetch_seconds = fields.Float(string='Fetch (s)', digits=(16, 2), aggregator='sum',
+                                 help='Time spent waiting on the SP-API')
+    resolve_seconds = fields.Float(string='Resolve (s)', digits=(16, 2), aggregator='sum',
+                                   help='Time spent matching Amazon data to products, partners and locations')
+    write_seconds = fields.Float(string='Write (s)', digits=(16, 2), aggregator='sum',
+                                 help='Time spent creating and updating records')
+    validate_seconds = fields.Float(string='Validate (s)', digits=(16, 2), aggregator='sum',
+                                    help='Time spent confirming, validating and invoicing')
+    other_seconds = fields.Float(string='Other (s)', digits=(16, 2), aggregator='sum',
+                                 help='Time not attributed to any phase')
+    api_calls = fields.Integer(string='API Calls', aggregator='sum')
+    api_throttled = fields.Integer(string='429 Retries', aggregator='sum',
+                                   help='Calls rejected by Amazon with 429 Too Many Requests and retried')
+    api_calls_by_operation = fields.Json(string='API Calls by Operation')
+    api_calls_summary = fields.Text(string='API Calls per Operation', compute='_compute_api_calls_summary')
+    sql_queries = fields.Integer(string='SQL Queries', aggregator='sum')
+    records_created = fields.Integer(string='Records Created', aggregator='sum')
+    records_updated = fields.Integer(string='Records Updated', aggregator='sum')
+    error = fields.Text(string='Error')
+    error_type = fields.Char(string='Error Type', help='Class of the exception that failed the run')
+    error_code = fields.Integer(string='HTTP Status', help='Status code of the SP-API response that failed the run')
+    error_category = fields.Selection([
+        (telemetry.ERROR_CREDENTIALS, 'Credentials'),
+        (telemetry.ERROR_THROTTLED, 'Throttled'),
+        (telemetry.ERROR_OTHER, 'Other'),
+    ], string='Error Category', index=True)
+    profile_attachment_ids = fields.Many2many('ir.attachment', string='Profile', compute='_compute_profile_attachment_ids',
+                                              help='cProfile report and raw pstats dump of profiled runs')
+
+    @api.depends('api_calls_by_operation')
+    def _compute_api_calls_summary(self):
+        for record in self:
+            calls = record.api_calls_by_operation or {}
+            record.api_calls_summary = '\n'.join(
+                f'{operation}: {count}' for operation, count in sorted(calls.items(), key=lambda item: -item[1])
+            )
+
+    def _compute_profile_attachment_ids(self):
+        attachments = self.env['ir.attachment'].search([('res_model', '=', self._name), ('res_id', 'in', self.ids)])
+        for record in self:
+            record.profile_attachment_ids = attachments.filtered(lambda attachment: attachment.res_id == record.id)
+
+    @api.model
+    def _profiling_enabled(self, account):
+        """
+        Sync runs are profiled when enabled on the account or for all accounts with the amazon_seller.profile_sync_runs
+        system parameter.
+        """
+        if account.profile_sync_runs:
+            return True
+        value = self.env['ir.config_parameter'].sudo().get_param('amazon_seller.profile_sync_runs')
+        return str(value).strip().lower() in ('1', 'true', 'yes')
+
+    @api.model
+    @contextmanager
+    def track(self, account, model_name, method_name, description):
+        """
+        Collect the telemetry of the block into a new sync run of the account. The run is written with its own
+        cursor, so failed runs are kept when the transaction of the job is rolled back. Profiled runs get their
+        profile attached.
+        """
+        stats = telemetry.SyncRunStats()
+        session = None
+        date_start = fields.Datetime.now()
+        started = time.perf_counter()
+        queries_before = self.env.cr.sql_log_count
+        error = None
+        error_vals = {}
+        try:
+            with telemetry.collecting(stats):
+                if self._profiling_enabled(account):
+                    with profiling.profile_session() as session:
+                        yield stats
+                else:
+                    yield stats
+        except Exception as e:
+            error = traceback.format_exc()
+            error_vals = self._get_error_vals(e)
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            phases = {name: stats.phase_seconds.get(name, 0.0) for name in telemetry.PHASES}
+            self._record_run({
+                'name': description,
+                'job': f'{model_name}.{method_name}',
+                'account_id': account.id,
+                'date_start': date_start,
+                'date_end': fields.Datetime.now(),
+                'state': 'failed' if error else 'done',
+                'duration': duration,
+                'fetch_seconds': phases[telemetry.PHASE_FETCH],
+                'resolve_seconds': phases[telemetry.PHASE_RESOLVE],
+                'write_seconds': phases[telemetry.PHASE_WRITE],
+                'validate_seconds': phases[telemetry.PHASE_VALIDATE],
+                'other_seconds': max(0.0, duration - sum(phases.values())),
+                'api_calls': sum(stats.api_calls.values()),
+                'api_throttled': sum(stats.api_throttled.values()),
+                'api_calls_by_operation': dict(stats.api_calls),
+                'sql_queries': self.env.cr.sql_log_count - queries_before,
+                'records_created': stats.records['created'],
+                'records_updated': stats.records['updated'],
+                'error': error,
+                **error_vals,
+            }, session)
+
+    @api.model
+    def _get_error_vals(self, error):
+        return {
+            'error_type': type(error).__name__,
+            'error_code': telemetry.error_code(error),
+            'error_category': telemetry.error_category(error),
+        }
+
+    @api.model
+    def record_skipped(self, account, model_name, method_name, description, reason):
+        """
+        Record a run of the account that was not started, e.g. because its sync is suspended.
+        """
+        now = fields.Datetime.now()
+        self._record_run({
+            'name': description,
+            'job': f'{model_name}.{method_name}',
+            'account_id': account.id,
+            'date_start': now,
+            'date_end': now,
+            'state': 'skipped',
+            'error': reason,
+        })
+
+    @api.model
+    def _record_run(self, vals, session=None):
+        try:
+            with self.env.registry.cursor() as cr:
+                run = self.env(cr=cr)[self._name].sudo().create(vals)
+                if session:
+                    run._attach_profile(session)
+        except Exception as e:
+            # Telemetry must never fail the sync itself
+            _logger.warning('Could not record the %s sync run: %s', vals.get('name'), e)
+
+    def _attach_profile(self, session):
+        """
+        Attach the text report and the raw pstats dump of a profile session to the run.
+        """
+        self.ensure_one()
+        basename = f'profile-{self.job}-{self.id}'
+        self.env['ir.attachment'].create([{
+            'name': f'{basename}.txt',
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': 'text/plain',
+            'datas': base64.b64encode(session.report().encode()),
+        }, {
+            'name': f'{basename}.pstats',
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': 'application/octet-stream',
+            'datas': base64.b64encode(session.stats_dump()),
+        }])
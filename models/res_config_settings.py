@@ -0,0 +1,55 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import logging
+from odoo import models, fields, _
+from odoo.exceptions import UserError
+from .utils import dependencies
+
+_logger = logging.getLogger(__name__)
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = 'res.config.settings'
+
+    amazon_sp_api_version = fields.Char(string='python-amazon-sp-api Version', compute='_compute_amazon_sp_api_version')
+
+    def _compute_amazon_sp_api_version(self):
+        version = dependencies.get_sp_api_version()
+        for record in self:
+            record.amazon_sp_api_version = version or _('Not installed')
+
+    def action_install_amazon_sp_api(self):
+        """
+        Install python-amazon-sp-api with pip. Odoo has to be restarted afterwards to load the module code using it.
+        """
+        if not self.env.is_admin():
+            raise UserError(_('Only administrators can install Python packages.'))
+
+        success, output = dependencies.install_sp_api()
+        if not success:
+            _logger.error('Installing %s failed:\n%s', dependencies.SP_API_DISTRIBUTION, output)
+            raise UserError(_('Installing %(package)s failed:\n\n%(output)s', package=dependencies.SP_API_DISTRIBUTION, output=output[-2000:]))
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Success'),
+                'message': _('%(package)s %(version)s is installed. Restart Odoo to use it.',
+                             package=dependencies.SP_API_DISTRIBUTION, version=dependencies.get_sp_api_version()),
+                'type': 'success',
+                'sticky': True,
+            },
+        }
@@ -12,23 +12,86 @@
 #  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
 # ######################################################################################################################
 
-"""Utility helpers for interfacing with python-amazon-sp-api."""
+"""Utility helpers for interfacing with python-amazon-sp-api.
+
+sp_api is only imported the first time an API client, marketplace or decorator is actually used, so Odoo workers
+that never sync with Amazon do not pay for it.
+"""
 import csv
 
-from sp_api.base import Marketplaces, ReportType
 from datetime import datetime, timezone, timedelta
-from sp_api.api import Reports, AmazonWarehousingAndDistribution, Inventories, CatalogItems, FulfillmentInbound, Orders, ProductFees
-from sp_api.util import throttle_retry, load_all_pages
 
+import os
 import time
+import functools
+import importlib
 import requests
 import logging
 import gzip
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO, StringIO
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from . import payload_archive, profiling, telemetry, token_cache
 
 _logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def get_api_class(name: str):
+    """
+    Return the sp_api client class with the given name, e.g. "Orders", importing sp_api on first use.
+    """
+    return getattr(importlib.import_module('sp_api.api'), name)
+
+
+@functools.lru_cache(maxsize=None)
+def _sp_api_base(name: str):
+    return getattr(importlib.import_module('sp_api.base'), name)
+
+
+def _lazy_sp_api_decorator(name):
+    """
+    Stand-in for the decorator factory ``sp_api.util.<name>`` that only imports sp_api when the decorated
+    function is first called.
+    """
+    def factory(*args, **kwargs):
+        def decorator(func):
+            wrapped = None
+
+            @functools.wraps(func)
+            def wrapper(*call_args, **call_kwargs):
+                nonlocal wrapped
+                if wrapped is None:
+                    wrapped = getattr(importlib.import_module('sp_api.util'), name)(*args, **kwargs)(func)
+                return wrapped(*call_args, **call_kwargs)
+            return wrapper
+        return decorator
+    return factory
+
+
+throttle_retry = _lazy_sp_api_decorator('throttle_retry')
+load_all_pages = _lazy_sp_api_decorator('load_all_pages')
+
+# Environment variable pointing every account at another SP-API endpoint, e.g. the mock server in tests/sp_api_mock
+SP_API_ENDPOINT_ENV = 'AMAZON_SP_API_ENDPOINT'
+
+# Odoo server option allowing endpoint overrides outside of test runs, e.g. amazon_seller_allow_endpoint_override = True
+ENDPOINT_OVERRIDE_OPTION = 'amazon_seller_allow_endpoint_override'
+
+# Endpoints on these hosts are Amazon's own, e.g. the SP-API sandbox
+AMAZON_HOST_SUFFIXES = ('.amazon.com', '.amazonaws.com')
+
+# Sent instead of the credentials of the account to an endpoint that is not Amazon's
+PLACEHOLDER_CREDENTIALS = {
+    'refresh_token': 'Atzr|endpoint-override',
+    'lwa_app_id': 'amzn1.application-oa2-client.endpoint-override',
+    'lwa_client_secret': 'endpoint-override',
+}
+
+
 def sp_marketplace_mapper(marketplace: str):
     """
     Maps the marketplace string to the corresponding sp_api marketplace object.
@@ -40,6 +103,7 @@ def sp_marketplace_mapper(marketplace: str):
         Marketplaces: The corresponding sp_api marketplace object.
     """
 
+    Marketplaces = _sp_api_base('Marketplaces')
     sp_api_marketplace_mapping = {
         "US": Marketplaces.US,
         "CA": Marketplaces.CA,
@@ -62,12 +126,142 @@ def marketplace_id_mapper(marketplace: str):
 
     sp_api_marketplace_id_mapping = {
         "US": "ATVPDKIKX0DER",
-        "CA": "A2EUQ1WTGCTBG2"
+        "CA": "A2EUQ1WTGCTBG2",
+        "MX": "A1AM78C64UM0Y8",
     }
 
     return sp_api_marketplace_id_mapping.get(marketplace)
 
 
+def get_marketplace_codes(account):
+    """
+    Marketplaces synced for the account, e.g. ['US', 'CA']: its primary marketplace first, then its additional
+    marketplaces. Works with account records and account snapshots.
+    """
+    if isinstance(account, SimpleNamespace):
+        return list(account.marketplace_codes)
+    return account.get_marketplace_codes()
+
+
+def get_marketplace_ids(account):
+    """
+    Marketplace IDs of every marketplace synced for the account, primary first.
+    """
+    return [marketplace_id_mapper(code) for code in get_marketplace_codes(account)]
+
+
+def get_archive_dir(account):
+    """
+    Payload archive directory of the account, or None when it does not archive its payloads. Works with account
+    records and account snapshots.
+    """
+    if isinstance(account, SimpleNamespace):
+        return account.archive_dir
+    return account.get_archive_dir()
+
+
+def archive_payloads(account, kind, entries):
+    """
+    Archive the (key, payload) pairs fetched for the account, when it archives its payloads.
+    """
+    directory = get_archive_dir(account)
+    if directory:
+        payload_archive.append(directory, kind, entries)
+
+
+def fetch_per_marketplace(fetch, account, rate: float = 2.0, burst: int = 2):
+    """
+    Call ``fetch(account, marketplace_code)`` for every marketplace of the account, concurrently under the same
+    credentials when there are several. Returns a dict of marketplace code -> result, primary marketplace first.
+
+    ``fetch`` gets an account_snapshot when run concurrently. Marketplaces whose concurrent fetch failed are fetched
+    again in the current thread, so their error is raised instead of a marketplace being silently left out.
+    """
+    codes = get_marketplace_codes(account)
+    if len(codes) == 1:
+        return {codes[0]: fetch(account, codes[0])}
+
+    account_data = account if isinstance(account, SimpleNamespace) else account_snapshot(account)
+    results = fetch_concurrently(lambda code: fetch(account_data, code), codes, max_workers=len(codes), rate=rate, burst=burst)
+    for code in codes:
+        if code not in results:
+            results[code] = fetch(account_data, code)
+    return {code: results[code] for code in codes}
+
+
+def endpoint_override_allowed():
+    """
+    Endpoint overrides are only honoured while Odoo runs tests, or when the amazon_seller_allow_endpoint_override
+    option is set in the server configuration. Never outside of Odoo.
+    """
+    try:
+        from odoo.modules import module
+        from odoo.tools import config
+    except ImportError:
+        return False
+    if config['test_enable'] or module.current_test:
+        return True
+    return str(config.get(ENDPOINT_OVERRIDE_OPTION, '')).strip().lower() in ('1', 'true', 'yes')
+
+
+def get_endpoint_override(account):
+    """
+    Base URL to send SP-API requests to instead of Amazon, e.g. a local mock server: the sp_api_endpoint of the
+    account, else the AMAZON_SP_API_ENDPOINT environment variable. Returns None to use Amazon, always when overrides
+    are not allowed.
+    """
+    if not isinstance(account, SimpleNamespace):
+        # The field is restricted to administrators, the syncs of other users still honour it
+        account = account.sudo()
+    endpoint = getattr(account, 'sp_api_endpoint', None) or os.environ.get(SP_API_ENDPOINT_ENV)
+    if not endpoint:
+        return None
+    if not endpoint_override_allowed():
+        _warn_ignored_override(endpoint)
+        return None
+    return endpoint.rstrip('/')
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_ignored_override(endpoint):
+    # Logged once per endpoint and process, not for every client
+    _logger.warning('Ignoring the SP-API endpoint override %s, set %s in the server configuration to allow it', endpoint, ENDPOINT_OVERRIDE_OPTION)
+
+
+def is_amazon_endpoint(endpoint):
+    hostname = (urlsplit(endpoint).hostname or '').lower()
+    return hostname.endswith(AMAZON_HOST_SUFFIXES)
+
+
+def get_api_client(api_class, account, marketplace=None):
+    """
+    Build an sp_api client of ``api_class`` (a class or its name, e.g. "Orders") for the account, honouring the
+    endpoint override. The client targets ``marketplace`` (e.g. "CA") when given, else the primary marketplace of
+    the account. Calls made through the client are counted in the telemetry of the current sync run.
+    """
+    if isinstance(api_class, str):
+        api_class = get_api_class(api_class)
+
+    endpoint = get_endpoint_override(account)
+    foreign_endpoint = bool(endpoint) and not is_amazon_endpoint(endpoint)
+    # The credentials of the account never leave for a host that is not Amazon's
+    credentials = dict(PLACEHOLDER_CREDENTIALS) if foreign_endpoint else get_credentials_from_account(account)
+    client = api_class(credentials=credentials, marketplace=sp_marketplace_mapper(marketplace or account.marketplace))
+
+    if endpoint:
+        client.endpoint = endpoint
+    if foreign_endpoint:
+        # The LWA token requests go to the override too, Amazon would reject the placeholder credentials
+        scheme, _, host = endpoint.partition('://')
+        client._auth.scheme = f'{scheme}://'
+        client._auth.host = host
+
+    # LWA tokens are shared by every worker instead of being exchanged by each process
+    token_cache.install(client._auth)
+
+    return telemetry.TrackedClient(client, api_class.__name__)
+
+
 def get_credentials_from_account(account):
     credentials = {
             'refresh_token': account.refresh_token,
@@ -77,32 +271,54 @@ def get_credentials_from_account(account):
     return credentials
 
 
+@profiling.profiled(profiling.KIND_NETWORK)
 @throttle_retry()
 def get_catalog_item(account, asin):
 
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+    replay = payload_archive.current()
+    if replay:
+        return replay.get(payload_archive.CATALOG_ITEMS, asin)
 
-    catalog_items = CatalogItems(credentials=credentials, marketplace=sp_marketplace)
+    catalog_items = get_api_client('CatalogItems', account)
     response = catalog_items.get_catalog_item(asin=asin, includedData=['attributes', 'summaries'])
 
     if response.payload:
+        archive_payloads(account, payload_archive.CATALOG_ITEMS, [(asin, response.payload)])
         return response.payload
     else:
         logging.error("No catalog item found or error occurred.")
         return {}
 
 
+@profiling.profiled(profiling.KIND_NETWORK)
 def get_open_listings(account):
+    """
+    Open listings of every marketplace of the account, one report per marketplace requested concurrently. A SKU
+    listed in several marketplaces is returned once, with the listing of the primary marketplace. The price of
+    the listings only found in other marketplaces is dropped, since it is in the currency of that marketplace.
+    """
+    with telemetry.phase(telemetry.PHASE_FETCH):
+        reports = fetch_per_marketplace(_get_open_listings, account, rate=1.0, burst=len(get_marketplace_codes(account)))
+
+    listings = []
+    seen_skus = set()
+    for index, report_data in enumerate(reports.values()):
+        for listing in report_data or []:
+            if listing.get('sku') in seen_skus:
+                continue
+            seen_skus.add(listing.get('sku'))
+            if index:
+                listing = dict(listing, price=None)
+            listings.append(listing)
+    return listings
+
 
-    # Get credentials and marketplace from the account
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+def _get_open_listings(account, marketplace=None):
 
     # Create Inventory Report
-    report_type = ReportType.GET_FLAT_FILE_OPEN_LISTINGS_DATA
-    report = Reports(credentials=credentials, marketplace=sp_marketplace)
-    report_response = report.create_report(reportType=report_type)
+    report_type = _sp_api_base('ReportType').GET_FLAT_FILE_OPEN_LISTINGS_DATA
+    report = get_api_client('Reports', account, marketplace=marketplace)
+    report_response = report.create_report(reportType=report_type, marketplaceIds=[marketplace_id_mapper(marketplace or account.marketplace)])
     report_id = report_response.payload.get('reportId')
 
     # Wait for the report to be generated
@@ -137,45 +353,73 @@ def get_open_listings(account):
     return report_data
 
 
+@profiling.profiled(profiling.KIND_NETWORK)
 def list_all_awd_inventory(amz_account):
     """ Lists all inventory items in Amazon Warehousing and Distribution (AWD)."""
 
-    credentials = get_credentials_from_account(amz_account)
-    sp_marketplace = sp_marketplace_mapper(amz_account.marketplace)
+    replay = payload_archive.current()
+    if replay:
+        return replay.latest(payload_archive.AWD_INVENTORY)
 
+    awd = get_api_client('AmazonWarehousingAndDistribution', amz_account)
     awd_inventory_list = []
 
     
     @load_all_pages()
     @throttle_retry()
     def _list_inventory():
-        return AmazonWarehousingAndDistribution(credentials=credentials, marketplace=sp_marketplace).list_inventory()
+        return awd.list_inventory()
 
     for page in _list_inventory():
         awd_inventory_list.extend(page.payload.get('inventory', []))
 
+    archive_payloads(amz_account, payload_archive.AWD_INVENTORY, [(item.get('sku'), item) for item in awd_inventory_list])
     return awd_inventory_list
 
 
+@profiling.profiled(profiling.KIND_NETWORK)
+def get_fba_inventory_summaries_by_sku(seller_sku, account):
+    """
+    FBA inventory summaries of the SKU in every marketplace of the account, fetched concurrently. Amazon only
+    accepts one marketplace per inventory request.
+    """
+    summaries = fetch_per_marketplace(
+        lambda account_data, marketplace: get_fba_inventory_summary_by_sku(seller_sku, account_data, marketplace=marketplace),
+        account,
+    )
+    return [summary for summary in summaries.values() if summary]
+
+
+@profiling.profiled(profiling.KIND_NETWORK)
 @throttle_retry()
-def get_fba_inventory_summary_by_sku(seller_sku, account):
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+def get_fba_inventory_summary_by_sku(seller_sku, account, marketplace=None):
+
+    archive_key = f'{marketplace or account.marketplace}/{seller_sku}'
+    replay = payload_archive.current()
+    if replay:
+        return replay.get(payload_archive.FBA_INVENTORY, archive_key)
 
-    inventory_summary = Inventories(credentials=credentials, marketplace=sp_marketplace).get_inventory_summary_marketplace(sellerSkus=[seller_sku], details=True)
+    inventory_summary = get_api_client('Inventories', account, marketplace=marketplace).get_inventory_summary_marketplace(sellerSkus=[seller_sku], details=True)
     
+    summary = None
     if len(inventory_summary.payload.get('inventorySummaries', []))>0:
-        return inventory_summary.payload.get('inventorySummaries', [])[0]
-  
-    return None
+        summary = inventory_summary.payload.get('inventorySummaries', [])[0]
+
+    # Archived even when empty, so a replay knows the SKU had no inventory
+    archive_payloads(account, payload_archive.FBA_INVENTORY, [(archive_key, summary)])
+    return summary
     
 
+@profiling.profiled(profiling.KIND_NETWORK)
 def get_orders_recently_updated(account, days:int=365, **kwargs):
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+
+    replay = payload_archive.current()
+    if replay:
+        # The archived orders of the replayed days, whatever their update date
+        return replay.latest(payload_archive.ORDERS)
 
     # Get Orders
-    orders_api = Orders(credentials=credentials, marketplace=sp_marketplace)
+    orders_api = get_api_client('Orders', account)
 
     LastUpdatedAfter = (datetime.utcnow() - timedelta(days=days)).isoformat().replace("+00:00", "Z")
 
@@ -184,19 +428,56 @@ def get_orders_recently_updated(account, days:int=365, **kwargs):
     def load_orders(**kwargs):
         return orders_api.get_orders(**kwargs)
 
+    # One request covers every marketplace of the account
+    kwargs.setdefault('MarketplaceIds', ','.join(get_marketplace_ids(account)))
+
     orders = []
     for page in load_orders(LastUpdatedAfter=LastUpdatedAfter, **kwargs):
         for order in page.payload.get('Orders', []):
             orders.append(order)
 
+    archive_payloads(account, payload_archive.ORDERS, [(order.get('AmazonOrderId'), order) for order in orders])
+    return orders
+
+# Maximum number of AmazonOrderIds accepted by one getOrders request
+ORDER_IDS_PER_REQUEST = 50
+
+
+@profiling.profiled(profiling.KIND_NETWORK)
+def get_orders_by_ids(account, order_ids):
+    """
+    Fetches the given orders, 50 per request.
+    """
+    replay = payload_archive.current()
+    if replay:
+        return [replay.get(payload_archive.ORDERS, order_id) for order_id in dict.fromkeys(order_ids)]
+
+    orders_api = get_api_client('Orders', account)
+    order_ids = list(dict.fromkeys(order_ids))
+    marketplace_ids = ','.join(get_marketplace_ids(account))
+
+    @throttle_retry()
+    def load_orders(**kwargs):
+        return orders_api.get_orders(**kwargs)
+
+    orders = []
+    for start in range(0, len(order_ids), ORDER_IDS_PER_REQUEST):
+        chunk = order_ids[start:start + ORDER_IDS_PER_REQUEST]
+        response = load_orders(AmazonOrderIds=','.join(chunk), MarketplaceIds=marketplace_ids)
+        orders.extend(response.payload.get('Orders', []))
+
+    archive_payloads(account, payload_archive.ORDERS, [(order.get('AmazonOrderId'), order) for order in orders])
     return orders
 
+@profiling.profiled(profiling.KIND_NETWORK)
 def get_order_items(account, order_id):
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+
+    replay = payload_archive.current()
+    if replay:
+        return replay.get(payload_archive.ORDER_ITEMS, order_id)
 
     # Get Order Details
-    orders_api = Orders(credentials=credentials, marketplace=sp_marketplace)
+    orders_api = get_api_client('Orders', account)
 
     @load_all_pages()
     @throttle_retry()
@@ -208,17 +489,19 @@ def get_order_items(account, order_id):
         for item in page.payload.get('OrderItems', []):
             order_items.append(item)
 
+    archive_payloads(account, payload_archive.ORDER_ITEMS, [(order_id, order_items)])
     return order_items
 
 
+@profiling.profiled(profiling.KIND_NETWORK)
 def awd_list_inbound_shipments(account, **kwargs):
 
-    # Get credentials and marketplace from the account
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+    replay = payload_archive.current()
+    if replay:
+        return replay.latest(payload_archive.AWD_INBOUND_SHIPMENTS)
 
     # Get Inbound Shipments
-    awd = AmazonWarehousingAndDistribution(credentials=credentials, marketplace=sp_marketplace)
+    awd = get_api_client('AmazonWarehousingAndDistribution', account)
 
     @throttle_retry()
     @load_all_pages(next_token_param="next_token")
@@ -231,17 +514,19 @@ def awd_list_inbound_shipments(account, **kwargs):
         for shipment in page.payload.get('shipments', []):
             shipments.append(shipment)
 
+    archive_payloads(account, payload_archive.AWD_INBOUND_SHIPMENTS, [(shipment.get('shipmentId'), shipment) for shipment in shipments])
     return shipments
 
 
+@profiling.profiled(profiling.KIND_NETWORK)
 def awd_get_inbound_shipment_details(account, shipment_id, **kwargs):
 
-    # Get credentials and marketplace from the account
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+    replay = payload_archive.current()
+    if replay:
+        return replay.get(payload_archive.AWD_SHIPMENT_DETAILS, shipment_id)
 
     # Get Inbound Shipment
-    awd = AmazonWarehousingAndDistribution(credentials=credentials, marketplace=sp_marketplace)
+    awd = get_api_client('AmazonWarehousingAndDistribution', account)
 
     @throttle_retry()
     def get_shipment():
@@ -250,22 +535,24 @@ def awd_get_inbound_shipment_details(account, shipment_id, **kwargs):
     response = get_shipment()
 
     if response.payload:
+        archive_payloads(account, payload_archive.AWD_SHIPMENT_DETAILS, [(shipment_id, response.payload)])
         return response.payload
     else:
         logging.error("No shipment found or error occurred.")
         return {}
 
 
-def fba_inbound_shipments_previous_days(account, days:int=365, shipmentStatusList:list=['WORKING', 'SHIPPED', 'RECEIVING', 'CANCELLED', 'DELETED', 'CLOSED', 'ERROR', 'IN_TRANSIT', 'DELIVERED', 'CHECKED_IN']):
+@profiling.profiled(profiling.KIND_NETWORK)
+def fba_inbound_shipments_previous_days(account, days:int=365, shipmentStatusList:list=['WORKING', 'SHIPPED', 'RECEIVING', 'CANCELLED', 'DELETED', 'CLOSED', 'ERROR', 'IN_TRANSIT', 'DELIVERED', 'CHECKED_IN'], last_updated_after:datetime=None):
     """
-    Fetches a list of inbound shipments from FBA.
+    Fetches a list of inbound shipments from FBA updated in the previous days, or since last_updated_after (UTC) when given.
     """
-    # Get credentials and marketplace from the account
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+    replay = payload_archive.current()
+    if replay:
+        return replay.latest(payload_archive.FBA_INBOUND_SHIPMENTS)
 
     # Get Inbound Shipments
-    fba = FulfillmentInbound(credentials=credentials, marketplace=sp_marketplace)
+    fba = get_api_client('FulfillmentInbound', account)
 
     
     @load_all_pages(next_token_param="NextToken", extras=dict(QueryType='NEXT_TOKEN'))
@@ -277,24 +564,26 @@ def fba_inbound_shipments_previous_days(account, days:int=365, shipmentStatusLis
 
     for page in get_shipments(
         QueryType='DATE_RANGE',
-        LastUpdatedAfter=(datetime.utcnow() - timedelta(days=days)).isoformat().replace("+00:00", "Z"),
+        LastUpdatedAfter=(last_updated_after or datetime.utcnow() - timedelta(days=days)).isoformat().replace("+00:00", "Z"),
         LastUpdatedBefore=datetime.utcnow().isoformat().replace("+00:00", "Z"),
         ShipmentStatusList=','.join(shipmentStatusList)):
         for shipment in page.payload.get('ShipmentData', []):
             shipments.append(shipment)
 
+    archive_payloads(account, payload_archive.FBA_INBOUND_SHIPMENTS, [(shipment.get('ShipmentId'), shipment) for shipment in shipments])
     return shipments
 
+@profiling.profiled(profiling.KIND_NETWORK)
 def fba_get_shipment_items_by_shipment_id(account, shipment_id, **kwargs):
     """
     Fetches shipment items for a given shipment ID from FBA.
     """
-    # Get credentials and marketplace from the account
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
+    replay = payload_archive.current()
+    if replay:
+        return replay.get(payload_archive.FBA_SHIPMENT_ITEMS, shipment_id)
 
     # Get Shipment Items
-    fba = FulfillmentInbound(credentials=credentials, marketplace=sp_marketplace)
+    fba = get_api_client('FulfillmentInbound', account)
 
     @throttle_retry()
     def get_shipment_items():
@@ -302,15 +591,14 @@ def fba_get_shipment_items_by_shipment_id(account, shipment_id, **kwargs):
 
     shipment_items = get_shipment_items().payload.get('ItemData', [])
 
+    archive_payloads(account, payload_archive.FBA_SHIPMENT_ITEMS, [(shipment_id, shipment_items)])
     return shipment_items
 
+@profiling.profiled(profiling.KIND_NETWORK)
 @throttle_retry()
 def get_asin_listing_fees(account, asin, price, currency='USD', shipping_price=0, is_fba=True, ):
-    # Get credentials and marketplace from the account
-    credentials = get_credentials_from_account(account)
-    sp_marketplace = sp_marketplace_mapper(account.marketplace)
 
-    product_fees = ProductFees(credentials=credentials, marketplace=sp_marketplace)
+    product_fees = get_api_client('ProductFees', account)
     
     fees = product_fees.get_product_fees_estimate_for_asin(
         asin=asin, price=price, currency=currency, shipping_price=shipping_price, is_fba=is_fba
@@ -323,6 +611,85 @@ def get_asin_listing_fees(account, asin, price, currency='USD', shipping_price=0
     return fees.payload
 
 
+def account_snapshot(account):
+    """
+    Copy the account fields used by the API helpers into a plain object, so the helpers can run in threads that
+    must not touch the ORM.
+    """
+    return SimpleNamespace(
+        name=account.name,
+        marketplace=account.marketplace,
+        marketplace_codes=tuple(get_marketplace_codes(account)),
+        archive_dir=get_archive_dir(account),
+        sp_api_endpoint=account.sudo().sp_api_endpoint,
+        refresh_token=account.refresh_token,
+        app_id=account.app_id,
+        client_secret=account.client_secret,
+    )
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads: allows ``rate`` calls per second on average, with bursts of up to ``burst``.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@profiling.profiled(profiling.KIND_NETWORK)
+def fetch_concurrently(fetch, keys, max_workers: int = 4, rate: float = 2.0, burst: int = 2):
+    """
+    Call ``fetch(key)`` for every key from a bounded thread pool, limited to ``rate`` calls per second.
+
+    Returns a dict of key -> result. Keys whose fetch failed are logged and left out, so callers can fall back to
+    fetching them one by one. ``fetch`` runs outside the request thread and must not use the ORM, pass it an
+    account_snapshot instead of the account record.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
+    limiter = RateLimiter(rate, burst)
+    stats = telemetry.current()
+    replay = payload_archive.current()
+
+    def limited_fetch(key):
+        if replay is None:
+            limiter.acquire()
+        with telemetry.collecting(stats, track_phases=False), payload_archive.replaying(replay):
+            return fetch(key)
+
+    results = {}
+    with telemetry.phase(telemetry.PHASE_FETCH), \
+            ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys))), thread_name_prefix='amazon_fetch') as executor:
+        futures = {executor.submit(limited_fetch, key): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                _logger.warning('Concurrent fetch failed for %s: %s', key, e)
+
+    return results
+
+
 # def fba_list_shipment_items_previous_days(account, days:int=365, **kwargs):
 #     """
 #     Fetches a list of inbound shipments from FBA.
@@ -0,0 +1,85 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""Small in-memory caches and key helpers used while importing Amazon data."""
+import base64
+import hashlib
+import json
+import zlib
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used key once ``maxsize`` is reached.
+    Meant to live for a single import run, so it is not thread safe.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+
+def normalize_address_part(value) -> str:
+    """
+    Normalize one address component for comparison: trimmed, upper-cased and with inner whitespace collapsed.
+    """
+    if value is None or value is False:
+        return ''
+    return ' '.join(str(value).split()).upper()
+
+
+def address_hash(*parts) -> str:
+    """
+    Build a stable hash from the normalized address components, e.g. to use as an indexed lookup key.
+    """
+    normalized = '\x1f'.join(normalize_address_part(part) for part in parts)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def compress_payload(data) -> bytes:
+    """
+    Compress a JSON-like API payload for a Binary field: zlib compressed JSON, base64 encoded.
+    """
+    return base64.b64encode(zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8')))
+
+
+def decompress_payload(value):
+    """
+    Inverse of compress_payload.
+    """
+    return json.loads(zlib.decompress(base64.b64decode(value)).decode('utf-8'))
@@ -0,0 +1,68 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""Check and install the python-amazon-sp-api library without running anything at server start."""
+import functools
+import importlib
+import importlib.metadata
+import importlib.util
+import logging
+import subprocess
+import sys
+
+_logger = logging.getLogger(__name__)
+
+SP_API_DISTRIBUTION = 'python-amazon-sp-api'
+
+# Seconds an explicit install may take before it is abandoned
+INSTALL_TIMEOUT = 600
+
+
+@functools.lru_cache(maxsize=1)
+def get_sp_api_version():
+    """
+    Installed version of python-amazon-sp-api, or None when it is missing. Only reads the package metadata and is
+    cached for the life of the process.
+    """
+    try:
+        return importlib.metadata.version(SP_API_DISTRIBUTION)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def install_sp_api():
+    """
+    Install python-amazon-sp-api with pip into the Python running Odoo. Only ever called from an explicit user
+    action. Returns a (success, output) tuple.
+    """
+    commands = []
+    if importlib.util.find_spec('pip') is None:
+        commands.append([sys.executable, '-m', 'ensurepip', '--upgrade'])
+    commands.append([sys.executable, '-m', 'pip', 'install', SP_API_DISTRIBUTION, '--break-system-packages'])
+
+    output = []
+    for command in commands:
+        _logger.info('Running %s', ' '.join(command))
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=INSTALL_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            output.append(str(e))
+            return False, '\n'.join(output)
+        output.append(result.stdout + result.stderr)
+        if result.returncode:
+            return False, '\n'.join(output)
+
+    importlib.invalidate_caches()
+    get_sp_api_version.cache_clear()
+    return get_sp_api_version() is not None, '\n'.join(output)
@@ -0,0 +1,106 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""Parsing of SP-API notifications, as delivered by SQS, an SNS/HTTP relay or a spool file."""
+import hashlib
+import json
+import logging
+import os
+
+_logger = logging.getLogger(__name__)
+
+ORDER_CHANGE = 'ORDER_CHANGE'
+FBA_INVENTORY_AVAILABILITY_CHANGES = 'FBA_INVENTORY_AVAILABILITY_CHANGES'
+SUPPORTED_TYPES = (ORDER_CHANGE, FBA_INVENTORY_AVAILABILITY_CHANGES)
+
+
+def unwrap(body):
+    """
+    Return the list of notifications contained in ``body``: a notification, a list of them, an SQS message or an
+    SNS envelope whose ``Message``/``Body`` holds the notification as a JSON string.
+    """
+    if isinstance(body, (bytes, str)):
+        body = json.loads(body)
+    if isinstance(body, list):
+        return [notification for item in body for notification in unwrap(item)]
+    if not isinstance(body, dict):
+        return []
+    if 'NotificationType' in body:
+        return [body]
+    for key in ('Message', 'Body', 'body'):
+        if isinstance(body.get(key), (str, dict, list)):
+            return unwrap(body[key])
+    if isinstance(body.get('Records'), list):
+        return unwrap(body['Records'])
+    return []
+
+
+def parse(notification):
+    """
+    Extract what the queue needs from one notification: a dict with notification_id, notification_type,
+    seller_id, marketplace_id and reference (the Amazon order id or the SKU). Returns None for unsupported
+    notifications.
+    """
+    notification_type = notification.get('NotificationType')
+    payload = notification.get('Payload') or {}
+
+    if notification_type == ORDER_CHANGE:
+        change = payload.get('OrderChangeNotification') or {}
+        seller_id, reference = change.get('SellerId'), change.get('AmazonOrderId')
+        marketplace_id = (change.get('Summary') or {}).get('MarketplaceId')
+    elif notification_type == FBA_INVENTORY_AVAILABILITY_CHANGES:
+        seller_id, reference = payload.get('SellerId'), payload.get('SKU')
+        marketplaces = payload.get('FulfillmentInventoryByMarketplace') or [{}]
+        marketplace_id = marketplaces[0].get('MarketplaceId')
+    else:
+        return None
+
+    if not reference:
+        return None
+
+    notification_id = (notification.get('NotificationMetadata') or {}).get('NotificationId')
+    if not notification_id:
+        # Without an id, identical deliveries of the same notification still collapse to one event
+        notification_id = hashlib.sha1(json.dumps(notification, sort_keys=True).encode()).hexdigest()
+
+    return {
+        'notification_id': notification_id,
+        'notification_type': notification_type,
+        'seller_id': seller_id,
+        'marketplace_id': marketplace_id,
+        'reference': reference,
+    }
+
+
+def read_spool(directory):
+    """
+    Yield (path, notifications) for every ``*.json`` or ``*.jsonl`` file of the spool directory, oldest first.
+    Files that cannot be parsed are yielded with ``None``.
+    """
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    paths = [os.path.join(directory, name) for name in names if name.endswith(('.json', '.jsonl'))]
+    for path in sorted(paths, key=lambda path: (os.path.getmtime(path), path)):
+        try:
+            with open(path, encoding='utf-8') as spool_file:
+                if path.endswith('.jsonl'):
+                    notifications = [notification for line in spool_file if line.strip() for notification in unwrap(line)]
+                else:
+                    notifications = unwrap(spool_file.read())
+        except (OSError, ValueError) as e:
+            _logger.warning('Could not read notification spool file %s: %s', path, e)
+            notifications = None
+        yield path, notifications
@@ -0,0 +1,199 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Append-only archive of the payloads fetched from the SP-API, to reprocess them without calling Amazon again.
+
+Payloads are stored per account as gzip compressed JSONL segments, one per day and kind of payload:
+``<directory>/<YYYY-MM-DD>/<kind>.jsonl.gz``. Every line is ``{"fetched_at", "key", "payload"}``. Each append adds a
+gzip member to the segment under a file lock, so concurrent workers never interleave their lines.
+
+While a Replay is active in a thread, the API helpers read from it instead of calling Amazon. Archives are replayed
+one day at a time, so only the payloads of a single day are held in memory.
+"""
+import gzip
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+
+from .token_cache import file_lock
+
+_logger = logging.getLogger(__name__)
+
+ORDERS = 'orders'
+ORDER_ITEMS = 'order_items'
+FBA_INVENTORY = 'fba_inventory'
+AWD_INVENTORY = 'awd_inventory'
+FBA_INBOUND_SHIPMENTS = 'fba_inbound_shipments'
+FBA_SHIPMENT_ITEMS = 'fba_shipment_items'
+AWD_INBOUND_SHIPMENTS = 'awd_inbound_shipments'
+AWD_SHIPMENT_DETAILS = 'awd_shipment_details'
+CATALOG_ITEMS = 'catalog_items'
+
+SEGMENT_SUFFIX = '.jsonl.gz'
+
+_local = threading.local()
+
+
+class NotArchivedError(LookupError):
+    """Raised while replaying when a payload was never archived in the replayed days."""
+
+
+def append(directory, kind, entries):
+    """
+    Archive ``entries``, (key, payload) pairs, in today's segment of ``kind``. No-op when ``directory`` is None
+    or while replaying. Archiving errors are logged, never raised, so they cannot fail a sync.
+    """
+    if not directory or current() is not None:
+        return
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    lines = ''.join(
+        json.dumps({'fetched_at': fetched_at, 'key': key, 'payload': payload}, default=str) + '\n'
+        for key, payload in entries
+    )
+    if not lines:
+        return
+
+    path = os.path.join(directory, date.today().isoformat(), kind + SEGMENT_SUFFIX)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = gzip.compress(lines.encode('utf-8'))
+        with file_lock(path + '.lock'), open(path, 'ab') as segment:
+            segment.write(data)
+    except OSError:
+        _logger.warning('Could not archive %s payloads in %s', kind, path, exc_info=True)
+
+
+def segment_paths(directory, kind, date_from=None, date_to=None):
+    """
+    Segments of ``kind`` in ``directory``, oldest day first, limited to the days from ``date_from`` to
+    ``date_to`` (dates, both included) when given.
+    """
+    if not directory or not os.path.isdir(directory):
+        return []
+    paths = []
+    for day in sorted(os.listdir(directory)):
+        try:
+            day_date = date.fromisoformat(day)
+        except ValueError:
+            continue
+        if (date_from and day_date < date_from) or (date_to and day_date > date_to):
+            continue
+        path = os.path.join(directory, day, kind + SEGMENT_SUFFIX)
+        if os.path.isfile(path):
+            paths.append(path)
+    return paths
+
+
+def archived_days(directory, date_from=None, date_to=None):
+    """
+    Days with archived payloads in ``directory``, oldest first, limited to the days from ``date_from`` to
+    ``date_to`` (dates, both included) when given.
+    """
+    if not directory or not os.path.isdir(directory):
+        return []
+    days = []
+    for day in sorted(os.listdir(directory)):
+        try:
+            day_date = date.fromisoformat(day)
+        except ValueError:
+            continue
+        if (date_from and day_date < date_from) or (date_to and day_date > date_to):
+            continue
+        day_directory = os.path.join(directory, day)
+        if any(name.endswith(SEGMENT_SUFFIX) for name in os.listdir(day_directory)):
+            days.append(day_date)
+    return days
+
+
+def stream(directory, kind, date_from=None, date_to=None):
+    """
+    Yield the archived entries of ``kind``, dicts with fetched_at, key and payload, in the order they were fetched.
+    """
+    for path in segment_paths(directory, kind, date_from, date_to):
+        with gzip.open(path, 'rt', encoding='utf-8') as segment:
+            for line in segment:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class Replay:
+    """
+    Archived payloads of an account served in place of the SP-API: the latest payload of every key fetched
+    between ``date_from`` and ``date_to``. The payloads of a kind are all loaded on first use, keep the range short,
+    e.g. replay each of the archived_days on its own.
+    """
+
+    def __init__(self, directory, date_from=None, date_to=None):
+        self.directory = directory
+        self.date_from = date_from
+        self.date_to = date_to
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def has_payloads(self):
+        return any(
+            segment_paths(self.directory, kind, self.date_from, self.date_to)
+            for kind in (ORDERS, ORDER_ITEMS, FBA_INVENTORY, AWD_INVENTORY, FBA_INBOUND_SHIPMENTS,
+                         FBA_SHIPMENT_ITEMS, AWD_INBOUND_SHIPMENTS, AWD_SHIPMENT_DETAILS, CATALOG_ITEMS)
+        )
+
+    def _index(self, kind):
+        # Built on first use of each kind, shared by the fetch threads of the replay
+        with self._lock:
+            if kind not in self._indexes:
+                index = {}
+                for entry in stream(self.directory, kind, self.date_from, self.date_to):
+                    index[entry['key']] = entry['payload']
+                self._indexes[kind] = index
+                _logger.info('Replaying %s archived %s payloads', len(index), kind)
+            return self._indexes[kind]
+
+    def latest(self, kind):
+        """
+        Latest payload of every archived key of ``kind``, in the order the keys were first fetched.
+        """
+        return list(self._index(kind).values())
+
+    def get(self, kind, key):
+        """
+        Latest payload archived for ``key``. Raises NotArchivedError when there is none.
+        """
+        index = self._index(kind)
+        if key not in index:
+            raise NotArchivedError(f'No {kind} payload archived for {key}')
+        return index[key]
+
+
+def current():
+    """
+    Replay active in the current thread, or None.
+    """
+    return getattr(_local, 'replay', None)
+
+
+@contextmanager
+def replaying(replay):
+    """
+    Serve the API helpers called in the block, in this thread, from ``replay``.
+    """
+    previous = current()
+    _local.replay = replay
+    try:
+        yield replay
+    finally:
+        _local.replay = previous
@@ -0,0 +1,156 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""Opt-in profiling of sync runs: cProfile stacks plus the wall-clock time of the hot-path functions."""
+import cProfile
+import functools
+import io
+import logging
+import marshal
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_logger = logging.getLogger(__name__)
+
+KIND_NETWORK = 'network'
+KIND_ORM = 'orm'
+
+# Number of functions listed in the text report
+REPORT_LIMIT = 60
+
+_local = threading.local()
+
+# Held by the thread being profiled
+_session_lock = threading.Lock()
+
+
+class ProfileSession:
+    """
+    Profile of the code run in one thread: a cProfile profile and the wall-clock time of every function decorated
+    with ``profiled``. Time spent in network functions is split from the rest, which is spent in Odoo and the ORM.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.timings = defaultdict(lambda: [0, 0.0])
+        self.kinds = {}
+        self.network_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._network_depth = 0
+
+    def add_timing(self, label, kind, seconds, outermost_network):
+        timing = self.timings[label]
+        timing[0] += 1
+        timing[1] += seconds
+        self.kinds[label] = kind
+        if outermost_network:
+            self.network_seconds += seconds
+
+    def stats_dump(self) -> bytes:
+        """
+        Raw profile in the pstats format, to open with pstats, snakeviz or similar tools.
+        """
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+    def report(self) -> str:
+        lines = [
+            f'Wall clock: {self.wall_seconds:.3f}s',
+            f'Network:    {self.network_seconds:.3f}s',
+            f'ORM/Odoo:   {max(0.0, self.wall_seconds - self.network_seconds):.3f}s',
+            '',
+            f'{"calls":>8} {"seconds":>10}  kind     function',
+        ]
+        for label, (calls, seconds) in sorted(self.timings.items(), key=lambda item: -item[1][1]):
+            lines.append(f'{calls:>8} {seconds:>10.3f}  {self.kinds[label]:<8} {label}')
+
+        stream = io.StringIO()
+        stream.write('\n')
+        pstats.Stats(self.profile, stream=stream).strip_dirs().sort_stats('cumulative').print_stats(REPORT_LIMIT)
+        return '\n'.join(lines) + stream.getvalue()
+
+
+def current():
+    """
+    Profile session of the current thread, or None when it is not profiled.
+    """
+    return getattr(_local, 'session', None)
+
+
+@contextmanager
+def profile_session():
+    """
+    Profile the code run in the block by the current thread. Threads started from the block are not profiled
+    by cProfile, but the network helpers waiting on them are timed.
+
+    Only one thread of the process is profiled at a time: since Python 3.12 a second cProfile cannot be enabled
+    while another one is active. The block then runs unprofiled and None is yielded, e.g. for the other accounts
+    of a parallel sync or when another profiler is running.
+    """
+    if not _session_lock.acquire(blocking=False):
+        _logger.info('Another sync run is being profiled, this one is not')
+        yield None
+        return
+
+    try:
+        session = ProfileSession()
+        try:
+            session.profile.enable()
+        except ValueError as e:
+            _logger.info('Not profiling the sync run: %s', e)
+            yield None
+            return
+
+        previous = current()
+        _local.session = session
+        started = time.perf_counter()
+        try:
+            yield session
+        finally:
+            session.profile.disable()
+            session.wall_seconds = time.perf_counter() - started
+            _local.session = previous
+    finally:
+        _session_lock.release()
+
+
+def profiled(kind=KIND_ORM):
+    """
+    Decorator timing the decorated function when the current thread is profiled. No-op otherwise.
+    """
+    def decorator(func):
+        label = f'{func.__module__.rsplit(".", 1)[-1]}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session = current()
+            if session is None:
+                return func(*args, **kwargs)
+
+            # Network helpers calling each other are only counted once in the network total
+            outermost_network = kind == KIND_NETWORK and not session._network_depth
+            if kind == KIND_NETWORK:
+                session._network_depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if kind == KIND_NETWORK:
+                    session._network_depth -= 1
+                session.add_timing(label, kind, time.perf_counter() - started, outermost_network)
+        return wrapper
+    return decorator
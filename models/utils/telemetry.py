@@ -0,0 +1,219 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""Counters and phase timers collected while a sync job runs for one account, stored as amazon.sync.run."""
+import functools
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Phases a sync run is split into, any time spent outside of them is reported as "other"
+PHASE_FETCH = 'fetch'
+PHASE_RESOLVE = 'resolve'
+PHASE_WRITE = 'write'
+PHASE_VALIDATE = 'validate'
+PHASES = (PHASE_FETCH, PHASE_RESOLVE, PHASE_WRITE, PHASE_VALIDATE)
+
+_local = threading.local()
+
+
+class SyncRunStats:
+    """
+    Telemetry of one sync run. Counters may be updated from several threads, phase timers are kept per thread
+    so nested phases only count the innermost one.
+    """
+
+    def __init__(self):
+        self.phase_seconds = defaultdict(float)
+        self.api_calls = Counter()
+        self.api_throttled = Counter()
+        self.records = Counter()
+        self._lock = threading.Lock()
+        self._stacks = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._stacks, 'phases'):
+            self._stacks.phases = []
+        return self._stacks.phases
+
+    def _add_phase_time(self, name, seconds):
+        with self._lock:
+            self.phase_seconds[name] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        stack = self._stack()
+        started = time.perf_counter()
+        if stack:
+            # Pause the enclosing phase
+            self._add_phase_time(stack[-1][0], started - stack[-1][1])
+        stack.append([name, started])
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            name, since = stack.pop()
+            self._add_phase_time(name, ended - since)
+            if stack:
+                stack[-1][1] = ended
+
+    def record_api_call(self, operation, throttled=False):
+        with self._lock:
+            self.api_calls[operation] += 1
+            if throttled:
+                self.api_throttled[operation] += 1
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.records[key] += amount
+
+
+def current():
+    """
+    Stats collected by the current thread, or None outside of a sync run.
+    """
+    return getattr(_local, 'stats', None)
+
+
+def _track_phases():
+    return getattr(_local, 'track_phases', True)
+
+
+@contextmanager
+def collecting(stats, track_phases=True):
+    """
+    Collect the telemetry of the code run inside the block into ``stats``. Helper threads working for a run
+    collect into the stats of the run with ``track_phases=False``, as their time overlaps the waiting caller.
+    """
+    previous = (current(), _track_phases())
+    _local.stats, _local.track_phases = stats, track_phases
+    try:
+        yield stats
+    finally:
+        _local.stats, _local.track_phases = previous
+
+
+@contextmanager
+def phase(name):
+    """
+    Attribute the time spent in the block to a phase of the current run. No-op outside of a run.
+    """
+    stats = current()
+    if stats is None or not _track_phases():
+        yield
+        return
+    with stats.phase(name):
+        yield
+
+
+def in_phase(name):
+    """
+    Decorator attributing the time spent in the decorated function to a phase of the current run.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(key, amount=1):
+    """
+    Add to a record counter of the current run, e.g. count('created'). No-op outside of a run.
+    """
+    stats = current()
+    if stats is not None:
+        stats.count(key, amount)
+
+
+def _is_throttled(error):
+    # SellingApiRequestThrottledException, matched by name so this module does not depend on sp_api
+    return type(error).__name__ == 'SellingApiRequestThrottledException' or getattr(error, 'code', None) == 429
+
+
+# Errors of Amazon rejecting the credentials of an account, matched by name like the throttling errors
+CREDENTIAL_ERRORS = ('SellingApiForbiddenException', 'SellingApiUnauthorizedException', 'AuthorizationError', 'MissingCredentials')
+
+ERROR_CREDENTIALS = 'credentials'
+ERROR_THROTTLED = 'throttled'
+ERROR_OTHER = 'other'
+
+
+def _error_chain(error):
+    # The error and the errors it was raised from, e.g. an sp_api error wrapped in a ValidationError
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def error_code(error):
+    """
+    HTTP status code of the first SP-API error in the chain of ``error``, or None.
+    """
+    for cause in _error_chain(error):
+        code = getattr(cause, 'code', None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def error_category(error):
+    """
+    ERROR_CREDENTIALS when Amazon rejected the credentials (LWA failure, 401 or 403), ERROR_THROTTLED for 429,
+    else ERROR_OTHER.
+    """
+    for cause in _error_chain(error):
+        if type(cause).__name__ in CREDENTIAL_ERRORS or getattr(cause, 'code', None) in (401, 403):
+            return ERROR_CREDENTIALS
+        if _is_throttled(cause):
+            return ERROR_THROTTLED
+    return ERROR_OTHER
+
+
+class TrackedClient:
+    """
+    Proxy of an sp_api client counting the calls of its operations, e.g. "Orders.get_orders", and the 429
+    responses. The time spent in the calls is attributed to the fetch phase.
+    """
+
+    def __init__(self, client, api_name):
+        self._client = client
+        self._api_name = api_name
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        operation = f'{self._api_name}.{name}'
+
+        def tracked(*args, **kwargs):
+            stats = current()
+            if stats is None:
+                return attr(*args, **kwargs)
+            with phase(PHASE_FETCH):
+                try:
+                    result = attr(*args, **kwargs)
+                except Exception as e:
+                    stats.record_api_call(operation, throttled=_is_throttled(e))
+                    raise
+            stats.record_api_call(operation)
+            return result
+
+        return tracked
@@ -0,0 +1,172 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+LWA access tokens shared by every Odoo worker and thread, stored as files in the Odoo data directory.
+
+The token cache of sp_api only lives in the process, so every prefork worker and cron thread exchanged the refresh
+token of an account on its first call. Here the exchange is done once per token lifetime and credentials: the
+token is written to a file named after the hash of the credentials and the token endpoint, and the worker doing the
+exchange holds a file lock so the other workers wait for its token instead of calling LWA at the same time.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows, tokens are then exchanged without locking
+    fcntl = None
+
+_logger = logging.getLogger(__name__)
+
+# Environment variable overriding the directory of the cached tokens
+TOKEN_CACHE_DIR_ENV = 'AMAZON_SELLER_TOKEN_CACHE_DIR'
+
+# Tokens are exchanged again this many seconds before they expire, so requests never start with a dying token
+EXPIRY_MARGIN = 300
+
+
+def get_cache_dir():
+    """
+    Directory of the cached tokens: the AMAZON_SELLER_TOKEN_CACHE_DIR environment variable, else
+    amazon_seller/lwa_tokens in the Odoo data directory. None outside of Odoo, which disables the shared cache.
+    """
+    directory = os.environ.get(TOKEN_CACHE_DIR_ENV)
+    if directory:
+        return directory
+    try:
+        from odoo.tools import config
+    except ImportError:
+        return None
+    return os.path.join(config['data_dir'], 'amazon_seller', 'lwa_tokens')
+
+
+def cache_key(auth):
+    """
+    Hash of the credentials, grant and token endpoint of an sp_api AccessTokenClient. New credentials get a new
+    key, so a token is never used with credentials it was not issued for.
+    """
+    identity = json.dumps([auth.scheme + auth.host + auth.path, auth.data], sort_keys=True, default=str)
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def install(auth):
+    """
+    Make the sp_api AccessTokenClient ``auth`` read and write its tokens through the shared cache.
+    """
+    directory = get_cache_dir()
+    if not directory:
+        return auth
+
+    def get_auth():
+        from sp_api.auth.access_token_response import AccessTokenResponse
+        return AccessTokenResponse(**get_token(directory, cache_key(auth), lambda: _exchange_token(auth)))
+
+    auth.get_auth = get_auth
+    return auth
+
+
+def _exchange_token(auth):
+    # Same request as AccessTokenClient.get_auth, without its process-local cache
+    return auth._request(auth.scheme + auth.host + auth.path, auth.data, auth.headers)
+
+
+def get_token(directory, key, exchange):
+    """
+    Cached token of ``key``, else the one returned by ``exchange()``, which is then cached until shortly before it
+    expires. Only one process exchanges the token of a key at a time.
+    """
+    path = os.path.join(directory, f'{key}.json')
+    token = _read(path)
+    if token:
+        return token
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    with file_lock(path + '.lock'):
+        # Another worker may have exchanged it while this one waited for the lock
+        token = _read(path)
+        if token:
+            return token
+
+        token = dict(exchange())
+        token['expires_at'] = time.time() + int(token.get('expires_in') or 3600) - EXPIRY_MARGIN
+        _write(path, token)
+        _logger.debug('Exchanged and cached a new LWA access token %s', key[:12])
+    return _strip(token)
+
+
+def clear(directory=None):
+    """
+    Remove every cached token, e.g. before verifying changed credentials.
+    """
+    directory = directory or get_cache_dir()
+    if not directory or not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.endswith('.json'):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def _read(path):
+    try:
+        with open(path, encoding='utf-8') as file:
+            token = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(token, dict) or token.get('expires_at', 0) <= time.time():
+        return None
+    return _strip(token)
+
+
+def _strip(token):
+    return {name: value for name, value in token.items() if name != 'expires_at'}
+
+
+def _write(path, token):
+    # Written to a temporary file then renamed, so readers never see a partial token
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(token, file)
+        os.replace(temporary_path, path)
+    except OSError:
+        _logger.warning('Could not cache the LWA access token in %s', path, exc_info=True)
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock on the file ``path`` held by the block, across processes and threads.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
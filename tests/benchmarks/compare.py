@@ -0,0 +1,69 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Compare two benchmark result files and fail when a metric regressed by more than the allowed ratio:
+
+    cd tests && python -m benchmarks.compare baseline.json current.json --max-regression 0.2
+"""
+import argparse
+import sys
+
+from .harness import load_results
+
+DEFAULT_METRICS = ('wall_time_s', 'sql_queries', 'api_calls', 'peak_rss_kb')
+
+
+def compare(baseline, current, metrics=DEFAULT_METRICS, max_regression=0.2):
+    """
+    Return (rows, regressions). Each row is (entry point, size, metric, baseline, current, change ratio).
+    """
+    rows, regressions = [], []
+    for key in sorted(set(baseline) & set(current)):
+        for metric in metrics:
+            before, after = baseline[key].get(metric), current[key].get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else (0.0 if not after else float('inf'))
+            row = (key[0], key[1], metric, before, after, change)
+            rows.append(row)
+            if change > max_regression:
+                regressions.append(row)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='benchmarks.compare', description='Compare two amazon_seller benchmark result files.')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='allowed increase, 0.2 = 20%%')
+    parser.add_argument('--metrics', default=','.join(DEFAULT_METRICS), help='comma separated metrics to compare')
+    args = parser.parse_args()
+
+    rows, regressions = compare(
+        load_results(args.baseline), load_results(args.current),
+        metrics=tuple(args.metrics.split(',')), max_regression=args.max_regression,
+    )
+    for entry_point, size, metric, before, after, change in rows:
+        flag = '  REGRESSION' if change > args.max_regression else ''
+        print(f'{entry_point:<26} {size:>7} {metric:<14} {before:>12} -> {after:<12} {change:+.1%}{flag}')
+
+    if regressions:
+        print(f'{len(regressions)} metric(s) regressed by more than {args.max_regression:.0%}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""Measurement and result helpers of the cron benchmarks. Standard library only, so results can be compared anywhere."""
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Data sizes (SKUs and orders) each entry point is run with, overridable with AMAZON_BENCHMARK_SIZES=100,1000
+BENCHMARK_SIZES = (100, 1000, 10000, 50000)
+SIZES_ENV = 'AMAZON_BENCHMARK_SIZES'
+OUTPUT_ENV = 'AMAZON_BENCHMARK_OUTPUT'
+DEFAULT_OUTPUT = 'amazon_benchmark_results.json'
+
+
+def get_sizes():
+    value = os.environ.get(SIZES_ENV)
+    if not value:
+        return BENCHMARK_SIZES
+    return tuple(int(size) for size in value.split(',') if size.strip())
+
+
+def peak_rss_kb():
+    """
+    High-water mark of the resident set size of this process, in kilobytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+@contextmanager
+def measure(cr, server):
+    """
+    Measure the block: wall time, SQL queries run on cr, SP-API calls answered by the mock server and peak
+    RSS. Yields a dict that is filled in when the block exits.
+    """
+    result = {}
+    server.reset_stats()
+    queries_before = cr.sql_log_count
+    rss_before = peak_rss_kb()
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        wall_time = time.perf_counter() - started
+        stats = server.stats()
+        result.update({
+            'wall_time_s': round(wall_time, 3),
+            'sql_queries': cr.sql_log_count - queries_before,
+            'api_calls': stats['total_calls'],
+            'api_throttled': stats['total_throttled'],
+            'api_calls_by_operation': stats['calls'],
+            'peak_rss_kb': peak_rss_kb(),
+            'rss_growth_kb': peak_rss_kb() - rss_before,
+        })
+
+
+def write_results(results, path=None, **metadata):
+    """
+    Write the results of a benchmark run as JSON, to AMAZON_BENCHMARK_OUTPUT or amazon_benchmark_results.json.
+    """
+    path = path or os.environ.get(OUTPUT_ENV) or DEFAULT_OUTPUT
+    document = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        **metadata,
+        'results': sorted(results, key=lambda result: (result['entry_point'], result['size'])),
+    }
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(document, output, indent=2, sort_keys=True)
+    return path
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as results_file:
+        return {(result['entry_point'], result['size']): result for result in json.load(results_file)['results']}
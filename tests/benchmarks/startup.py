@@ -0,0 +1,77 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Measure the import time of the amazon_utils helpers in fresh interpreters, as paid by every Odoo worker, against
+the time it took when sp_api was imported eagerly with them:
+
+    cd tests && python -m benchmarks.startup --repeat 10
+
+Needs python-amazon-sp-api and requests installed, but not Odoo.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'models'))
+
+LAZY_IMPORT = 'import utils.amazon_utils'
+# What loading amazon_utils imported before sp_api was loaded lazily
+EAGER_IMPORT = LAZY_IMPORT + '; import sp_api.api, sp_api.base, sp_api.util'
+
+
+def time_import(statement):
+    """
+    Seconds taken by ``statement`` in a new interpreter with the module's models directory on the path.
+    """
+    code = (
+        'import sys, time\n'
+        f'sys.path.insert(0, {MODELS_DIR!r})\n'
+        'started = time.perf_counter()\n'
+        f'{statement}\n'
+        'print(time.perf_counter() - started)\n'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure(statement, repeat):
+    samples = [time_import(statement) for _ in range(repeat)]
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='benchmarks.startup', description='Measure the amazon_utils import time.')
+    parser.add_argument('--repeat', type=int, default=10, help='fresh interpreters started per measurement')
+    args = parser.parse_args()
+
+    try:
+        lazy_median, lazy_min = measure(LAZY_IMPORT, args.repeat)
+        eager_median, eager_min = measure(EAGER_IMPORT, args.repeat)
+    except subprocess.CalledProcessError as e:
+        print(e.stderr, file=sys.stderr)
+        return 1
+
+    print(f'{"import":<8} {"median ms":>10} {"min ms":>10}')
+    print(f'{"lazy":<8} {lazy_median * 1000:>10.1f} {lazy_min * 1000:>10.1f}')
+    print(f'{"eager":<8} {eager_median * 1000:>10.1f} {eager_min * 1000:>10.1f}')
+    saved = eager_median - lazy_median
+    print(f'Lazy sp_api loading saves {saved * 1000:.1f} ms ({saved / eager_median:.0%}) per worker start')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
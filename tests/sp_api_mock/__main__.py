@@ -0,0 +1,60 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Run the mock SP-API server from the command line, e.g. for a 50k SKU seller with some throttling:
+
+    cd tests && python -m sp_api_mock --port 8765 --skus 50000 --orders 50000 --throttle-rate 0.02
+
+then start Odoo with AMAZON_SP_API_ENDPOINT=http://127.0.0.1:8765 and the amazon_seller_allow_endpoint_override option.
+"""
+import argparse
+import logging
+
+from .server import MockConfig, MockSpApiServer
+
+
+def main():
+    defaults = MockConfig()
+    parser = argparse.ArgumentParser(prog='sp_api_mock', description='Local stand-in for the Amazon SP-API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--skus', type=int, default=defaults.skus, help='catalog size')
+    parser.add_argument('--orders', type=int, default=defaults.orders, help='number of orders')
+    parser.add_argument('--fba-shipments', type=int, default=defaults.fba_shipments)
+    parser.add_argument('--awd-shipments', type=int, default=defaults.awd_shipments)
+    parser.add_argument('--items-per-shipment', type=int, default=defaults.items_per_shipment)
+    parser.add_argument('--page-size', type=int, default=defaults.page_size, help='items per page of paginated operations')
+    parser.add_argument('--latency-ms', type=float, default=defaults.latency_ms, help='delay added to every API response')
+    parser.add_argument('--throttle-rate', type=float, default=defaults.throttle_rate, help='share of API calls answered with 429')
+    parser.add_argument('--report-delay', type=float, default=defaults.report_delay, help='seconds before a report is DONE')
+    parser.add_argument('--fixtures', dest='fixtures_dir', default=None, help='directory of recorded JSON responses')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    options = vars(args)
+    host, port = options.pop('host'), options.pop('port')
+    options.pop('verbose')
+
+    server = MockSpApiServer(MockConfig(**options), host=host, port=port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
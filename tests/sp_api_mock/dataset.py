@@ -0,0 +1,356 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""Deterministic synthetic seller data served by the mock SP-API server."""
+import random
+from datetime import datetime, timedelta, timezone
+
+MARKETPLACE_ID = 'ATVPDKIKX0DER'
+CURRENCY = 'USD'
+
+# A handful of origin warehouses, so inbound shipments share a few address mappings
+ORIGIN_ADDRESSES = [
+    {'Name': 'Main Warehouse', 'AddressLine1': '100 Commerce Way', 'City': 'Reno', 'StateOrProvinceCode': 'NV', 'PostalCode': '89502', 'CountryCode': 'US'},
+    {'Name': 'East Warehouse', 'AddressLine1': '25 Harbor Road', 'City': 'Newark', 'StateOrProvinceCode': 'NJ', 'PostalCode': '07114', 'CountryCode': 'US'},
+    {'Name': 'Central Warehouse', 'AddressLine1': '8 Logistics Park', 'City': 'Columbus', 'StateOrProvinceCode': 'OH', 'PostalCode': '43217', 'CountryCode': 'US'},
+]
+
+# Customer destinations, repeated across orders like real FBA order volume
+CUSTOMER_ADDRESSES = [
+    ('SEATTLE', 'WA', '98101'), ('PORTLAND', 'OR', '97201'), ('AUSTIN', 'TX', '78701'), ('DENVER', 'CO', '80202'),
+    ('CHICAGO', 'IL', '60601'), ('ATLANTA', 'GA', '30301'), ('BOSTON', 'MA', '02108'), ('MIAMI', 'FL', '33101'),
+    ('PHOENIX', 'AZ', '85001'), ('NASHVILLE', 'TN', '37201'), ('SAN DIEGO', 'CA', '92101'), ('MADISON', 'WI', '53703'),
+]
+
+FBA_SHIPMENT_STATUSES = ['WORKING', 'SHIPPED', 'IN_TRANSIT', 'RECEIVING', 'CLOSED', 'CLOSED', 'CLOSED', 'CANCELLED']
+AWD_SHIPMENT_STATUSES = ['CREATED', 'SHIPPED', 'IN_TRANSIT', 'RECEIVING', 'DELIVERED', 'CLOSED', 'CLOSED']
+
+
+def _iso(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _money(amount):
+    return {'CurrencyCode': CURRENCY, 'Amount': f'{amount:.2f}'}
+
+
+class Dataset:
+    """
+    Generates every entity from its index and the seed, so a 50k SKU seller needs no memory up front and the same
+    configuration always serves the same data.
+    """
+
+    def __init__(self, skus=1000, orders=1000, fba_shipments=50, awd_shipments=20, items_per_shipment=10, seed=1):
+        self.skus = skus
+        self.orders = orders
+        self.fba_shipments = fba_shipments
+        self.awd_shipments = awd_shipments
+        self.items_per_shipment = items_per_shipment
+        self.seed = seed
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def _rng(self, kind, index):
+        return random.Random(f'{self.seed}:{kind}:{index}')
+
+    # Catalog
+
+    @staticmethod
+    def sku(index):
+        return f'SKU-{index:06d}'
+
+    @staticmethod
+    def asin(index):
+        return f'B{index:09d}'
+
+    @staticmethod
+    def index_from_id(value):
+        digits = ''.join(char for char in str(value) if char.isdigit())
+        return int(digits) if digits else 0
+
+    def price(self, index):
+        return round(self._rng('price', index).uniform(5, 120), 2)
+
+    def listing(self, index):
+        return {
+            'sku': self.sku(index),
+            'asin': self.asin(index),
+            'price': f'{self.price(index):.2f}',
+            'quantity': str(self._rng('qty', index).randint(0, 500)),
+        }
+
+    def catalog_item(self, asin):
+        index = self.index_from_id(asin)
+        rng = self._rng('catalog', index)
+        return {
+            'asin': asin,
+            'summaries': [{'marketplaceId': MARKETPLACE_ID, 'itemName': f'Mock Product {index}'}],
+            'attributes': {
+                'item_weight': [{'value': round(rng.uniform(0.1, 20), 2), 'unit': 'pounds'}],
+                'item_package_dimensions': [{
+                    'length': {'value': round(rng.uniform(2, 30), 1), 'unit': 'inches'},
+                    'width': {'value': round(rng.uniform(2, 20), 1), 'unit': 'inches'},
+                    'height': {'value': round(rng.uniform(1, 12), 1), 'unit': 'inches'},
+                }],
+            },
+        }
+
+    def fees_estimate(self, asin, price, is_fba):
+        fee = round(float(price or 0) * 0.15 + (3.22 if is_fba else 0), 2)
+        return {
+            'FeesEstimateResult': {
+                'Status': 'Success',
+                'FeesEstimateIdentifier': {'MarketplaceId': MARKETPLACE_ID, 'IdType': 'ASIN', 'IdValue': asin, 'IsAmazonFulfilled': is_fba},
+                'FeesEstimate': {'TotalFeesEstimate': _money(fee)},
+            }
+        }
+
+    # Inventory
+
+    def fba_inventory_summary(self, sku):
+        index = self.index_from_id(sku)
+        rng = self._rng('fba_inventory', index)
+        fulfillable = rng.randint(0, 300)
+        return {
+            'asin': self.asin(index),
+            'fnSku': f'X{index:09d}',
+            'sellerSku': sku,
+            'condition': 'NewItem',
+            'lastUpdatedTime': _iso(self.now),
+            'productName': f'Mock Product {index}',
+            'totalQuantity': fulfillable,
+            'inventoryDetails': {
+                'fulfillableQuantity': fulfillable,
+                'inboundWorkingQuantity': rng.randint(0, 20),
+                'inboundShippedQuantity': rng.randint(0, 20),
+                'inboundReceivingQuantity': rng.randint(0, 20),
+                'reservedQuantity': {'totalReservedQuantity': rng.randint(0, 10)},
+                'researchingQuantity': {'totalResearchingQuantity': rng.randint(0, 2)},
+                'unfulfillableQuantity': {'totalUnfulfillableQuantity': rng.randint(0, 3)},
+            },
+        }
+
+    def awd_inventory(self, index):
+        rng = self._rng('awd_inventory', index)
+        return {
+            'sku': self.sku(index),
+            'totalInboundQuantity': rng.randint(0, 200),
+            'totalOnhandQuantity': rng.randint(0, 1000),
+        }
+
+    # Orders
+
+    @staticmethod
+    def order_id(index):
+        return f'111-{index:07d}-{(index * 7919) % 10000000:07d}'
+
+    def order(self, index):
+        rng = self._rng('order', index)
+        purchased = self.now - timedelta(minutes=5 * index + 30)
+        city, state, zip_code = CUSTOMER_ADDRESSES[rng.randrange(len(CUSTOMER_ADDRESSES))]
+        items = self.order_items(self.order_id(index))
+        total = sum(float(item['ItemPrice']['Amount']) + float(item['ItemTax']['Amount']) for item in items)
+        return {
+            'AmazonOrderId': self.order_id(index),
+            'PurchaseDate': _iso(purchased),
+            'LastUpdateDate': _iso(purchased + timedelta(minutes=20)),
+            'LatestShipDate': _iso(purchased + timedelta(days=1)),
+            'OrderStatus': 'Shipped',
+            'FulfillmentChannel': 'MFN' if index % 10 == 0 else 'AFN',
+            'SalesChannel': 'Amazon.com',
+            'MarketplaceId': MARKETPLACE_ID,
+            'NumberOfItemsShipped': sum(item['QuantityOrdered'] for item in items),
+            'NumberOfItemsUnshipped': 0,
+            'OrderTotal': _money(total),
+            'ShippingAddress': {'City': city, 'StateOrRegion': state, 'PostalCode': zip_code, 'CountryCode': 'US'},
+        }
+
+    def order_index(self, order_id):
+        return self.index_from_id(order_id.split('-')[1]) if '-' in order_id else self.index_from_id(order_id)
+
+    def order_items(self, order_id):
+        index = self.order_index(order_id)
+        rng = self._rng('order_items', index)
+        items = []
+        for line in range(rng.randint(1, 3)):
+            sku_index = rng.randrange(max(1, self.skus))
+            quantity = rng.randint(1, 3)
+            amount = self.price(sku_index) * quantity
+            items.append({
+                'ASIN': self.asin(sku_index),
+                'SellerSKU': self.sku(sku_index),
+                'OrderItemId': f'{index:07d}{line:03d}',
+                'Title': f'Mock Product {sku_index}',
+                'QuantityOrdered': quantity,
+                'QuantityShipped': quantity,
+                'ItemPrice': _money(amount),
+                'ItemTax': _money(amount * 0.0825),
+                'ShippingPrice': _money(0),
+                'ShippingTax': _money(0),
+                'ShippingDiscount': _money(0),
+                'ShippingDiscountTax': _money(0),
+                'PromotionalDiscount': _money(0),
+                'PromotionalDiscountTax': _money(0),
+            })
+        return items
+
+    # Inbound shipments
+
+    @staticmethod
+    def fba_shipment_id(index):
+        return f'FBA{index:08d}'
+
+    def fba_shipment(self, index):
+        rng = self._rng('fba_shipment', index)
+        return {
+            'ShipmentId': self.fba_shipment_id(index),
+            'ShipmentName': f'Mock FBA Shipment {index}',
+            'ShipFromAddress': dict(ORIGIN_ADDRESSES[index % len(ORIGIN_ADDRESSES)]),
+            'DestinationFulfillmentCenterId': 'PHX7',
+            'ShipmentStatus': FBA_SHIPMENT_STATUSES[rng.randrange(len(FBA_SHIPMENT_STATUSES))],
+            'LabelPrepType': 'SELLER_LABEL',
+        }
+
+    def fba_shipment_items(self, shipment_id):
+        index = self.index_from_id(shipment_id)
+        rng = self._rng('fba_shipment_items', index)
+        items = []
+        for sku_index in rng.sample(range(max(1, self.skus)), min(self.items_per_shipment, max(1, self.skus))):
+            quantity = rng.randint(1, 50)
+            items.append({
+                'ShipmentId': shipment_id,
+                'SellerSKU': self.sku(sku_index),
+                'FulfillmentNetworkSKU': f'X{sku_index:09d}',
+                'QuantityShipped': quantity,
+                'QuantityReceived': quantity,
+                'QuantityInCase': 0,
+            })
+        return items
+
+    @staticmethod
+    def awd_shipment_id(index):
+        return f'AWD{index:08d}'
+
+    def awd_shipment(self, index):
+        rng = self._rng('awd_shipment', index)
+        created = self.now - timedelta(days=index % 180)
+        return {
+            'shipmentId': self.awd_shipment_id(index),
+            'shipmentStatus': AWD_SHIPMENT_STATUSES[rng.randrange(len(AWD_SHIPMENT_STATUSES))],
+            'createdAt': _iso(created),
+            'updatedAt': _iso(created + timedelta(hours=6)),
+        }
+
+    def awd_shipment_details(self, shipment_id):
+        index = self.index_from_id(shipment_id)
+        rng = self._rng('awd_shipment_details', index)
+        origin = ORIGIN_ADDRESSES[index % len(ORIGIN_ADDRESSES)]
+        containers = []
+        for sku_index in rng.sample(range(max(1, self.skus)), min(self.items_per_shipment, max(1, self.skus))):
+            containers.append({
+                'count': rng.randint(1, 20),
+                'sku': self.sku(sku_index),
+                'distributionPackage': {
+                    'type': 'CASE',
+                    'contents': {
+                        'products': [{
+                            'attributes': [{'name': 'ASIN', 'value': self.asin(sku_index)}],
+                            'quantity': rng.choice([6, 12, 24]),
+                            'sku': self.sku(sku_index),
+                        }],
+                    },
+                },
+            })
+        return dict(self.awd_shipment(index), **{
+            'originAddress': {
+                'name': origin['Name'],
+                'addressLine1': origin['AddressLine1'],
+                'city': origin['City'],
+                'stateOrRegion': origin['StateOrProvinceCode'],
+                'postalCode': origin['PostalCode'],
+                'countryCode': origin['CountryCode'],
+            },
+            'destinationAddress': {'name': 'AWD Facility', 'addressLine1': '1 AWD Way', 'city': 'Tracy', 'stateOrRegion': 'CA', 'postalCode': '95304', 'countryCode': 'US'},
+            'shipmentContainerQuantities': containers,
+        })
+
+    # Reports
+
+    def open_listings_report(self):
+        header = ['sku', 'asin', 'price', 'quantity']
+        rows = ['\t'.join(header)]
+        for index in range(self.skus):
+            listing = self.listing(index)
+            rows.append('\t'.join(listing[column] for column in header))
+        return '\n'.join(rows)
+
+    # Notifications
+
+    def order_change_notification(self, index, seller_id):
+        order = self.order(index)
+        return {
+            'NotificationVersion': '1.0',
+            'NotificationType': 'ORDER_CHANGE',
+            'PayloadVersion': '1.0',
+            'EventTime': order['LastUpdateDate'],
+            'Payload': {'OrderChangeNotification': {
+                'NotificationLevel': 'OrderLevel',
+                'SellerId': seller_id,
+                'AmazonOrderId': order['AmazonOrderId'],
+                'OrderChangeType': 'OrderStatusChange',
+                'OrderChangeTrigger': {'TimeOfOrderChange': order['LastUpdateDate'], 'ChangeReason': 'Order status changed'},
+                'Summary': {
+                    'MarketplaceId': MARKETPLACE_ID,
+                    'OrderStatus': order['OrderStatus'],
+                    'PurchaseDate': order['PurchaseDate'],
+                    'FulfillmentType': order['FulfillmentChannel'],
+                },
+            }},
+            'NotificationMetadata': {
+                'ApplicationId': 'amzn1.sp.solution.mock',
+                'SubscriptionId': 'mock-order-change',
+                'PublishTime': order['LastUpdateDate'],
+                'NotificationId': f'order-change-{order["AmazonOrderId"]}',
+            },
+        }
+
+    def fba_inventory_notification(self, index, seller_id):
+        sku = self.sku(index)
+        details = self.fba_inventory_summary(sku)['inventoryDetails']
+        return {
+            'NotificationVersion': '1.0',
+            'NotificationType': 'FBA_INVENTORY_AVAILABILITY_CHANGES',
+            'PayloadVersion': '1.0',
+            'EventTime': _iso(self.now),
+            'Payload': {
+                'SellerId': seller_id,
+                'FNSKU': f'X{index:09d}',
+                'ASIN': self.asin(index),
+                'SKU': sku,
+                'FulfillmentInventoryByMarketplace': [{
+                    'MarketplaceId': MARKETPLACE_ID,
+                    'FulfillmentInventory': {
+                        'Fulfillable': details['fulfillableQuantity'],
+                        'InboundWorking': details['inboundWorkingQuantity'],
+                        'InboundShipped': details['inboundShippedQuantity'],
+                        'InboundReceiving': details['inboundReceivingQuantity'],
+                    },
+                }],
+            },
+            'NotificationMetadata': {
+                'ApplicationId': 'amzn1.sp.solution.mock',
+                'SubscriptionId': 'mock-fba-inventory',
+                'PublishTime': _iso(self.now),
+                'NotificationId': f'fba-inventory-{sku}-{self.seed}',
+            },
+        }
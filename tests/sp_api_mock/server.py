@@ -0,0 +1,351 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+"""
+Local stand-in for the SP-API operations used by models/utils/amazon_utils.py.
+
+Point the module at it with the AMAZON_SP_API_ENDPOINT environment variable or the SP-API Endpoint field of a seller
+account, in test runs or with the amazon_seller_allow_endpoint_override server option. Both the API calls and the LWA
+token requests are answered here, with placeholder credentials instead of the ones of the account.
+
+Recorded responses can be served instead of the generated data: with ``fixtures_dir`` set, the body of
+``<fixtures_dir>/<operation>/<id>.json`` or else ``<fixtures_dir>/<operation>.json`` is returned as is, e.g.
+``getOrders.json`` or ``getCatalogItem/B000000001.json``.
+"""
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .dataset import Dataset, MARKETPLACE_ID
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockConfig:
+    skus: int = 1000
+    orders: int = 1000
+    fba_shipments: int = 50
+    awd_shipments: int = 20
+    items_per_shipment: int = 10
+    page_size: int = 100  # items per page of every paginated operation
+    latency_ms: float = 0.0  # added to every response
+    throttle_rate: float = 0.0  # share of API calls answered with 429 QuotaExceeded
+    report_delay: float = 0.0  # seconds before a requested report is DONE
+    fixtures_dir: str = None
+    seed: int = 1
+
+
+# (method, path pattern, operation). The operation names are the SP-API ones and key the call counters and fixtures.
+ROUTES = [
+    ('POST', r'/auth/o2/token', 'getAccessToken'),
+    ('GET', r'/sellers/v1/marketplaceParticipations', 'getMarketplaceParticipations'),
+    ('GET', r'/orders/v0/orders', 'getOrders'),
+    ('GET', r'/orders/v0/orders/(?P<id>[^/]+)/orderItems', 'getOrderItems'),
+    ('GET', r'/fba/inventory/v1/summaries', 'getInventorySummaries'),
+    ('GET', r'/catalog/[^/]+/items/(?P<id>[^/]+)', 'getCatalogItem'),
+    ('GET', r'/awd/[^/]+/inventory', 'listInventory'),
+    ('GET', r'/awd/[^/]+/inboundShipments', 'listInboundShipments'),
+    ('GET', r'/awd/[^/]+/inboundShipments/(?P<id>[^/]+)', 'getInboundShipment'),
+    ('GET', r'/fba/inbound/v0/shipments', 'getShipments'),
+    ('GET', r'/fba/inbound/v0/shipments/(?P<id>[^/]+)/items', 'getShipmentItemsByShipmentId'),
+    ('POST', r'/products/fees/v0/items/(?P<id>[^/]+)/feesEstimate', 'getMyFeesEstimateForASIN'),
+    ('POST', r'/reports/[^/]+/reports', 'createReport'),
+    ('GET', r'/reports/[^/]+/reports/(?P<id>[^/]+)', 'getReport'),
+    ('GET', r'/reports/[^/]+/documents/(?P<id>[^/]+)', 'getReportDocument'),
+    ('GET', r'/_mock/documents/(?P<id>[^/]+)', 'downloadReportDocument'),
+    ('GET', r'/_mock/stats', 'stats'),
+    ('POST', r'/_mock/reset', 'reset'),
+]
+COMPILED_ROUTES = [(method, re.compile(f'^{pattern}$'), operation) for method, pattern, operation in ROUTES]
+
+# Operations that are never throttled nor counted as API calls
+INTERNAL_OPERATIONS = {'stats', 'reset', 'downloadReportDocument', 'getAccessToken'}
+
+
+class MockSpApiServer:
+    """
+    Threaded HTTP server answering SP-API requests from a synthetic Dataset.
+
+    Use it as a context manager, or call start() and stop(). ``url`` is the endpoint to configure in the module, and
+    stats() returns the number of calls per operation.
+    """
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or MockConfig()
+        self.dataset = Dataset(
+            skus=self.config.skus, orders=self.config.orders, fba_shipments=self.config.fba_shipments,
+            awd_shipments=self.config.awd_shipments, items_per_shipment=self.config.items_per_shipment, seed=self.config.seed,
+        )
+        self.calls = Counter()
+        self.throttled = Counter()
+        self.reports = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='sp_api_mock', daemon=True)
+        self._thread.start()
+        _logger.info('Mock SP-API listening on %s', self.url)
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def serve_forever(self):
+        _logger.info('Mock SP-API listening on %s', self.url)
+        self._httpd.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'throttled': dict(self.throttled),
+                'total_calls': sum(self.calls.values()),
+                'total_throttled': sum(self.throttled.values()),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.throttled.clear()
+
+    # Request handling
+
+    def _should_throttle(self, operation):
+        with self._lock:
+            self.calls[operation] += 1
+            if self.config.throttle_rate and self._random.random() < self.config.throttle_rate:
+                self.throttled[operation] += 1
+                return True
+        return False
+
+    def _fixture(self, operation, resource_id):
+        if not self.config.fixtures_dir:
+            return None
+        candidates = [os.path.join(self.config.fixtures_dir, f'{operation}.json')]
+        if resource_id:
+            candidates.insert(0, os.path.join(self.config.fixtures_dir, operation, f'{resource_id}.json'))
+        for path in candidates:
+            if os.path.isfile(path):
+                with open(path, encoding='utf-8') as fixture:
+                    return json.load(fixture)
+        return None
+
+    def _page(self, count, params, build, token_names=('NextToken', 'nextToken', 'next_token')):
+        """
+        Slice ``count`` generated items into pages; tokens are the offset of the next page.
+        """
+        token = next((params[name] for name in token_names if params.get(name)), None)
+        start = int(token) if token and token.isdigit() else 0
+        end = min(start + self.config.page_size, count)
+        return [build(index) for index in range(start, end)], (str(end) if end < count else None)
+
+    def handle(self, operation, resource_id, params, body, base_url):
+        """
+        Return (status, content type, body bytes) for one request.
+        """
+        if operation not in INTERNAL_OPERATIONS:
+            if self.config.latency_ms:
+                time.sleep(self.config.latency_ms / 1000.0)
+            if self._should_throttle(operation):
+                return 429, 'application/json', _json({'errors': [{'code': 'QuotaExceeded', 'message': 'You exceeded your quota for the requested resource.'}]})
+
+            fixture = self._fixture(operation, resource_id)
+            if fixture is not None:
+                return 200, 'application/json', _json(fixture)
+
+        if operation == 'downloadReportDocument':
+            return 200, 'text/tab-separated-values', self.dataset.open_listings_report().encode('cp1252')
+
+        payload = getattr(self, f'_op_{operation}')(resource_id, params, body, base_url)
+        return 200, 'application/json', _json(payload)
+
+    # Operations
+
+    def _op_stats(self, resource_id, params, body, base_url):
+        return self.stats()
+
+    def _op_reset(self, resource_id, params, body, base_url):
+        self.reset_stats()
+        return self.stats()
+
+    def _op_getAccessToken(self, resource_id, params, body, base_url):
+        return {'access_token': 'Atza|mock-access-token', 'token_type': 'bearer', 'expires_in': 3600, 'refresh_token': 'Atzr|mock-refresh-token'}
+
+    def _op_getMarketplaceParticipations(self, resource_id, params, body, base_url):
+        # The mock seller sells in every North American marketplace, so accounts with additional marketplaces verify
+        return {'payload': [{
+            'marketplace': {'id': marketplace_id, 'countryCode': country_code, 'name': name, 'defaultCurrencyCode': currency},
+            'participation': {'isParticipating': True, 'hasSuspendedListings': False},
+        } for marketplace_id, country_code, name, currency in (
+            (MARKETPLACE_ID, 'US', 'Amazon.com', 'USD'),
+            ('A2EUQ1WTGCTBG2', 'CA', 'Amazon.ca', 'CAD'),
+            ('A1AM78C64UM0Y8', 'MX', 'Amazon.com.mx', 'MXN'),
+        )]}
+
+    def _op_getOrders(self, resource_id, params, body, base_url):
+        order_ids = [value.strip() for value in params.get('AmazonOrderIds', '').split(',') if value.strip()]
+        if order_ids:
+            return {'payload': {'Orders': [self.dataset.order(self.dataset.order_index(order_id)) for order_id in order_ids]}}
+
+        orders, next_token = self._page(self.dataset.orders, params, self.dataset.order)
+        payload = {'Orders': orders}
+        if next_token:
+            payload['NextToken'] = next_token
+        return {'payload': payload}
+
+    def _op_getOrderItems(self, resource_id, params, body, base_url):
+        return {'payload': {'AmazonOrderId': resource_id, 'OrderItems': self.dataset.order_items(resource_id)}}
+
+    def _op_getInventorySummaries(self, resource_id, params, body, base_url):
+        skus = [sku for value in params.get('sellerSkus', '').split(',') for sku in [value.strip()] if sku]
+        if params.get('granularityId', MARKETPLACE_ID) != MARKETPLACE_ID:
+            # The mock inventory is all stored in US fulfillment centers
+            summaries, next_token = [], None
+        elif skus:
+            summaries, next_token = [self.dataset.fba_inventory_summary(sku) for sku in skus], None
+        else:
+            summaries, next_token = self._page(self.dataset.skus, params, lambda index: self.dataset.fba_inventory_summary(self.dataset.sku(index)))
+        response = {'payload': {'granularity': {'granularityType': 'Marketplace', 'granularityId': params.get('granularityId', MARKETPLACE_ID)}, 'inventorySummaries': summaries}}
+        if next_token:
+            response['pagination'] = {'nextToken': next_token}
+        return response
+
+    def _op_getCatalogItem(self, resource_id, params, body, base_url):
+        return self.dataset.catalog_item(resource_id)
+
+    def _op_listInventory(self, resource_id, params, body, base_url):
+        inventory, next_token = self._page(self.dataset.skus, params, self.dataset.awd_inventory)
+        response = {'inventory': inventory}
+        if next_token:
+            response['nextToken'] = next_token
+        return response
+
+    def _op_listInboundShipments(self, resource_id, params, body, base_url):
+        shipments, next_token = self._page(self.dataset.awd_shipments, params, self.dataset.awd_shipment)
+        response = {'shipments': shipments}
+        if next_token:
+            response['nextToken'] = next_token
+        return response
+
+    def _op_getInboundShipment(self, resource_id, params, body, base_url):
+        return self.dataset.awd_shipment_details(resource_id)
+
+    def _op_getShipments(self, resource_id, params, body, base_url):
+        shipments, next_token = self._page(self.dataset.fba_shipments, params, self.dataset.fba_shipment)
+        payload = {'ShipmentData': shipments}
+        if next_token:
+            payload['NextToken'] = next_token
+        return {'payload': payload}
+
+    def _op_getShipmentItemsByShipmentId(self, resource_id, params, body, base_url):
+        return {'payload': {'ItemData': self.dataset.fba_shipment_items(resource_id)}}
+
+    def _op_getMyFeesEstimateForASIN(self, resource_id, params, body, base_url):
+        request = (body or {}).get('FeesEstimateRequest', {})
+        price = request.get('PriceToEstimateFees', {}).get('ListingPrice', {}).get('Amount', 0)
+        return {'payload': self.dataset.fees_estimate(resource_id, price, request.get('IsAmazonFulfilled', True))}
+
+    def _op_createReport(self, resource_id, params, body, base_url):
+        with self._lock:
+            report_id = str(len(self.reports) + 1)
+            self.reports[report_id] = {'reportType': (body or {}).get('reportType'), 'created': time.monotonic()}
+        return {'reportId': report_id}
+
+    def _op_getReport(self, resource_id, params, body, base_url):
+        report = self.reports.get(resource_id, {'created': 0, 'reportType': None})
+        done = time.monotonic() - report['created'] >= self.config.report_delay
+        response = {'reportId': resource_id, 'reportType': report['reportType'], 'processingStatus': 'DONE' if done else 'IN_PROGRESS'}
+        if done:
+            response['reportDocumentId'] = f'doc-{resource_id}'
+        return response
+
+    def _op_getReportDocument(self, resource_id, params, body, base_url):
+        return {'reportDocumentId': resource_id, 'url': f'{base_url}/_mock/documents/{resource_id}'}
+
+
+def _json(data):
+    return json.dumps(data).encode('utf-8')
+
+
+def _make_handler(server):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _dispatch(self, method):
+            parsed = urlparse(self.path)
+            params = {key: ','.join(values) for key, values in parse_qs(parsed.query).items()}
+
+            body = None
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                raw = self.rfile.read(length)
+                try:
+                    body = json.loads(raw)
+                except ValueError:
+                    body = {key: ','.join(values) for key, values in parse_qs(raw.decode('utf-8')).items()}
+
+            for route_method, pattern, operation in COMPILED_ROUTES:
+                match = pattern.match(parsed.path)
+                if route_method == method and match:
+                    base_url = f'http://{self.headers.get("Host") or "%s:%s" % server._httpd.server_address[:2]}'
+                    status, content_type, payload = server.handle(operation, match.groupdict().get('id'), params, body, base_url)
+                    break
+            else:
+                status, content_type, payload = 404, 'application/json', _json({'errors': [{'code': 'NotFound', 'message': f'No mock for {method} {parsed.path}'}]})
+
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('x-amzn-RateLimit-Limit', '10')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._dispatch('GET')
+
+        def do_POST(self):
+            self._dispatch('POST')
+
+        def log_message(self, format, *args):
+            _logger.debug('%s - %s', self.address_string(), format % args)
+
+    return Handler
@@ -0,0 +1,148 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import mute_logger
+
+from ..models.amazon_seller_account import CIRCUIT_BREAKER_THRESHOLD
+
+MUTED_LOGGERS = (
+    'odoo.addons.amazon_seller.models.amazon_seller_account',
+    'odoo.addons.amazon_seller.models.amazon_sync_run',
+)
+
+
+class SellingApiError(Exception):
+    """Stands in for the errors of the SP-API client, carrying the HTTP status in ``code``."""
+
+    def __init__(self, code):
+        super().__init__(f'Amazon answered {code}')
+        self.code = code
+
+
+@tagged('post_install', '-at_install')
+class TestAccountSync(TransactionCase):
+    """
+    Circuit breaker and isolation of the accounts synced by run_sync_job, with the sync handler replaced by a mock.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Account = cls.env['amazon.seller.account']
+        cls.account, cls.other_account = Account.create([{
+            'name': name,
+            'app_id': 'amzn1.application-oa2-client.test',
+            'client_secret': 'test-secret',
+            'refresh_token': 'Atzr|test',
+            'seller_id': name.upper(),
+        } for name in ('Breaker Account', 'Other Account')])
+
+    def setUp(self):
+        super().setUp()
+        # Sync runs are recorded in the test transaction instead of a separate cursor
+        self.patch(type(self.env['amazon.sync.run']), '_record_run', lambda run_model, vals, session=None: run_model.sudo().create(vals))
+        self.handler = self.startPatcher(patch.object(type(self.env['amazon.fba.inbound']), 'import_account_fba_inbound'))
+
+    def _sync(self, accounts):
+        return accounts.run_sync_job('amazon.fba.inbound', 'import_account_fba_inbound', 'import FBA inbound')
+
+    def _get_runs(self, account):
+        return self.env['amazon.sync.run'].search([('account_id', '=', account.id)], order='id')
+
+    @mute_logger(*MUTED_LOGGERS)
+    def test_breaker_opens_after_credential_errors(self):
+        self.handler.side_effect = SellingApiError(403)
+
+        for failures in range(1, CIRCUIT_BREAKER_THRESHOLD):
+            self._sync(self.account)
+            self.assertEqual(self.account.sync_failure_count, failures)
+            self.assertFalse(self.account.is_sync_suspended())
+
+        self._sync(self.account)
+        self.assertEqual(self.account.sync_failure_count, CIRCUIT_BREAKER_THRESHOLD)
+        self.assertTrue(self.account.is_sync_suspended())
+        self.assertGreater(self.account.sync_suspended_until, fields.Datetime.now())
+        self.assertEqual(self._get_runs(self.account).mapped('error_category'), ['credentials'] * CIRCUIT_BREAKER_THRESHOLD)
+
+        # The suspended account is skipped without calling Amazon
+        self.handler.reset_mock()
+        self.assertEqual(self._sync(self.account), {})
+        self.handler.assert_not_called()
+        self.assertEqual(self._get_runs(self.account)[-1].state, 'skipped')
+
+    @mute_logger(*MUTED_LOGGERS)
+    def test_other_errors_leave_the_breaker_closed(self):
+        self.handler.side_effect = ValueError('Unexpected payload')
+
+        for _ in range(CIRCUIT_BREAKER_THRESHOLD):
+            self._sync(self.account)
+
+        self.assertEqual(self.account.sync_failure_count, 0)
+        self.assertFalse(self.account.is_sync_suspended())
+        self.assertEqual(self._get_runs(self.account).mapped('error_category'), ['other'] * CIRCUIT_BREAKER_THRESHOLD)
+
+    @mute_logger(*MUTED_LOGGERS)
+    def test_success_resets_the_failure_count(self):
+        self.handler.side_effect = SellingApiError(401)
+        for _ in range(CIRCUIT_BREAKER_THRESHOLD - 1):
+            self._sync(self.account)
+        self.assertEqual(self.account.sync_failure_count, CIRCUIT_BREAKER_THRESHOLD - 1)
+
+        self.handler.side_effect = None
+        self.assertEqual(self._sync(self.account), {})
+        self.assertEqual(self.account.sync_failure_count, 0)
+        self.assertEqual(self._get_runs(self.account)[-1].state, 'done')
+
+    @mute_logger(*MUTED_LOGGERS)
+    def test_resume_closes_the_breaker(self):
+        self.handler.side_effect = SellingApiError(401)
+        for _ in range(CIRCUIT_BREAKER_THRESHOLD):
+            self._sync(self.account)
+        self.assertTrue(self.account.is_sync_suspended())
+
+        self.account.action_resume_sync()
+
+        self.assertEqual(self.account.sync_failure_count, 0)
+        self.assertFalse(self.account.sync_suspended_until)
+        self.assertFalse(self.account.is_sync_suspended())
+
+        self.handler.reset_mock(side_effect=True)
+        self.assertEqual(self._sync(self.account), {})
+        self.handler.assert_called_once_with(self.account)
+
+    @mute_logger(*MUTED_LOGGERS)
+    def test_failing_account_is_rolled_back_alone(self):
+        last_updated = fields.Datetime.now().replace(microsecond=0) - timedelta(days=1)
+
+        def handler(account):
+            account.fba_inbound_last_updated = last_updated
+            account.flush_recordset()
+            if account == self.account:
+                raise ValueError('Unexpected payload')
+        self.handler.side_effect = handler
+
+        errors = self._sync(self.account | self.other_account)
+
+        self.assertEqual(list(errors), [self.account.name])
+        self.assertIsInstance(errors[self.account.name], ValueError)
+        self.env.invalidate_all()
+        self.assertNotEqual(self.account.fba_inbound_last_updated, last_updated)
+        self.assertEqual(self.other_account.fba_inbound_last_updated, last_updated)
+        self.assertEqual(self._get_runs(self.account).state, 'failed')
+        self.assertEqual(self._get_runs(self.other_account).state, 'done')
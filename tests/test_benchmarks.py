@@ -0,0 +1,152 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import logging
+
+from odoo import Command, release
+from odoo.tests import TransactionCase, tagged
+
+from .benchmarks import get_sizes, measure, write_results
+from .sp_api_mock import MockConfig, MockSpApiServer
+from .sp_api_mock.dataset import Dataset, ORIGIN_ADDRESSES
+
+_logger = logging.getLogger(__name__)
+
+# Account settings every benchmark account starts from, all syncs disabled
+DISABLED_SYNC_FLAGS = {
+    'import_products': False,
+    'import_fba_inventory': False,
+    'import_awd_inventory': False,
+    'import_fba_inbound_shipments': False,
+    'import_awd_inbound_shipments': False,
+    'import_fba_orders': False,
+    'import_fbm_orders': False,
+    'get_fba_estimated_fees': False,
+    'get_fbm_estimated_fees': False,
+}
+
+PRODUCT_CREATE_BATCH = 1000
+
+
+@tagged('-standard', '-at_install', 'post_install', 'amazon_benchmark')
+class TestCronBenchmarks(TransactionCase):
+    """
+    Runs every cron entry point against the mock SP-API for each data size and writes the measurements as JSON.
+    Not part of the standard test run, start it with:
+
+        odoo-bin -d <db> -u amazon_seller --test-tags amazon_benchmark --stop-after-init
+
+    Each size runs in a savepoint that is rolled back afterwards, so sizes do not see each other's data.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+        # Never let the benchmark reach Amazon through an account of the database
+        cls.env['amazon.seller.account'].search([]).write(DISABLED_SYNC_FLAGS)
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.results:
+            path = write_results(cls.results, odoo_version=release.version)
+            _logger.info('Amazon benchmark results written to %s', path)
+        super().tearDownClass()
+
+    def _create_account(self, server, flags):
+        return self.env['amazon.seller.account'].create(dict(
+            DISABLED_SYNC_FLAGS,
+            name='Benchmark Account',
+            app_id='amzn1.application-oa2-client.benchmark',
+            client_secret='benchmark-secret',
+            refresh_token='Atzr|benchmark',
+            seller_id='BENCHMARK',
+            marketplace='US',
+            sp_api_endpoint=server.url,
+            skip_inventory_when_no_product_cost=False,
+            skip_inventory_not_avco=False,
+            **flags,
+        ))
+
+    def _create_products(self, dataset):
+        ProductTemplate = self.env['product.template']
+        for start in range(0, dataset.skus, PRODUCT_CREATE_BATCH):
+            ProductTemplate.create([{
+                'name': f'Mock Product {index}',
+                'type': 'consu',
+                'is_storable': True,
+                'amazon_asin': dataset.asin(index),
+                'list_price': dataset.price(index),
+                'standard_price': 1.0,
+                'amazon_msku_ids': [Command.create({'name': dataset.sku(index)})],
+            } for index in range(start, min(start + PRODUCT_CREATE_BATCH, dataset.skus))])
+
+    def _map_origin_addresses(self):
+        stock_location = self.env['stock.warehouse'].search([('company_id', '=', self.env.company.id)], limit=1).lot_stock_id
+        self.env['amazon.address.map'].create([{
+            'name': address['Name'],
+            'address_line1': address['AddressLine1'],
+            'address_line2': '',
+            'city': address['City'],
+            'state_or_region': address['StateOrProvinceCode'],
+            'postal_code': address['PostalCode'],
+            'country_code': address['CountryCode'],
+            'warehouse_loc': stock_location.id,
+        } for address in ORIGIN_ADDRESSES])
+
+    def _benchmark(self, entry_point, model_name, flags, with_products=True, with_address_maps=False):
+        for size in get_sizes():
+            config = MockConfig(skus=size, orders=size, fba_shipments=max(1, size // 50), awd_shipments=max(1, size // 50))
+            with self.subTest(size=size), MockSpApiServer(config) as server:
+                self.env.cr.execute('SAVEPOINT amazon_benchmark')
+                try:
+                    self._create_account(server, flags)
+                    if with_products:
+                        self._create_products(Dataset(skus=size))
+                    if with_address_maps:
+                        self._map_origin_addresses()
+                    self.env.flush_all()
+
+                    with measure(self.env.cr, server) as result:
+                        getattr(self.env[model_name], entry_point)()
+                        self.env.flush_all()
+
+                    result.update(entry_point=entry_point, size=size)
+                    self.results.append(result)
+                    _logger.info('Benchmark %s with %s: %s', entry_point, size, result)
+                finally:
+                    self.env.cr.execute('ROLLBACK TO SAVEPOINT amazon_benchmark')
+                    self.env.invalidate_all()
+                    self.env.registry.clear_cache()
+
+    def test_cron_import_products(self):
+        self._benchmark('cron_import_products', 'amazon.import.products', {'import_products': True}, with_products=False)
+
+    def test_cron_fba_inventory_sync(self):
+        self._benchmark('cron_fba_inventory_sync', 'amazon.fba.inventory', {'import_fba_inventory': True})
+
+    def test_cron_awd_inventory_sync(self):
+        self._benchmark('cron_awd_inventory_sync', 'amazon.awd.inventory', {'import_awd_inventory': True})
+
+    def test_cron_fba_inbound(self):
+        self._benchmark('cron_fba_inbound', 'amazon.fba.inbound', {'import_fba_inbound_shipments': True}, with_address_maps=True)
+
+    def test_cron_awd_inbound(self):
+        self._benchmark('cron_awd_inbound', 'amazon.awd.inbound', {'import_awd_inbound_shipments': True}, with_address_maps=True)
+
+    def test_cron_import_orders(self):
+        self._benchmark('cron_import_orders', 'amazon.orders', {'import_fba_orders': True, 'import_fbm_orders': True})
+
+    def test_cron_get_listing_fees(self):
+        self._benchmark('cron_get_listing_fees', 'amazon.listing.fees', {'get_fba_estimated_fees': True, 'get_fbm_estimated_fees': True})
@@ -0,0 +1,144 @@
+# ######################################################################################################################
+#  Amazon Seller Odoo Module Copyright (c) 2025 by Charles L Beyor and Beyotek Inc.
+#  is licensed under Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International.
+#  To view a copy of this license, visit https://creativecommons.org/licenses/by-nc-sa/4.0/
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  GitHub: https://github.com/chuckbeyor101/odoo_amazon_seller_module
+# ######################################################################################################################
+
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import mute_logger
+
+from ..models.amazon_sync_job import RETRY_BASE_SECONDS
+
+
+@tagged('post_install', '-at_install')
+class TestSyncJob(TransactionCase):
+    """
+    Queueing, claiming and retrying of amazon.sync.job, with the job handlers replaced by mocks.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.account = cls.env['amazon.seller.account'].create({
+            'name': 'Job Queue Account',
+            'app_id': 'amzn1.application-oa2-client.test',
+            'client_secret': 'test-secret',
+            'refresh_token': 'Atzr|test',
+            'seller_id': 'JOBQUEUE',
+        })
+        cls.Jobs = cls.env['amazon.sync.job']
+
+    def setUp(self):
+        super().setUp()
+        # Sync runs are recorded in the test transaction instead of a separate cursor
+        self.patch(type(self.env['amazon.sync.run']), '_record_run', lambda run_model, vals, session=None: run_model.sudo().create(vals))
+        self.handler = self.startPatcher(patch.object(type(self.env['amazon.orders']), 'import_orders_by_id'))
+
+    def _enqueue(self, references, **kwargs):
+        jobs = self.Jobs.enqueue('orders', self.account, references, **kwargs)
+        # The claim query compares with the start of the test transaction
+        jobs.next_run = fields.Datetime.now() - timedelta(minutes=1)
+        return jobs
+
+    def test_enqueue_splits_in_chunks(self):
+        jobs = self._enqueue(['C', 'A', 'B', 'A', False], batch_size=2)
+        self.assertEqual(jobs.mapped('payload'), [['A', 'B'], ['C']])
+        self.assertEqual(set(jobs.mapped('priority')), {5})
+
+    def test_enqueue_skips_pending_duplicates(self):
+        jobs = self._enqueue(['A', 'B'], batch_size=1)
+        self.assertEqual(len(jobs), 2)
+
+        self.assertFalse(self.Jobs.enqueue('orders', self.account, ['B', 'A'], batch_size=1))
+        new_jobs = self.Jobs.enqueue('orders', self.account, ['A', 'C'], batch_size=1)
+        self.assertEqual(new_jobs.mapped('payload'), [['C']])
+
+        # Only pending jobs count as duplicates, a done chunk is queued again
+        jobs[0].state = 'done'
+        self.assertEqual(self.Jobs.enqueue('orders', self.account, ['A'], batch_size=1).mapped('payload'), [['A']])
+
+    def test_successful_job_is_done(self):
+        job = self._enqueue(['A', 'B'])
+        job._run()
+
+        self.handler.assert_called_once_with(self.account, ['A', 'B'])
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.attempts, 1)
+        self.assertTrue(job.date_done)
+        self.assertFalse(job.error)
+
+    @mute_logger('odoo.addons.amazon_seller.models.amazon_sync_job', 'odoo.addons.amazon_seller.models.amazon_sync_run')
+    def test_failing_job_backs_off_then_fails(self):
+        self.handler.side_effect = ValueError('Amazon says no')
+        job = self._enqueue(['A'])
+        job.max_attempts = 3
+
+        for attempt in (1, 2):
+            job._run()
+            self.assertEqual(job.state, 'pending')
+            self.assertEqual(job.attempts, attempt)
+            self.assertIn('Amazon says no', job.error)
+            delay = (job.next_run - fields.Datetime.now()).total_seconds()
+            self.assertAlmostEqual(delay, RETRY_BASE_SECONDS * 2 ** (attempt - 1), delta=5)
+
+        job._run()
+        self.assertEqual(job.state, 'failed')
+        self.assertEqual(job.attempts, 3)
+
+        job.action_retry()
+        self.assertEqual(job.state, 'pending')
+        self.assertEqual(job.attempts, 0)
+
+    def test_job_of_suspended_account_is_postponed(self):
+        job = self._enqueue(['A'])
+        self.account.sync_suspended_until = fields.Datetime.now() + timedelta(hours=1)
+
+        job._run()
+
+        self.handler.assert_not_called()
+        self.assertEqual(job.state, 'pending')
+        self.assertEqual(job.attempts, 0)
+        self.assertEqual(job.next_run, self.account.sync_suspended_until)
+
+    @mute_logger('odoo.addons.amazon_seller.models.amazon_sync_job', 'odoo.addons.amazon_seller.models.amazon_sync_run')
+    def test_drain_runs_due_jobs_by_priority(self):
+        order = []
+        self.handler.side_effect = lambda account, references: order.append(references[0])
+        low = self._enqueue(['LOW'], priority=20)
+        high = self._enqueue(['HIGH'], priority=1)
+        later = self._enqueue(['LATER'])
+        later.next_run = fields.Datetime.now() + timedelta(hours=1)
+
+        self.assertEqual(self.Jobs._drain(time.monotonic() + 60), 2)
+
+        self.assertEqual(order, ['HIGH', 'LOW'])
+        self.assertEqual((high | low).mapped('state'), ['done', 'done'])
+        self.assertEqual(later.state, 'pending')
+
+    @mute_logger('odoo.addons.amazon_seller.models.amazon_sync_job', 'odoo.addons.amazon_seller.models.amazon_sync_run')
+    def test_failing_job_does_not_stop_the_drain(self):
+        def handler(account, references):
+            if references == ['BAD']:
+                raise ValueError('Amazon says no')
+        self.handler.side_effect = handler
+        bad = self._enqueue(['BAD'], priority=1)
+        good = self._enqueue(['GOOD'], priority=2)
+
+        self.Jobs._drain(time.monotonic() + 60)
+
+        self.assertEqual(bad.state, 'pending')
+        self.assertEqual(bad.attempts, 1)
+        self.assertEqual(good.state, 'done')